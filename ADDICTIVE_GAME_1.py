@@ -1,6 +1,10 @@
 # Import the pygame library
 import pygame
-import random
+
+from frame_profiler import FrameProfiler
+from replay import ReplayRecorder, new_seed, save_run
+from runner_core import FixedTimestep, StickDashSim
+from text_cache import TEXT_CACHE
 
 # Initialize pygame - this must be done before using pygame features
 pygame.init()
@@ -18,13 +22,14 @@ pygame.display.set_caption("Stick Dash")
 # Create a clock object to control frame rate
 clock = pygame.time.Clock()
 
-# Set up fonts for displaying text
+# Font sizes for displaying text (TEXT_CACHE renders each string once
+# and reuses it, instead of calling font.render() every frame)
 # Large font for title and game over
-font_large = pygame.font.Font(None, 48)
+FONT_LARGE = 48
 # Medium font for instructions
-font_medium = pygame.font.Font(None, 32)
+FONT_MEDIUM = 32
 # Small font for detailed instructions
-font_small = pygame.font.Font(None, 24)
+FONT_SMALL = 24
 
 # Define colors using RGB values (Red, Green, Blue)
 BLACK = (0, 0, 0)
@@ -38,117 +43,42 @@ YELLOW = (255, 255, 0)
 BROWN = (139, 69, 19)
 GREEN = (34, 139, 34)
 
-# Player properties - position, size, and physics
-player_x = 100  # Fixed X position - player stays on left side
-player_y = 450  # Starting Y position
-player_width = 50
-player_height = 50
-player_velocity_y = 0  # Current vertical speed (negative = moving up, positive = moving down)
-
-# Physics constants
-gravity = 0.8  # How fast the player accelerates downward
-jump_strength = -15  # How much upward velocity jumping gives (negative = up)
-ground_level = HEIGHT - player_height - 50  # Where the ground is located
+# Player properties - the game logic (physics, boulders, score) lives in
+# runner_core.StickDashSim; the game only reads it to draw
+player_x = StickDashSim.PLAYER_X  # Fixed X position - player stays on left side
+player_width = StickDashSim.PLAYER_WIDTH
+player_height = StickDashSim.PLAYER_HEIGHT
+ground_level = StickDashSim.GROUND_LEVEL  # Where the ground is located
 
-# Base obstacle speed - will increase as score increases
-base_obstacle_speed = 6
-obstacle_speed = base_obstacle_speed
+# The simulation runs in fixed 1/60 second ticks, however fast or slow
+# the frames are drawn. The recorder keeps the seed and the jumps so the
+# run is saved as a small replay file at game over (see replay.py)
+recorder = ReplayRecorder("dash", new_seed())
+sim = recorder.sim
+timestep = FixedTimestep()
+replay_saved = False
 
-# Create a list to store multiple obstacles
-# Each obstacle is a list: [x_position, y_position, width, height, radius]
-obstacles = []
+# ========== PRECOMPOSED LAYERS ==========
+# The sky, ground and instruction panel never change, so they are drawn
+# once into one surface at startup and copied to the screen with a single
+# blit per frame. Only the player, boulders and the score/timer/speed
+# counters are drawn every frame.
 
-# Add initial obstacles with random spacing
-obstacles.append([800, ground_level, 50, 50, 25])
-obstacles.append([1100, ground_level, 60, 60, 30])
-obstacles.append([1450, ground_level, 45, 45, 22])
-
-# Game state variables
-running = True
-game_over = False
-score = 0  # Tracks player's score
-frame_count = 0  # Counts frames for animation
-start_time = pygame.time.get_ticks()  # Track game start time for timer
-
-# Main game loop - runs until the player quits
-while running:
-    # Event handling - check for all events that happened this frame
-    for event in pygame.event.get():
-        # Check if the user clicked the X button to close the window
-        if event.type == pygame.QUIT:
-            running = False
-        
-        # Check for key press events (single press, not held down)
-        if event.type == pygame.KEYDOWN:
-            # Jump when spacebar is pressed and player is on the ground
-            if event.key == pygame.K_SPACE and player_y >= ground_level and not game_over:
-                player_velocity_y = jump_strength
+def build_background():
+    """Draw the static background and instruction panel once."""
+    layer = pygame.Surface((WIDTH, HEIGHT)).convert()
     
-    # Only update game if not game over
-    if not game_over:
-        # Increment frame counter for animations
-        frame_count += 1
-        
-        # Apply gravity to the player's vertical velocity
-        player_velocity_y += gravity
-        
-        # Update player's Y position based on velocity
-        player_y += player_velocity_y
-        
-        # Check if player has landed on the ground
-        if player_y >= ground_level:
-            player_y = ground_level  # Set position exactly at ground level
-            player_velocity_y = 0  # Stop downward movement
-        
-        # Increase obstacle speed based on score (difficulty increases)
-        # Every 5 points, increase speed by 0.5
-        obstacle_speed = base_obstacle_speed + (score // 5) * 0.5
-        
-        # Update all obstacles in the list
-        for obstacle in obstacles:
-            # Move obstacle to the left
-            obstacle[0] -= obstacle_speed
-            
-            # Check if obstacle has gone off the left side of the screen
-            if obstacle[0] < -obstacle[2]:
-                # Reset obstacle to the right side with random spacing
-                obstacle[0] = WIDTH + random.randint(200, 500)
-                # Randomly vary obstacle size
-                size = random.choice([45, 50, 60])
-                obstacle[2] = size  # width
-                obstacle[3] = size  # height
-                obstacle[4] = size // 2  # radius
-                # Increase score when player successfully passes an obstacle
-                score += 1
-            
-            # Collision detection - check if player overlaps with this obstacle
-            # Check if rectangles overlap on X axis
-            x_overlap = (player_x < obstacle[0] + obstacle[2] and 
-                         player_x + player_width > obstacle[0])
-            
-            # Check if rectangles overlap on Y axis
-            y_overlap = (player_y < obstacle[1] + obstacle[3] and 
-                         player_y + player_height > obstacle[1])
-            
-            # If both X and Y overlap, there is a collision
-            if x_overlap and y_overlap:
-                game_over = True
-    
-    # Calculate elapsed time in seconds
-    if not game_over:
-        elapsed_time = (pygame.time.get_ticks() - start_time) // 1000
-    
-    # Fill the screen with sky blue background
-    screen.fill(SKY_BLUE)
+    # Fill the layer with sky blue background
+    layer.fill(SKY_BLUE)
     
     # Draw ground (brown rectangle at bottom)
-    pygame.draw.rect(screen, BROWN, (0, ground_level + player_height, WIDTH, HEIGHT))
+    pygame.draw.rect(layer, BROWN, (0, ground_level + player_height, WIDTH, HEIGHT))
     
     # Draw grass on top of ground (green line with small rectangles)
-    pygame.draw.line(screen, GREEN, (0, ground_level + player_height), (WIDTH, ground_level + player_height), 4)
+    pygame.draw.line(layer, GREEN, (0, ground_level + player_height), (WIDTH, ground_level + player_height), 4)
     # Draw small grass blades
     for grass_x in range(0, WIDTH, 30):
-        pygame.draw.line(screen, GREEN, (grass_x, ground_level + player_height), 
+        pygame.draw.line(layer, GREEN, (grass_x, ground_level + player_height), 
                         (grass_x, ground_level + player_height - 8), 2)
     
     # ========== DRAW INSTRUCTIONS SECTION ==========
@@ -156,28 +86,91 @@ while running:
     instruction_bg = pygame.Surface((WIDTH, 155))
     instruction_bg.set_alpha(180)
     instruction_bg.fill(BLACK)
-    screen.blit(instruction_bg, (0, 0))
+    layer.blit(instruction_bg, (0, 0))
     
     # Draw game title at the top
-    title_text = font_large.render("BOULDER RUNNER", True, YELLOW)
-    title_width = title_text.get_width()
-    screen.blit(title_text, (WIDTH // 2 - title_width // 2, 10))
+    TEXT_CACHE.draw(layer, "BOULDER RUNNER", (WIDTH // 2, 10), FONT_LARGE, YELLOW, anchor="midtop")
     
     # Draw controls instruction
-    controls_text = font_small.render("Controls: Press SPACEBAR to Jump", True, WHITE)
-    screen.blit(controls_text, (20, 70))
+    TEXT_CACHE.draw(layer, "Controls: Press SPACEBAR to Jump", (20, 70), FONT_SMALL, WHITE)
     
     # Draw goal instruction
-    goal_text = font_small.render("Goal: Avoid the boulders!", True, WHITE)
-    screen.blit(goal_text, (20, 95))
+    TEXT_CACHE.draw(layer, "Goal: Avoid the boulders!", (20, 95), FONT_SMALL, WHITE)
     
     # Draw how to win/stay alive instruction
-    survive_text = font_small.render("Stay Alive: Jump over boulders - Speed increases every 5 points!", True, WHITE)
-    screen.blit(survive_text, (20, 120))
+    TEXT_CACHE.draw(layer, "Stay Alive: Jump over boulders - Speed increases every 5 points!",
+                    (20, 120), FONT_SMALL, WHITE)
     
     # Draw a separator line between instructions and game area
-    pygame.draw.line(screen, WHITE, (0, 155), (WIDTH, 155), 2)
+    pygame.draw.line(layer, WHITE, (0, 155), (WIDTH, 155), 2)
     # ========== END INSTRUCTIONS SECTION ==========
+    return layer
+
+
+def build_game_over_shade():
+    """The dark see-through layer drawn over the game when it ends."""
+    shade = pygame.Surface((WIDTH, HEIGHT)).convert()
+    shade.fill(BLACK)
+    shade.set_alpha(150)
+    return shade
+
+
+background = build_background()
+game_over_shade = build_game_over_shade()
+
+# Game state variables
+running = True
+jump_pressed = False  # Spacebar pressed since the last tick
+
+# Frame timing per phase: F3 shows it, FRAME_PROFILE=out.csv also saves it
+profiler = FrameProfiler.from_env()
+
+# Main game loop - runs until the player quits
+while running:
+    # Real time since the last frame (clock.tick caps drawing at 60 FPS)
+    frame_seconds = clock.tick(60) / 1000
+    profiler.begin_frame()
+    
+    # Event handling - check for all events that happened this frame
+    for event in pygame.event.get():
+        # Check if the user clicked the X button to close the window
+        if event.type == pygame.QUIT:
+            running = False
+        
+        # F3 switches the frame timing overlay on and off
+        profiler.handle_event(event)
+        
+        # Check for key press events (single press, not held down)
+        if event.type == pygame.KEYDOWN:
+            # Jump when spacebar is pressed (the sim ignores it in the air)
+            if event.key == pygame.K_SPACE:
+                jump_pressed = True
+    profiler.mark("events")
+    
+    # Run as many game ticks as real time has passed (each tick also
+    # checks for collisions)
+    for _ in range(timestep.advance(frame_seconds)):
+        recorder.step(jump_pressed)
+        jump_pressed = False
+    
+    # How far we are between the last tick and the next one, so moving
+    # things are drawn smoothly even when ticks and frames don't line up
+    # (once the game is over nothing moves, so draw the final positions)
+    game_over = sim.game_over
+    if game_over and not replay_saved:
+        save_run(recorder)
+        replay_saved = True
+    alpha = 1.0 if game_over else timestep.alpha
+    score = sim.score
+    obstacle_speed = sim.obstacle_speed
+    frame_count = sim.tick  # Ticks drive the running animation
+    elapsed_time = sim.seconds  # Game time, so it stops at game over
+    player_y = sim.player_y_at(alpha)
+    profiler.mark("update")
+    
+    # Draw the sky, ground and instruction panel (one precomposed layer)
+    screen.blit(background, (0, 0))
+    profiler.mark("background")
     
     # Draw the animated stick figure player
     # Calculate center position for the stick figure based on player collision box
@@ -227,11 +220,11 @@ while running:
         pygame.draw.line(screen, stick_color, (stick_center_x, body_bottom_y), (stick_center_x + 6, stick_bottom_y), 3)
     
     # Draw all boulder obstacles with enhanced graphics
-    for obstacle in obstacles:
+    for obstacle in sim.obstacles:
         # Calculate center of the boulder
-        boulder_center_x = obstacle[0] + obstacle[2] // 2
-        boulder_center_y = obstacle[1] + obstacle[3] // 2
-        boulder_radius = obstacle[4]
+        boulder_center_x = obstacle.x_at(alpha) + obstacle.width // 2
+        boulder_center_y = obstacle.y + obstacle.height // 2
+        boulder_radius = obstacle.radius
         
         # Draw shadow (darker gray circle offset down and right)
         pygame.draw.circle(screen, DARK_GRAY, (boulder_center_x + 3, boulder_center_y + 3), boulder_radius)
@@ -247,56 +240,48 @@ while running:
         pygame.draw.circle(screen, DARK_GRAY, (boulder_center_x + boulder_radius // 4, boulder_center_y), boulder_radius // 6)
         pygame.draw.circle(screen, DARK_GRAY, (boulder_center_x - boulder_radius // 6, boulder_center_y + boulder_radius // 4), boulder_radius // 7)
         pygame.draw.circle(screen, DARK_GRAY, (boulder_center_x + boulder_radius // 3, boulder_center_y + boulder_radius // 3), boulder_radius // 8)
+    profiler.mark("entities")
     
-    # Create text surface with the score
-    score_text = font_medium.render("Score: " + str(score), True, WHITE)
-    # Draw score in top right corner
-    score_width = score_text.get_width()
-    screen.blit(score_text, (WIDTH - score_width - 20, 15))
+    # Draw score in top right corner (counters are built from cached digits)
+    TEXT_CACHE.draw_counter(screen, "Score: ", score, (WIDTH - 20, 15), FONT_MEDIUM, WHITE,
+                            anchor="topright")
     
     # Display timer below score
     if not game_over:
-        timer_text = font_small.render("Time: " + str(elapsed_time) + "s", True, WHITE)
-        timer_width = timer_text.get_width()
-        screen.blit(timer_text, (WIDTH - timer_width - 20, 55))
+        TEXT_CACHE.draw_counter(screen, "Time: ", elapsed_time, (WIDTH - 20, 55), FONT_SMALL, WHITE,
+                                suffix="s", anchor="topright")
     
     # Display current speed
-    speed_text = font_small.render("Speed: " + str(round(obstacle_speed, 1)), True, YELLOW)
-    speed_width = speed_text.get_width()
-    screen.blit(speed_text, (WIDTH - speed_width - 20, 85))
+    TEXT_CACHE.draw_counter(screen, "Speed: ", round(obstacle_speed, 1), (WIDTH - 20, 85), FONT_SMALL,
+                            YELLOW, anchor="topright")
     
     # If game is over, display game over message
     if game_over:
-        # Semi-transparent black background for game over screen
-        game_over_bg = pygame.Surface
-        # If game is over, display game over message
-    if game_over:
-        # Semi-transparent black background for game over screen
-        game_over_bg = pygame.Surface((WIDTH, HEIGHT))
-        game_over_bg.set_alpha(150)
-        game_over_bg.fill(BLACK)
-        screen.blit(game_over_bg, (0, 0))
+        # Semi-transparent black layer over the game (built once)
+        screen.blit(game_over_shade, (0, 0))
         
         # Game over text
-        game_over_text = font_large.render("GAME OVER", True, RED)
-        text_width = game_over_text.get_width()
-        screen.blit(game_over_text, (WIDTH // 2 - text_width // 2, HEIGHT // 2 - 60))
+        TEXT_CACHE.draw(screen, "GAME OVER", (WIDTH // 2, HEIGHT // 2 - 60), FONT_LARGE, RED,
+                        anchor="midtop")
         
         # Display final score
-        final_score_text = font_medium.render("Final Score: " + str(score), True, WHITE)
-        final_score_width = final_score_text.get_width()
-        screen.blit(final_score_text, (WIDTH // 2 - final_score_width // 2, HEIGHT // 2))
+        TEXT_CACHE.draw_counter(screen, "Final Score: ", score, (WIDTH // 2, HEIGHT // 2), FONT_MEDIUM,
+                                WHITE, anchor="midtop")
         
         # Display survival time
-        time_text = font_medium.render("Survived: " + str(elapsed_time) + " seconds", True, WHITE)
-        time_width = time_text.get_width()
-        screen.blit(time_text, (WIDTH // 2 - time_width // 2, HEIGHT // 2 + 40))
+        TEXT_CACHE.draw_counter(screen, "Survived: ", elapsed_time, (WIDTH // 2, HEIGHT // 2 + 40),
+                                FONT_MEDIUM, WHITE, suffix=" seconds", anchor="midtop")
+    profiler.mark("HUD")
+    
+    # Frame timing overlay (only while switched on)
+    profiler.draw_overlay(screen)
+    profiler.mark("overlay")
     
     # Update the display to show everything we drew
     pygame.display.flip()
-    
-    # Control the frame rate - run at 60 frames per second
-    clock.tick(60)
+    profiler.mark("flip")
+    profiler.end_frame()
 
-# Quit pygame properly when the loop ends
+# Save the frame times (if FRAME_PROFILE is set) and quit pygame properly
+profiler.close()
 pygame.quit()
@@ -1,6 +1,13 @@
 import pygame
 import random
 
+from frame_profiler import FrameProfiler
+from parallax import ParallaxBackground, ParallaxLayer
+from replay import ReplayRecorder, new_seed, save_run
+from runner_core import BoulderRunnerSim, FixedTimestep
+from sprite_atlas import SpriteAtlas
+from text_cache import TEXT_CACHE
+
 # Initialize pygame
 pygame.init()
 
@@ -25,39 +32,35 @@ pygame.display.set_caption("Boulder Runner")
 # Clock for controlling frame rate
 clock = pygame.time.Clock()
 
-# Game variables
-player_x = 100
-player_y = 250
-player_width = 40
-player_height = 60
-player_velocity_y = 0
-is_jumping = False
-ground_level = 250
+# Game variables (the rules themselves live in runner_core.BoulderRunnerSim)
+player_x = BoulderRunnerSim.PLAYER_X
 
 # Game state
 game_state = "menu"  # menu, character_select, playing, game_over
 selected_character = "human"
 day_mode = True
 
-# Gameplay variables
-gravity = 1
-jump_strength = -20  # Increased for higher jumps
-obstacles = []
-coins = []
+# Gameplay: a fresh simulation for every run, stepped in fixed
+# 1/60 second ticks however fast the frames are drawn; the recorder keeps
+# the seed and jumps so each run is saved as a replay (see replay.py)
+recorder = ReplayRecorder("runner", new_seed())
+sim = recorder.sim
+background = None  # Scrolling background of the run (from BACKGROUNDS, below)
+timestep = FixedTimestep()
+jump_pressed = False  # Spacebar pressed since the last tick
 score = 0
-obstacle_speed = 5
 frame_count = 0
-last_obstacle_x = 0  # Track position of last boulder spawned
 
-# Fonts
-font = pygame.font.Font(None, 36)
-small_font = pygame.font.Font(None, 24)
+# Font sizes (TEXT_CACHE renders each string once and reuses it)
+FONT_SIZE = 36
+SMALL_FONT_SIZE = 24
+TITLE_FONT_SIZE = 72
 
 
 # ===== FUNCTIONS =====
 
-def draw_pixelated_human(x, y, is_jumping):
-    """Draw a pixelated human character"""
+def draw_pixelated_human(surface, x, y, is_jumping, leg_offset=0):
+    """Draw a pixelated human character (leg_offset: running animation frame)"""
     # Body color
     skin = (255, 220, 177)
     shirt = (100, 150, 255)
@@ -65,74 +68,71 @@ def draw_pixelated_human(x, y, is_jumping):
     
     if is_jumping:
         # Jumping pose - legs bent
-        pygame.draw.rect(screen, skin, (x + 10, y + 10, 20, 20))  # Head
-        pygame.draw.rect(screen, shirt, (x + 5, y + 30, 30, 20))  # Body
-        pygame.draw.rect(screen, pants, (x + 5, y + 50, 12, 15))  # Leg 1
-        pygame.draw.rect(screen, pants, (x + 23, y + 50, 12, 15))  # Leg 2
+        pygame.draw.rect(surface, skin, (x + 10, y + 10, 20, 20))  # Head
+        pygame.draw.rect(surface, shirt, (x + 5, y + 30, 30, 20))  # Body
+        pygame.draw.rect(surface, pants, (x + 5, y + 50, 12, 15))  # Leg 1
+        pygame.draw.rect(surface, pants, (x + 23, y + 50, 12, 15))  # Leg 2
     else:
         # Running pose
-        pygame.draw.rect(screen, skin, (x + 10, y, 20, 20))  # Head
-        pygame.draw.rect(screen, shirt, (x + 5, y + 20, 30, 25))  # Body
+        pygame.draw.rect(surface, skin, (x + 10, y, 20, 20))  # Head
+        pygame.draw.rect(surface, shirt, (x + 5, y + 20, 30, 25))  # Body
         # Animated legs
-        leg_offset = (frame_count // 5) % 8 - 4
-        pygame.draw.rect(screen, pants, (x + 5, y + 45, 12, 20))  # Leg 1
-        pygame.draw.rect(screen, pants, (x + 23 + leg_offset, y + 45, 12, 20))  # Leg 2
+        pygame.draw.rect(surface, pants, (x + 5, y + 45, 12, 20))  # Leg 1
+        pygame.draw.rect(surface, pants, (x + 23 + leg_offset, y + 45, 12, 20))  # Leg 2
 
 
-def draw_pixelated_pig(x, y, is_jumping):
-    """Draw a pixelated pig character"""
+def draw_pixelated_pig(surface, x, y, is_jumping, leg_offset=0):
+    """Draw a pixelated pig character (leg_offset: running animation frame)"""
     pink = (255, 182, 193)
     dark_pink = (255, 105, 180)
     
     if is_jumping:
         # Jumping pig
-        pygame.draw.rect(screen, pink, (x, y + 20, 40, 30))  # Body
-        pygame.draw.rect(screen, pink, (x + 30, y + 15, 15, 20))  # Head
-        pygame.draw.rect(screen, dark_pink, (x + 35, y + 20, 8, 8))  # Snout
-        pygame.draw.rect(screen, pink, (x + 30, y + 10, 5, 8))  # Ear 1
-        pygame.draw.rect(screen, pink, (x + 40, y + 10, 5, 8))  # Ear 2
+        pygame.draw.rect(surface, pink, (x, y + 20, 40, 30))  # Body
+        pygame.draw.rect(surface, pink, (x + 30, y + 15, 15, 20))  # Head
+        pygame.draw.rect(surface, dark_pink, (x + 35, y + 20, 8, 8))  # Snout
+        pygame.draw.rect(surface, pink, (x + 30, y + 10, 5, 8))  # Ear 1
+        pygame.draw.rect(surface, pink, (x + 40, y + 10, 5, 8))  # Ear 2
     else:
         # Running pig
-        pygame.draw.rect(screen, pink, (x, y + 15, 40, 35))  # Body
-        pygame.draw.rect(screen, pink, (x + 30, y + 10, 15, 25))  # Head
-        pygame.draw.rect(screen, dark_pink, (x + 35, y + 20, 8, 8))  # Snout
-        pygame.draw.rect(screen, pink, (x + 30, y + 5, 5, 8))  # Ear 1
-        pygame.draw.rect(screen, pink, (x + 40, y + 5, 5, 8))  # Ear 2
+        pygame.draw.rect(surface, pink, (x, y + 15, 40, 35))  # Body
+        pygame.draw.rect(surface, pink, (x + 30, y + 10, 15, 25))  # Head
+        pygame.draw.rect(surface, dark_pink, (x + 35, y + 20, 8, 8))  # Snout
+        pygame.draw.rect(surface, pink, (x + 30, y + 5, 5, 8))  # Ear 1
+        pygame.draw.rect(surface, pink, (x + 40, y + 5, 5, 8))  # Ear 2
         # Animated legs
-        leg_offset = (frame_count // 5) % 6 - 3
-        pygame.draw.rect(screen, pink, (x + 5, y + 50, 8, 15))  # Leg 1
-        pygame.draw.rect(screen, pink, (x + 27 + leg_offset, y + 50, 8, 15))  # Leg 2
+        pygame.draw.rect(surface, pink, (x + 5, y + 50, 8, 15))  # Leg 1
+        pygame.draw.rect(surface, pink, (x + 27 + leg_offset, y + 50, 8, 15))  # Leg 2
 
 
-def draw_pixelated_cow(x, y, is_jumping):
-    """Draw a pixelated cow character"""
+def draw_pixelated_cow(surface, x, y, is_jumping, leg_offset=0):
+    """Draw a pixelated cow character (leg_offset: running animation frame)"""
     white = (255, 255, 255)
     black = (0, 0, 0)
     
     if is_jumping:
         # Jumping cow
-        pygame.draw.rect(screen, white, (x, y + 20, 45, 35))  # Body
-        pygame.draw.rect(screen, black, (x + 10, y + 25, 15, 15))  # Spot 1
-        pygame.draw.rect(screen, black, (x + 25, y + 40, 12, 12))  # Spot 2
-        pygame.draw.rect(screen, white, (x + 35, y + 15, 18, 25))  # Head
-        pygame.draw.rect(screen, black, (x + 35, y + 10, 5, 8))  # Horn 1
-        pygame.draw.rect(screen, black, (x + 48, y + 10, 5, 8))  # Horn 2
+        pygame.draw.rect(surface, white, (x, y + 20, 45, 35))  # Body
+        pygame.draw.rect(surface, black, (x + 10, y + 25, 15, 15))  # Spot 1
+        pygame.draw.rect(surface, black, (x + 25, y + 40, 12, 12))  # Spot 2
+        pygame.draw.rect(surface, white, (x + 35, y + 15, 18, 25))  # Head
+        pygame.draw.rect(surface, black, (x + 35, y + 10, 5, 8))  # Horn 1
+        pygame.draw.rect(surface, black, (x + 48, y + 10, 5, 8))  # Horn 2
     else:
         # Running cow
-        pygame.draw.rect(screen, white, (x, y + 15, 45, 40))  # Body
-        pygame.draw.rect(screen, black, (x + 10, y + 20, 15, 15))  # Spot 1
-        pygame.draw.rect(screen, black, (x + 25, y + 35, 12, 12))  # Spot 2
-        pygame.draw.rect(screen, white, (x + 35, y + 10, 18, 30))  # Head
-        pygame.draw.rect(screen, black, (x + 35, y + 5, 5, 8))  # Horn 1
-        pygame.draw.rect(screen, black, (x + 48, y + 5, 5, 8))  # Horn 2
+        pygame.draw.rect(surface, white, (x, y + 15, 45, 40))  # Body
+        pygame.draw.rect(surface, black, (x + 10, y + 20, 15, 15))  # Spot 1
+        pygame.draw.rect(surface, black, (x + 25, y + 35, 12, 12))  # Spot 2
+        pygame.draw.rect(surface, white, (x + 35, y + 10, 18, 30))  # Head
+        pygame.draw.rect(surface, black, (x + 35, y + 5, 5, 8))  # Horn 1
+        pygame.draw.rect(surface, black, (x + 48, y + 5, 5, 8))  # Horn 2
         # Animated legs
-        leg_offset = (frame_count // 5) % 6 - 3
-        pygame.draw.rect(screen, white, (x + 5, y + 55, 10, 15))  # Leg 1
-        pygame.draw.rect(screen, white, (x + 30 + leg_offset, y + 55, 10, 15))  # Leg 2
+        pygame.draw.rect(surface, white, (x + 5, y + 55, 10, 15))  # Leg 1
+        pygame.draw.rect(surface, white, (x + 30 + leg_offset, y + 55, 10, 15))  # Leg 2
 
 
-def draw_pixelated_alien(x, y, is_jumping):
-    """Draw a pixelated alien character"""
+def draw_pixelated_alien(surface, x, y, is_jumping, leg_offset=0):
+    """Draw a pixelated alien character (leg_offset: running animation frame)"""
     green = (0, 255, 0)
     dark_green = (0, 180, 0)
     black = (0, 0, 0)
@@ -140,74 +140,48 @@ def draw_pixelated_alien(x, y, is_jumping):
     
     if is_jumping:
         # Jumping alien
-        pygame.draw.rect(screen, green, (x + 5, y + 25, 35, 30))  # Body
-        pygame.draw.rect(screen, green, (x + 10, y + 10, 25, 25))  # Head
-        pygame.draw.rect(screen, black, (x + 13, y + 15, 8, 10))  # Eye 1
-        pygame.draw.rect(screen, white, (x + 15, y + 17, 3, 4))  # Eye highlight
-        pygame.draw.rect(screen, black, (x + 24, y + 15, 8, 10))  # Eye 2
-        pygame.draw.rect(screen, white, (x + 26, y + 17, 3, 4))  # Eye highlight
-        pygame.draw.rect(screen, dark_green, (x + 20, y + 5, 5, 8))  # Antenna
+        pygame.draw.rect(surface, green, (x + 5, y + 25, 35, 30))  # Body
+        pygame.draw.rect(surface, green, (x + 10, y + 10, 25, 25))  # Head
+        pygame.draw.rect(surface, black, (x + 13, y + 15, 8, 10))  # Eye 1
+        pygame.draw.rect(surface, white, (x + 15, y + 17, 3, 4))  # Eye highlight
+        pygame.draw.rect(surface, black, (x + 24, y + 15, 8, 10))  # Eye 2
+        pygame.draw.rect(surface, white, (x + 26, y + 17, 3, 4))  # Eye highlight
+        pygame.draw.rect(surface, dark_green, (x + 20, y + 5, 5, 8))  # Antenna
     else:
         # Running alien
-        pygame.draw.rect(screen, green, (x + 5, y + 20, 35, 35))  # Body
-        pygame.draw.rect(screen, green, (x + 10, y + 5, 25, 25))  # Head
-        pygame.draw.rect(screen, black, (x + 13, y + 10, 8, 10))  # Eye 1
-        pygame.draw.rect(screen, white, (x + 15, y + 12, 3, 4))  # Eye highlight
-        pygame.draw.rect(screen, black, (x + 24, y + 10, 8, 10))  # Eye 2
-        pygame.draw.rect(screen, white, (x + 26, y + 12, 3, 4))  # Eye highlight
-        pygame.draw.rect(screen, dark_green, (x + 20, y, 5, 8))  # Antenna
+        pygame.draw.rect(surface, green, (x + 5, y + 20, 35, 35))  # Body
+        pygame.draw.rect(surface, green, (x + 10, y + 5, 25, 25))  # Head
+        pygame.draw.rect(surface, black, (x + 13, y + 10, 8, 10))  # Eye 1
+        pygame.draw.rect(surface, white, (x + 15, y + 12, 3, 4))  # Eye highlight
+        pygame.draw.rect(surface, black, (x + 24, y + 10, 8, 10))  # Eye 2
+        pygame.draw.rect(surface, white, (x + 26, y + 12, 3, 4))  # Eye highlight
+        pygame.draw.rect(surface, dark_green, (x + 20, y, 5, 8))  # Antenna
         # Animated legs
-        leg_offset = (frame_count // 5) % 6 - 3
-        pygame.draw.rect(screen, green, (x + 10, y + 55, 10, 12))  # Leg 1
-        pygame.draw.rect(screen, green, (x + 25 + leg_offset, y + 55, 10, 12))  # Leg 2
-
+        pygame.draw.rect(surface, green, (x + 10, y + 55, 10, 12))  # Leg 1
+        pygame.draw.rect(surface, green, (x + 25 + leg_offset, y + 55, 10, 12))  # Leg 2
 
-def draw_character(x, y, character_type, is_jumping):
-    """Draw the selected character"""
-    if character_type == "human":
-        draw_pixelated_human(x, y, is_jumping)
-    elif character_type == "pig":
-        draw_pixelated_pig(x, y, is_jumping)
-    elif character_type == "cow":
-        draw_pixelated_cow(x, y, is_jumping)
-    elif character_type == "alien":
-        draw_pixelated_alien(x, y, is_jumping)
 
-
-def draw_coin(x, y):
-    """Draw a pixelated spinning coin"""
+def draw_coin_frame(surface, x, y, spin_state):
+    """Draw one frame (spin_state 0-3) of the spinning coin"""
     gold = (255, 215, 0)
     dark_gold = (218, 165, 32)
     
-    # Spinning animation based on frame count
-    spin_state = (frame_count // 5) % 4
-    
     if spin_state == 0 or spin_state == 2:
         # Full circle view
-        pygame.draw.rect(screen, gold, (x + 5, y, 20, 30))
-        pygame.draw.rect(screen, gold, (x, y + 5, 30, 20))
-        pygame.draw.circle(screen, dark_gold, (x + 15, y + 15), 5)
+        pygame.draw.rect(surface, gold, (x + 5, y, 20, 30))
+        pygame.draw.rect(surface, gold, (x, y + 5, 30, 20))
+        pygame.draw.circle(surface, dark_gold, (x + 15, y + 15), 5)
     elif spin_state == 1:
         # Turning (thinner)
-        pygame.draw.rect(screen, gold, (x + 10, y, 10, 30))
-        pygame.draw.rect(screen, dark_gold, (x + 12, y + 10, 6, 10))
+        pygame.draw.rect(surface, gold, (x + 10, y, 10, 30))
+        pygame.draw.rect(surface, dark_gold, (x + 12, y + 10, 6, 10))
     else:
         # Turned (very thin)
-        pygame.draw.rect(screen, gold, (x + 13, y, 4, 30))
-        pygame.draw.rect(screen, dark_gold, (x + 14, y + 10, 2, 10))
-
+        pygame.draw.rect(surface, gold, (x + 13, y, 4, 30))
+        pygame.draw.rect(surface, dark_gold, (x + 14, y + 10, 2, 10))
 
-def check_collision(player_x, player_y, player_width, player_height, obstacle_x, obstacle_y, obstacle_width, obstacle_height):
-    """Check if player collides with an obstacle"""
-    if (player_x < obstacle_x + obstacle_width and
-        player_x + player_width > obstacle_x and
-        player_y < obstacle_y + obstacle_height and
-        player_y + player_height > obstacle_y):
-        return True
-    return False
 
-
-def draw_boulder(x, y):
+def draw_boulder_art(surface, x, y):
     """Draw a textured boulder"""
     # Main boulder body
     gray = (128, 128, 128)
@@ -215,14 +189,138 @@ def draw_boulder(x, y):
     light_gray = (160, 160, 160)
     
     # Base circle (using rectangles to simulate)
-    pygame.draw.rect(screen, gray, (x + 5, y, 30, 40))
-    pygame.draw.rect(screen, gray, (x, y + 5, 40, 30))
+    pygame.draw.rect(surface, gray, (x + 5, y, 30, 40))
+    pygame.draw.rect(surface, gray, (x, y + 5, 40, 30))
     
     # Texture details
-    pygame.draw.rect(screen, dark_gray, (x + 10, y + 10, 8, 8))
-    pygame.draw.rect(screen, dark_gray, (x + 22, y + 20, 10, 10))
-    pygame.draw.rect(screen, light_gray, (x + 8, y + 25, 6, 6))
-    pygame.draw.rect(screen, light_gray, (x + 25, y + 8, 7, 7))
+    pygame.draw.rect(surface, dark_gray, (x + 10, y + 10, 8, 8))
+    pygame.draw.rect(surface, dark_gray, (x + 22, y + 20, 10, 10))
+    pygame.draw.rect(surface, light_gray, (x + 8, y + 25, 6, 6))
+    pygame.draw.rect(surface, light_gray, (x + 25, y + 8, 7, 7))
+
+
+# ===== SPRITE SHEET =====
+# Every pose, leg position and coin frame is drawn once into one atlas
+# (the first time something is drawn), then each entity is a single blit
+
+CHARACTER_SIZE = (56, 72)   # Big enough for every character and pose
+CHARACTER_ART = {
+    "human": (draw_pixelated_human, 8),     # (painter, running leg frames)
+    "pig": (draw_pixelated_pig, 6),
+    "cow": (draw_pixelated_cow, 6),
+    "alien": (draw_pixelated_alien, 6),
+}
+
+SPRITES = SpriteAtlas()
+
+
+def paint(painter, *args):
+    """A painter for the atlas: draws at (0, 0) on the surface it gets."""
+    return lambda surface: painter(surface, 0, 0, *args)
+
+
+for character, (painter, leg_frames) in CHARACTER_ART.items():
+    SPRITES.add((character, "jump"), CHARACTER_SIZE, paint(painter, True))
+    for leg_offset in range(-(leg_frames // 2), leg_frames - leg_frames // 2):
+        SPRITES.add((character, "run", leg_offset), CHARACTER_SIZE, paint(painter, False, leg_offset))
+for spin_state in range(4):
+    SPRITES.add(("coin", spin_state), (30, 30), paint(draw_coin_frame, spin_state))
+SPRITES.add(("boulder",), (40, 40), paint(draw_boulder_art))
+
+
+def draw_character(x, y, character_type, is_jumping, scale=1):
+    """Draw the selected character (scale: whole-number size multiplier)"""
+    if is_jumping:
+        name = (character_type, "jump")
+    else:
+        # Animated legs: step through the running frames every 5 ticks
+        leg_frames = CHARACTER_ART[character_type][1]
+        name = (character_type, "run", (frame_count // 5) % leg_frames - leg_frames // 2)
+    SPRITES.scaled(scale).blit(screen, name, (x, y))
+
+
+def draw_coin(x, y):
+    """Draw a pixelated spinning coin"""
+    # Spinning animation based on frame count
+    SPRITES.blit(screen, ("coin", (frame_count // 5) % 4), (x, y))
+
+
+def draw_boulder(x, y):
+    """Draw a textured boulder"""
+    SPRITES.blit(screen, ("boulder",), (x, y))
+
+
+# ===== PARALLAX BACKGROUND =====
+# The playing screen's background is a few tiles painted once per mode
+# (see parallax.py): the sky with the sun or moon stays put, the stars
+# and hills drift slowly behind, and the grass moves with the boulders
+
+SKY_HEIGHT = 300            # The grass layer covers everything below
+GRASS_TILE_WIDTH = 810      # A multiple of the 30 pixel blade spacing, so it tiles
+HILL_TILE_WIDTH = 1200
+HILL_TOPS = (30, 55, 20, 45, 60, 35)    # One hill every 200 pixels
+
+
+def paint_sky(surface, sky_color, body_color, body_radius):
+    """Plain sky with the sun or moon"""
+    surface.fill(sky_color)
+    pygame.draw.circle(surface, body_color, (700, 80), body_radius)
+
+
+def paint_stars(surface):
+    """Stars on a grid, nudged once with fixed random numbers so they don't flicker"""
+    rng = random.Random(7)
+    width = surface.get_width()
+    for i in range(0, width, 100):
+        for j in range(0, 250, 80):
+            pygame.draw.rect(surface, (255, 255, 255), ((i + rng.randint(-10, 10)) % width, j, 2, 2))
+
+
+def paint_hills(surface, color):
+    """Rounded hills standing on the bottom edge of the tile"""
+    width, height = surface.get_size()
+    for i, top in enumerate(HILL_TOPS):
+        x = i * width // len(HILL_TOPS) - 60
+        # Also draw each hill one tile to the left and right, so the
+        # parts hanging over an edge come back in on the other side
+        for shift in (-width, 0, width):
+            pygame.draw.ellipse(surface, color, (x + shift, top, 320, 2 * (height - top)))
+
+
+def paint_grass(surface, grass_color, ground_color, blade_color=None):
+    """Grass strip, ground and grass blades if blade_color is given (the tile starts 5 pixels above the grass)"""
+    width = surface.get_width()
+    pygame.draw.rect(surface, grass_color, (0, 5, width, 20))
+    pygame.draw.rect(surface, ground_color, (0, 25, width, 80))
+    if blade_color is not None:     # Night mode has none
+        for i in range(0, width, 30):
+            pygame.draw.rect(surface, blade_color, (i, 0, 3, 10))
+
+
+BACKGROUNDS = {
+    # day_mode -> background layers, farthest first
+    True: ParallaxBackground([
+        ParallaxLayer((SCREEN_WIDTH, SKY_HEIGHT),
+                      lambda s: paint_sky(s, DAY_SKY, (255, 255, 0), 40), factor=0),
+        ParallaxLayer((HILL_TILE_WIDTH, 100),
+                      lambda s: paint_hills(s, (90, 170, 90)), factor=0.3, y=200, transparent=True),
+        ParallaxLayer((GRASS_TILE_WIDTH, 105),
+                      lambda s: paint_grass(s, DAY_GRASS, DAY_GROUND, (20, 100, 20)),
+                      factor=1, y=295, transparent=True),
+    ]),
+    False: ParallaxBackground([
+        ParallaxLayer((SCREEN_WIDTH, SKY_HEIGHT),
+                      lambda s: paint_sky(s, NIGHT_SKY, (220, 220, 220), 35), factor=0),
+        ParallaxLayer((SCREEN_WIDTH, 250), paint_stars, factor=0.05, transparent=True),
+        ParallaxLayer((HILL_TILE_WIDTH, 100),
+                      lambda s: paint_hills(s, (30, 40, 80)), factor=0.3, y=200, transparent=True),
+        ParallaxLayer((GRASS_TILE_WIDTH, 105),
+                      lambda s: paint_grass(s, NIGHT_GRASS, NIGHT_GROUND),
+                      factor=1, y=295, transparent=True),
+    ]),
+}
+for layers in BACKGROUNDS.values():
+    layers.build()
 
 
 def draw_button(text, x, y, width, height, mouse_pos):
@@ -242,9 +340,8 @@ def draw_button(text, x, y, width, height, mouse_pos):
     pygame.draw.rect(screen, (0, 0, 0), (x, y, width, height), 3)
     
     # Draw text
-    text_surf = font.render(text, True, (255, 255, 255))
-    text_rect = text_surf.get_rect(center=(x + width // 2, y + height // 2))
-    screen.blit(text_surf, text_rect)
+    TEXT_CACHE.draw(screen, text, (x + width // 2, y + height // 2), FONT_SIZE, (255, 255, 255),
+                    anchor="center")
     
     return is_hovering
 
@@ -284,8 +381,14 @@ def draw_character_preview(character_type, x, y):
 
 
 # ===== GAME LOOP =====
+# Frame timing per phase: F3 shows it, FRAME_PROFILE=out.csv also saves it
+profiler = FrameProfiler.from_env()
+
 running = True
 while running:
+    # Real time since the last frame (clock.tick caps drawing at 60 FPS)
+    frame_seconds = clock.tick(60) / 1000
+    profiler.begin_frame()
     mouse_pos = pygame.mouse.get_pos()
     mouse_clicked = False
     
@@ -297,13 +400,16 @@ while running:
         if event.type == pygame.MOUSEBUTTONDOWN:
             mouse_clicked = True
         
+        # F3 switches the frame timing overlay on and off
+        profiler.handle_event(event)
+        
         # Keyboard controls for playing state
         if game_state == "playing":
             if event.type == pygame.KEYDOWN:
                 # Jump with spacebar only
-                if event.key == pygame.K_SPACE and not is_jumping:
-                    is_jumping = True
-                    player_velocity_y = jump_strength
+                if event.key == pygame.K_SPACE:
+                    jump_pressed = True
+    profiler.mark("events")
     
     
     # ===== MENU STATE =====
@@ -351,33 +457,29 @@ while running:
         draw_coin(720, 120)
         
         # Title with shadow
-        title_text = pygame.font.Font(None, 72).render("BOULDER RUNNER", True, (0, 0, 0))
-        screen.blit(title_text, (152, 72))
-        title_text = pygame.font.Font(None, 72).render("BOULDER RUNNER", True, (255, 215, 0))
-        screen.blit(title_text, (150, 70))
+        TEXT_CACHE.draw(screen, "BOULDER RUNNER", (152, 72), TITLE_FONT_SIZE, (0, 0, 0))
+        TEXT_CACHE.draw(screen, "BOULDER RUNNER", (150, 70), TITLE_FONT_SIZE, (255, 215, 0))
         
         # Subtitle
-        subtitle = small_font.render("Dodge boulders, collect coins!", True, (50, 50, 50))
-        screen.blit(subtitle, (260, 140))
+        TEXT_CACHE.draw(screen, "Dodge boulders, collect coins!", (260, 140), SMALL_FONT_SIZE,
+                        (50, 50, 50))
         
         # Day/Night Mode Toggle
-        mode_label = small_font.render("Day", True, (255, 255, 255))
-        screen.blit(mode_label, (300, 190))
+        TEXT_CACHE.draw(screen, "Day", (300, 190), SMALL_FONT_SIZE, (255, 255, 255))
         
         # Toggle switch
         if draw_toggle_switch(340, 183, day_mode, mouse_pos) and mouse_clicked:
             day_mode = not day_mode
         
-        night_label = small_font.render("Night", True, (255, 255, 255))
-        screen.blit(night_label, (430, 190))
+        TEXT_CACHE.draw(screen, "Night", (430, 190), SMALL_FONT_SIZE, (255, 255, 255))
         
         # Large Play button
         if draw_button("PLAY", 300, 240, 200, 60, mouse_pos) and mouse_clicked:
             game_state = "character_select"
         
         # Instructions at bottom with better visibility
-        inst_text = small_font.render("SPACEBAR: Jump", True, (255, 255, 255))
-        screen.blit(inst_text, (330, 350))
+        TEXT_CACHE.draw(screen, "SPACEBAR: Jump", (330, 350), SMALL_FONT_SIZE, (255, 255, 255))
+        profiler.mark("menu")
     
     
     # ===== MODE SELECT STATE (removed, now handled on menu) =====
@@ -396,8 +498,7 @@ while running:
             pygame.draw.rect(screen, NIGHT_GRASS, (0, 300, SCREEN_WIDTH, 100))
         
         # Title
-        title_text = font.render("Choose Your Character", True, (255, 255, 255))
-        screen.blit(title_text, (220, 30))
+        TEXT_CACHE.draw(screen, "Choose Your Character", (220, 30), FONT_SIZE, (255, 255, 255))
         
         # Character buttons with previews
         characters = ["human", "pig", "cow", "alien"]
@@ -413,122 +514,63 @@ while running:
             if draw_button(name, x_pos - 30, 220, 120, 40, mouse_pos) and mouse_clicked:
                 selected_character = char
                 game_state = "playing"
-                # Reset game variables
-                obstacles = []
-                coins = []
-                score = 0
-                obstacle_speed = 5
-                player_y = ground_level
-                player_velocity_y = 0
-                is_jumping = False
-                frame_count = 0
-                last_obstacle_x = 0
+                # Start a new run
+                recorder = ReplayRecorder("runner", new_seed())
+                sim = recorder.sim
+                background = BACKGROUNDS[day_mode]
+                background.reset()
+                timestep = FixedTimestep()
+                jump_pressed = False
+        profiler.mark("menu")
     
     
     # ===== PLAYING STATE =====
     elif game_state == "playing":
-        # Increment frame counter
-        frame_count += 1
+        # Run as many game ticks as real time has passed
+        for _ in range(timestep.advance(frame_seconds)):
+            if not sim.game_over:
+                background.scroll(sim.obstacle_speed)   # Ground keeps pace with the boulders
+            recorder.step(jump_pressed)
+            jump_pressed = False
         
-        # Draw background based on mode
-        if day_mode:
-            screen.fill(DAY_SKY)
-            # Sun
-            pygame.draw.circle(screen, (255, 255, 0), (700, 80), 40)
-            # Ground
-            pygame.draw.rect(screen, DAY_GRASS, (0, 300, SCREEN_WIDTH, 20))
-            pygame.draw.rect(screen, DAY_GROUND, (0, 320, SCREEN_WIDTH, 80))
-            # Grass blades
-            for i in range(0, SCREEN_WIDTH, 30):
-                pygame.draw.rect(screen, (20, 100, 20), (i, 295, 3, 10))
-        else:
-            screen.fill(NIGHT_SKY)
-            # Moon
-            pygame.draw.circle(screen, (220, 220, 220), (700, 80), 35)
-            # Stars
-            for i in range(0, SCREEN_WIDTH, 100):
-                for j in range(0, 250, 80):
-                    pygame.draw.rect(screen, (255, 255, 255), (i + random.randint(-10, 10), j, 2, 2))
-            # Ground
-            pygame.draw.rect(screen, NIGHT_GRASS, (0, 300, SCREEN_WIDTH, 20))
-            pygame.draw.rect(screen, NIGHT_GROUND, (0, 320, SCREEN_WIDTH, 80))
-        
-        # Apply gravity to player
-        if is_jumping or player_y < ground_level:
-            player_velocity_y += gravity
-            player_y += player_velocity_y
-            
-            # Check if player landed
-            if player_y >= ground_level:
-                player_y = ground_level
-                is_jumping = False
-                player_velocity_y = 0
+        # How far we are between the last tick and the next one, so moving
+        # things are drawn smoothly even when ticks and frames don't line up
+        # (once the game is over nothing moves, so draw the final positions)
+        alpha = 1.0 if sim.game_over else timestep.alpha
+        frame_count = sim.tick  # Ticks drive the animations
+        score = sim.score
+        profiler.mark("update")
         
-        # Adjust player hitbox
-        current_height = player_height
-        current_y_offset = 0
+        # Draw the scrolling background (a few pre-painted tiles)
+        background.draw(screen, alpha)
+        profiler.mark("background")
         
         # Draw player character
-        draw_character(player_x, player_y, selected_character, is_jumping)
+        draw_character(player_x, sim.player_y_at(alpha), selected_character, sim.is_jumping)
         
-        # Spawn ground obstacles (boulders) with proper spacing
-        # Only spawn if last boulder is far enough away (300-400 pixels)
-        if len(obstacles) == 0 or obstacles[-1]['x'] < SCREEN_WIDTH - random.randint(300, 400):
-            if random.randint(1, 60) == 1:
-                obstacles.append({'x': SCREEN_WIDTH, 'y': 270, 'width': 40, 'height': 40})
-                last_obstacle_x = SCREEN_WIDTH
-        
-        # Spawn coins at jump arc heights (150-200 is optimal for jump collection)
-        if random.randint(1, 100) == 1:
-            coin_height = random.choice([150, 165, 180, 195])
-            coins.append({'x': SCREEN_WIDTH, 'y': coin_height, 'width': 30, 'height': 30})
-        
-        # Update and draw ground obstacles
-        for obstacle in obstacles[:]:
-            obstacle['x'] -= obstacle_speed
-            
-            # Draw boulder
-            draw_boulder(obstacle['x'], obstacle['y'])
-            
-            # Check collision
-            if check_collision(player_x, player_y + current_y_offset, player_width, current_height,
-                             obstacle['x'], obstacle['y'], obstacle['width'], obstacle['height']):
-                game_state = "game_over"
-            
-            # Remove off-screen obstacles
-            if obstacle['x'] < -obstacle['width']:
-                obstacles.remove(obstacle)
+        # Draw ground obstacles (boulders) and coins
+        for obstacle in sim.obstacles:
+            draw_boulder(obstacle.x_at(alpha), obstacle.y)
+        for coin in sim.coins:
+            draw_coin(coin.x_at(alpha), coin.y)
+        profiler.mark("entities")
         
-        # Update and draw coins
-        for coin in coins[:]:
-            coin['x'] -= obstacle_speed
-            
-            # Draw coin
-            draw_coin(coin['x'], coin['y'])
-            
-            # Check if player collected the coin
-            if check_collision(player_x, player_y + current_y_offset, player_width, current_height,
-                             coin['x'], coin['y'], coin['width'], coin['height']):
-                coins.remove(coin)
-                score += 1  # Increase score when coin is collected
-            
-            # Remove off-screen coins
-            if coin['x'] < -coin['width']:
-                coins.remove(coin)
+        if sim.game_over:
+            game_state = "game_over"
+            save_run(recorder)
         
         # Draw HUD (score and speed)
-        score_text = font.render(f"Coins: {score}", True, (255, 255, 255))
-        screen.blit(score_text, (10, 10))
+        TEXT_CACHE.draw_counter(screen, "Coins: ", score, (10, 10), FONT_SIZE, (255, 255, 255))
         
         # Draw coin icon next to score
         draw_coin(130, 15)
         
-        speed_text = small_font.render(f"Speed: {obstacle_speed}", True, (255, 255, 255))
-        screen.blit(speed_text, (10, 50))
+        TEXT_CACHE.draw_counter(screen, "Speed: ", sim.obstacle_speed, (10, 50), SMALL_FONT_SIZE,
+                                (255, 255, 255))
         
         # Draw controls hint
-        controls_text = small_font.render("SPACEBAR: Jump", True, (255, 255, 255))
-        screen.blit(controls_text, (SCREEN_WIDTH - 200, 10))
+        TEXT_CACHE.draw(screen, "SPACEBAR: Jump", (SCREEN_WIDTH - 200, 10), SMALL_FONT_SIZE, (255, 255, 255))
+        profiler.mark("HUD")
     
     
     # ===== GAME OVER STATE =====
@@ -542,17 +584,16 @@ while running:
             pygame.draw.rect(screen, NIGHT_GRASS, (0, 300, SCREEN_WIDTH, 100))
         
         # Game over text
-        game_over_text = font.render("Game Over!", True, (255, 0, 0))
-        screen.blit(game_over_text, (SCREEN_WIDTH // 2 - 100, 100))
+        TEXT_CACHE.draw(screen, "Game Over!", (SCREEN_WIDTH // 2 - 100, 100), FONT_SIZE, (255, 0, 0))
         
         # Final score with coin icon
-        final_score_text = font.render(f"Coins Collected: {score}", True, (255, 255, 255))
-        screen.blit(final_score_text, (SCREEN_WIDTH // 2 - 140, 150))
+        TEXT_CACHE.draw_counter(screen, "Coins Collected: ", score, (SCREEN_WIDTH // 2 - 140, 150),
+                                FONT_SIZE, (255, 255, 255))
         draw_coin(SCREEN_WIDTH // 2 + 120, 155)
         
         # Character used
-        char_text = small_font.render(f"Character: {selected_character.capitalize()}", True, (255, 255, 255))
-        screen.blit(char_text, (SCREEN_WIDTH // 2 - 100, 200))
+        TEXT_CACHE.draw(screen, f"Character: {selected_character.capitalize()}",
+                        (SCREEN_WIDTH // 2 - 100, 200), SMALL_FONT_SIZE, (255, 255, 255))
         
         # Buttons
         if draw_button("Play Again", 250, 250, 150, 50, mouse_pos) and mouse_clicked:
@@ -560,13 +601,18 @@ while running:
         
         if draw_button("Main Menu", 410, 250, 150, 50, mouse_pos) and mouse_clicked:
             game_state = "menu"
+        profiler.mark("menu")
+    
     
+    # Frame timing overlay (only while switched on)
+    profiler.draw_overlay(screen)
+    profiler.mark("overlay")
     
     # Update display
     pygame.display.flip()
-    
-    # Control frame rate (60 FPS)
-    clock.tick(60)
+    profiler.mark("flip")
+    profiler.end_frame()
 
-# Quit pygame
+# Save the frame times (if FRAME_PROFILE is set) and quit pygame
+profiler.close()
 pygame.quit()
\ No newline at end of file
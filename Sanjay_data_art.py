@@ -9,13 +9,30 @@
    - Understanding data normalization concepts
 """
 
-import csv
-import sys
+import argparse
+import os
+import time
 from pathlib import Path
 
+# Keep pygame's welcome message off stdout (raw frames may go there)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
 import pygame
 
-from visual_objects import BoneCrystal, DogSprite
+from bone_mapping import map_breeds
+from dog_data import load_breeds, load_columns, load_columns_cached
+from frame_profiler import FrameProfiler
+from quality import QUALITY_NAMES, QualityGovernor
+from visual_objects import (
+    GLOW_CACHE,
+    PARTICLE_SYSTEM,
+    BackgroundCompositor,
+    BoneCrystal,
+    BoneGrid,
+    DogSprite,
+    RotationSpriteCache,
+    vertical_gradient,
+)
 
 # CONFIGURATION CONSTANTS
 # These define the window size and performance settings
@@ -24,122 +41,191 @@ SCREEN_WIDTH = 1280         # Window width in pixels
 SCREEN_HEIGHT = 720         # Window height in pixels
 FPS = 60                    # Target frames per second (60 is smooth)
 
+# Bone body sprite cache: number of pre-rendered angles per bone
+# (e.g. 64 or 128; 0 = draw bones with pygame.draw every frame)
+BONE_ANGLE_STEPS = 0
+
 # Layout constants
 GRASS_HEIGHT = SCREEN_HEIGHT // 6  # Bottom grass strip height (1/6 of screen)
 
+# Background colors (swap the theme to recolor the whole scene)
+NIGHT_THEME = {
+    "sky_top": (10, 25, 60),       # Dark navy blue at top
+    "sky_bottom": (50, 80, 140),   # Lighter blue at horizon
+    "grass": (45, 135, 55),        # Dark green grass color
+}
+
 
 # DATA LOADING FUNCTIONS
 
 def load_dog_data(path: Path):
-    
-    rows = []  # Empty list to store all rows
-    
-    # Open the file with proper encoding for special characters
-    # 'newline=""' handles different line ending styles (Windows vs Mac)
-    with path.open(newline="", encoding="utf-8") as f:
-        # DictReader automatically uses first row as column names (keys)
-        reader = csv.DictReader(f)
-        
-        # Loop through each row in the CSV
-        for row in reader:
-            rows.append(row)  # Add this row's dictionary to our list
-    
-    return rows
-
+    """
+    Load every breed from the CSV as a list of BreedRecords.
 
-def _get_first_non_empty(row, keys):
-    
-    # Loop through each possible column name
-    for k in keys:
-        # Check if this key exists in the row dictionary
-        # AND it's not None
-        # AND when converted to string and whitespace removed, it's not empty
-        if k in row and row[k] is not None and str(row[k]).strip() != "":
-            return row[k]  # Found a good value, return it!
-    
-    return ""  # Didn't find any good value, return empty string
+    The column names are matched once for the whole file and each row is
+    parsed as it streams in, with the four ratings already normalized
+    to 0.0-1.0 (see dog_data.py).
+    """
+    return load_breeds(path)
 
 
-def _map_1_to_5(value_str, default=3.0):
+def load_dog_columns(path: Path, timing: bool = False):
     """
-    Convert a (possibly empty) 1–5 rating into 0–1 normalized float.
-    
+    Load every breed as NumPy columns, using the binary cache if possible.
+
+    With timing=True, print how long the load took and whether it was
+    a cold start (CSV parsed, cache written) or a warm start (cache hit),
+    plus the other kind of load for comparison.
     """
-    # Try to convert string to float
-    try:
-        v = float(value_str)
-    except (TypeError, ValueError):
-        # If conversion fails (empty string, None, invalid text)
-        # Use the default value instead
-        v = float(default)
-
-    # Clamp value to valid 1-5 range
-    # (in case CSV has weird values like 0 or 10)
-    if v < 1.0:
-        v = 1.0
-    if v > 5.0:
-        v = 5.0
-    
-    # Normalize from [1, 5] range to [0, 1] range
-    # Formula: (value - min) / (max - min)
-    # (v - 1) / (5 - 1) = (v - 1) / 4
-    return (v - 1.0) / 4.0
+    start = time.perf_counter()
+    columns = load_columns_cached(path)
+    elapsed = time.perf_counter() - start
+
+    if timing:
+        kind = "warm (binary cache)" if columns.from_cache else "cold (CSV parse + cache write)"
+        print(f"Loaded {len(columns)} breeds, {kind}: {elapsed * 1000:.1f} ms")
+
+        # Time the other path too so both numbers are on screen
+        start = time.perf_counter()
+        if columns.from_cache:
+            load_columns(path)
+            kind = "cold (CSV parse only)"
+        else:
+            load_columns_cached(path)
+            kind = "warm (binary cache)"
+        print(f"For comparison, {kind}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    return columns
 
 
 
 # BACKGROUND DRAWING FUNCTIONS
 
-def draw_sky(surface: pygame.Surface):
+def draw_sky(surface: pygame.Surface, theme=None):
     """
     Draws a night gradient background.
 
     """
-    # Define gradient colors
-    top = (10, 25, 60)       # Dark navy blue at top
-    bottom = (50, 80, 140)   # Lighter blue at horizon
-
-    # Draw one horizontal line for each pixel height
-    for y in range(SCREEN_HEIGHT):
-        # Calculate interpolation factor (0.0 at top, 1.0 at bottom)
-        t = y / SCREEN_HEIGHT
-        
-        # Linearly interpolate (blend) between top and bottom colors
-        # When t=0 (top), we get top color
-        # When t=1 (bottom), we get bottom color
-        # In between, we get a blend
-        r = int(top[0] * (1 - t) + bottom[0] * t)
-        g = int(top[1] * (1 - t) + bottom[1] * t)
-        b = int(top[2] * (1 - t) + bottom[2] * t)
-        
-        # Draw this horizontal line
-        pygame.draw.line(surface, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+    theme = theme or NIGHT_THEME
+
+    # Blend from dark navy at the top to lighter blue at the horizon
+    # (every row is computed at once instead of one line per pixel)
+    vertical_gradient(surface, theme["sky_top"], theme["sky_bottom"])
 
 
-def draw_grass(surface: pygame.Surface):
+def draw_grass(surface: pygame.Surface, theme=None):
     """
     Draw single clean grass strip at bottom of screen.
 
     """
-    color = (45, 135, 55)  # Dark green grass color
+    theme = theme or NIGHT_THEME
+    width, height = surface.get_size()
+    grass_height = height // 6  # Same 1/6 of the screen as GRASS_HEIGHT
     
     # Draw rectangle at bottom of screen
     # Parameters: (x, y, width, height)
     # x=0, y=bottom-grass_height, width=full screen, height=grass_height
     pygame.draw.rect(
         surface,
-        color,
-        (0, SCREEN_HEIGHT - GRASS_HEIGHT, SCREEN_WIDTH, GRASS_HEIGHT),
+        theme["grass"],
+        (0, height - grass_height, width, grass_height),
     )
 
 
-# BONE CREATION FUNCTION (DATA → VISUAL MAPPING)
+# BONE CREATION FUNCTIONS (DATA → VISUAL MAPPING)
 
 
-def create_bones(rows):
+def grid_area():
+    """
+    Screen area the bone grid is laid out in.
+
+    Everything between the top margin and a small gap above the grass.
+    """
+    top_margin = 60      # Space from top of screen
+    bottom_margin = 40   # Space above grass
+    
+    # Calculate where grass starts
+    bottom_limit = SCREEN_HEIGHT - GRASS_HEIGHT - bottom_margin
+    
+    # Calculate available vertical space
+    vertical_space = bottom_limit - top_margin
+
+    return pygame.Rect(0, top_margin, SCREEN_WIDTH, vertical_space)
+
+
+def bone_params(row):
+    """
+    Convert one breed (a BreedRecord) into the visual values of a BoneCrystal.
+
+    Returns a dict with length, rotation_speed, color, symmetry,
+    glow_intensity and barking_level (everything except position).
+    """
+    # === NORMALIZED DATA ===
+    # The loader already turned the 1-5 ratings into 0.0-1.0
+    # (missing values default to the middle, 3.0)
+    energy = row.energy
+    barking = row.barking
+    shedding = row.shedding
+    trainability = row.trainability
+
+    # === VISUAL PROPERTY CALCULATIONS ===
+    
+    # BONE LENGTH: More energy = longer bone
+    # Range: 120-200 pixels
+    length = 120 + energy * 80
+
+    # ROTATION SPEED: Less trainable = more chaotic/faster spin
+    # Stubborn dogs spin faster! Range: 0.3-1.1 radians/sec
+    rotation_speed = 0.3 + (1.0 - trainability) * 0.8
+
+    # COLOR CALCULATION: Create warm/cool color palette
+    # Red channel: Higher energy = more red (warmer)
+    base_r = 140 + int(80 * energy)
+    
+    # Green channel: Less shedding = slightly greener
+    base_g = 120 + int(50 * (1.0 - shedding))
+    
+    # Blue channel: Quieter dogs = more blue (cooler)
+    base_b = 190 + int(40 * (1.0 - barking))
+
+    # Clamp values to valid RGB range [0, 255]
+    r_col = max(0, min(255, base_r))
+    g_col = max(0, min(255, base_g))
+    b_col = max(0, min(255, base_b))
+    color = (r_col, g_col, b_col)
+
+    # CRYSTAL SYMMETRY: More trainable = more orderly crystals
+    # Well-trained dogs have symmetric patterns
+    # Range: 0.3-0.9 (30%-90% symmetry)
+    symmetry = 0.3 + trainability * 0.6
+
+    # GLOW INTENSITY: More shedding = stronger halo
+    # Imagine fur creating a fuzzy glow!
+    # Range: 0.4-0.9 (40%-90% brightness)
+    glow_intensity = 0.4 + shedding * 0.5
+
+    # SPARK DENSITY: Barking directly controls particle emission
+    # Loud dogs = lots of sparks flying!
+    # This is already 0.0-1.0 from normalization
+    barking_level = barking
+
+    return {
+        "length": length,                      # Size
+        "rotation_speed": rotation_speed,      # Spin speed
+        "color": color,                        # RGB color
+        "symmetry": symmetry,                  # Crystal pattern orderliness
+        "glow_intensity": glow_intensity,      # Halo brightness
+        "barking_level": barking_level,        # Particle amount
+    }
+
+
+def create_bones(rows, sprite_cache=None):
     """
     Creates up to 20 BoneCrystal objects positioned in a 5x4 grid.
 
     Takes dog breed data from the CSV and converts it into visual bone crystals.
+    sprite_cache is an optional RotationSpriteCache shared by every bone.
+    (The main program uses a scrollable BoneGrid to show every breed.)
 
     """
     # Only use the first 20 breeds (requirement: minimum 20 rows)
@@ -152,20 +238,11 @@ def create_bones(rows):
 
     # Calculate horizontal spacing
     # Divide screen into (cols+1) sections to get even spacing
-    spacing_x = SCREEN_WIDTH / (cols + 1)
+    area = grid_area()
+    spacing_x = area.width / (cols + 1)
 
-    # Calculate vertical spacing
-    top_margin = 60      # Space from top of screen
-    bottom_margin = 40   # Space above grass
-    
-    # Calculate where grass starts
-    bottom_limit = SCREEN_HEIGHT - GRASS_HEIGHT - bottom_margin
-    
-    # Calculate available vertical space
-    vertical_space = bottom_limit - top_margin
-    
     # Divide into equal rows
-    spacing_y = vertical_space / (row_count + 1)
+    spacing_y = area.height / (row_count + 1)
 
     # Create a bone for each dog breed
     for i, r in enumerate(rows):
@@ -175,93 +252,14 @@ def create_bones(rows):
 
         # Calculate actual screen coordinates
         x = (col_i + 1) * spacing_x  # Multiply by (index+1) for spacing
-        y = top_margin + (row_i + 1) * spacing_y
-
-        # === DATA EXTRACTION ===
-        # Try multiple possible column names (CSV files vary!)
-        
-        # Energy level (how active the dog is)
-        energy_raw = _get_first_non_empty(
-            r,
-            ["energy_level_value", "Energy Level", "energy_level"],
-        )
-        
-        # Barking level (how vocal the dog is)
-        barking_raw = _get_first_non_empty(
-            r,
-            ["barking_level_value", "Barking Level", "barking_level"],
-        )
-        
-        # Shedding level (how much fur they lose)
-        shedding_raw = _get_first_non_empty(
-            r,
-            ["shedding_level_value", "Shedding Level", "shedding_level"],
-        )
-        
-        # Trainability (how easy to train)
-        train_raw = _get_first_non_empty(
-            r,
-            ["trainability_level_value", "Trainability", "trainability_level"],
-        )
-
-        # === NORMALIZATION ===
-        # Convert 1-5 ratings to 0.0-1.0 range for calculations
-        energy = _map_1_to_5(energy_raw, default=3.0)          # Default to middle
-        barking = _map_1_to_5(barking_raw, default=3.0)
-        shedding = _map_1_to_5(shedding_raw, default=3.0)
-        trainability = _map_1_to_5(train_raw, default=3.0)
-
-        # === VISUAL PROPERTY CALCULATIONS ===
-        
-        # BONE LENGTH: More energy = longer bone
-        # Range: 120-200 pixels
-        length = 120 + energy * 80
-
-        # ROTATION SPEED: Less trainable = more chaotic/faster spin
-        # Stubborn dogs spin faster! Range: 0.3-1.1 radians/sec
-        rotation_speed = 0.3 + (1.0 - trainability) * 0.8
-
-        # COLOR CALCULATION: Create warm/cool color palette
-        # Red channel: Higher energy = more red (warmer)
-        base_r = 140 + int(80 * energy)
-        
-        # Green channel: Less shedding = slightly greener
-        base_g = 120 + int(50 * (1.0 - shedding))
-        
-        # Blue channel: Quieter dogs = more blue (cooler)
-        base_b = 190 + int(40 * (1.0 - barking))
-
-        # Clamp values to valid RGB range [0, 255]
-        r_col = max(0, min(255, base_r))
-        g_col = max(0, min(255, base_g))
-        b_col = max(0, min(255, base_b))
-        color = (r_col, g_col, b_col)
-
-        # CRYSTAL SYMMETRY: More trainable = more orderly crystals
-        # Well-trained dogs have symmetric patterns
-        # Range: 0.3-0.9 (30%-90% symmetry)
-        symmetry = 0.3 + trainability * 0.6
-
-        # GLOW INTENSITY: More shedding = stronger halo
-        # Imagine fur creating a fuzzy glow!
-        # Range: 0.4-0.9 (40%-90% brightness)
-        glow_intensity = 0.4 + shedding * 0.5
-
-        # SPARK DENSITY: Barking directly controls particle emission
-        # Loud dogs = lots of sparks flying!
-        # This is already 0.0-1.0 from normalization
-        barking_level = barking
+        y = area.y + (row_i + 1) * spacing_y
 
         # === CREATE THE BONE OBJECT ===
         # Pass all calculated visual properties to BoneCrystal constructor
         bone = BoneCrystal(
             position=(x, y),                    # Where on screen
-            length=length,                      # Size
-            rotation_speed=rotation_speed,      # Spin speed
-            color=color,                        # RGB color
-            symmetry=symmetry,                  # Crystal pattern orderliness
-            glow_intensity=glow_intensity,      # Halo brightness
-            barking_level=barking_level,        # Particle amount
+            sprite_cache=sprite_cache,          # Pre-rendered bone bodies
+            **bone_params(r),                   # Size, color, glow, sparks...
         )
         bones.append(bone)  # Add to our list
 
@@ -270,11 +268,133 @@ def create_bones(rows):
 
 # MAIN PROGRAM
 
-def main(csv_path: str):
+# SCENE
+
+class NightGarden:
+    """
+    Everything in the night garden: background, dog, bones and sparks.
+
+    Keeps the update and draw steps in one place so the live window,
+    the headless exporter and the benchmarks all run the same scene.
+
+    Attributes:
+        background (BackgroundCompositor): Cached sky and grass
+        dog (DogSprite): The little dog on the grass
+        grid (BoneGrid): Scrollable grid of bones (one per breed)
+        particles (ParticleSystem): Pool holding every bone's sparks
+        quality (QualityLevel): Level of detail (None = full, see quality.py)
+    """
+
+    def __init__(self, columns, sprite_cache=None, particles=None, seed=0):
+        """
+        Build the scene from breed columns (see dog_data.load_columns).
+
+        Args:
+            columns: BreedColumns with the normalized ratings
+            sprite_cache: Optional RotationSpriteCache for bone bodies
+            particles: ParticleSystem for sparks (default: the shared one)
+            seed: Seed for the bones' crystal shards
+        """
+        self.particles = particles if particles is not None else PARTICLE_SYSTEM
+
+        # A scrollable 5-column grid holds every breed, but only the bones
+        # on screen (about 20-25) actually exist at any time.
+        # Every breed's visuals are worked out at once (see bone_mapping.py)
+        params = map_breeds(columns)
+        self.grid = BoneGrid(params, None, grid_area(), cols=5, rows_per_page=4,
+                             particles=self.particles, sprite_cache=sprite_cache, seed=seed)
+
+        # Create decorative dog sprite in corner
+        dog_scale = 6.5  # Make 12px sprite → 78px
+        dog_height_px = int(12 * dog_scale)
+        dog_x = 90  # Position from left edge
+        
+        # Position dog on grass (grass_top - dog_height - small_gap)
+        dog_y = SCREEN_HEIGHT - GRASS_HEIGHT - dog_height_px - 5
+        self.dog = DogSprite(dog_x, dog_y, scale=dog_scale)
+
+        # Sky and grass never change, so they are drawn once and cached
+        self.background = BackgroundCompositor([draw_sky, draw_grass], NIGHT_THEME)
+        self.quality = None
+
+    def set_quality(self, level):
+        """
+        Draw the bones with more or less detail (a quality.QualityLevel).
+
+        Glow sizes are rounded to level.glow_step pixels, so lower levels
+        use fewer (and coarser) glow sprites.
+        """
+        self.quality = level
+        if GLOW_CACHE.radius_step != level.glow_step:
+            GLOW_CACHE.radius_step = level.glow_step
+            GLOW_CACHE.clear()  # Sprites of the old sizes won't be used again
+        self.grid.set_quality(level)
+
+    @property
+    def bones(self):
+        """The bones currently on screen."""
+        return self.grid.bones
+
+    def update(self, dt):
+        """Advance every animation by dt seconds."""
+        self.dog.update(dt)  # Update dog tail wag animation
+
+        # Scroll the grid and update each visible bone
+        # (rotation, glow, new particles)
+        self.grid.update(dt)
+
+        # Move every bone's sparks together in one batch
+        self.particles.update(dt)
+
+    def draw(self, surface, rects=None, profiler=None):
+        """
+        Draw one frame of the scene, back to front.
+
+        If rects is given (dirty-rect mode), only those areas of the
+        background are restored before the moving objects are redrawn.
+        A FrameProfiler, if given, times the background and the objects
+        separately.
+        """
+        if rects is None:
+            self.background.draw(surface)  # Layers 1+2: Sky gradient and grass (cached)
+        else:
+            for r in rects:
+                self.background.draw(surface, r)
+        if profiler is not None:
+            profiler.mark("background")
+
+        self.dog.draw(surface)      # Layer 3: Dog sprite
+        
+        for b in self.bones:
+            b.draw(surface)         # Layer 4: All bones (each bone draws its own layers)
+
+        self.particles.draw(surface)  # Layer 5: All sparks in one batch
+        if profiler is not None:
+            profiler.mark("entities")
+
+    def object_rects(self):
+        """Screen areas of every moving object (dog first, then bones)."""
+        return [obj.get_rect() for obj in [self.dog] + self.bones]
+
+    def dirty_regions(self, prev_rects):
+        """
+        Areas that changed since last frame.
+
+        Each object's area from last frame (to erase it) is merged with
+        its area this frame (to draw it again).
+        """
+        rects = self.object_rects()
+        for i, old in enumerate(prev_rects):
+            rects[i] = rects[i].union(old)
+        return rects
+
+
+def main(csv_path: str, dirty_rects: bool = False, timing: bool = False, profile=None,
+         quality: str = "auto"):
     """
     1. Initializes pygame
     2. Loads dog data from CSV
-    3. Creates all visual objects
+    3. Creates all visual objects (a scrollable grid of bones)
     4. Runs the animation loop forever (until user quits)
 
     The animation loop follows the standard game loop pattern:
@@ -283,6 +403,16 @@ def main(csv_path: str):
     - Render graphics (draw everything)
     - Display frame (show on screen)
     - Repeat at 60 FPS
+
+    With dirty_rects=True only the areas around the bones and the dog
+    are redrawn and sent to the display each frame (for slow kiosks).
+    With timing=True the data load time is printed (cold vs warm cache).
+    With profile set (a file name, or "" for none) frame times are
+    recorded from the start and shown in an overlay (F3 toggles it), and
+    saved to that file at the end (see frame_profiler.py).
+    With quality="auto" the level of detail drops when frames take too
+    long and comes back when there is time to spare (see quality.py);
+    "low", "medium" or "high" fixes it.
     """
     # PYGAME INITIALIZATION 
     pygame.init()  # Start up pygame system
@@ -295,27 +425,36 @@ def main(csv_path: str):
     clock = pygame.time.Clock()
 
     #  DATA LOADING 
-    # Load dog breed data from CSV file
-    data = load_dog_data(Path(csv_path))
+    # Load dog breed data from CSV file as NumPy columns
+    # (from the binary cache next to the CSV when it is up to date)
+    columns = load_dog_columns(Path(csv_path), timing)
     
     # Check if file was empty or missing
-    if not data:
+    if len(columns) == 0:
         print("CSV is empty or missing")
         pygame.quit()
         return
 
     # OBJECT CREATION
-    # Create all 20 bone crystals from the data
-    bones = create_bones(data)
-
-    # Create decorative dog sprite in corner
-    dog_scale = 6.5  # Make 12px sprite → 78px
-    dog_height_px = int(12 * dog_scale)
-    dog_x = 90  # Position from left edge
-    
-    # Position dog on grass (grass_top - dog_height - small_gap)
-    dog_y = SCREEN_HEIGHT - GRASS_HEIGHT - dog_height_px - 5
-    dog = DogSprite(dog_x, dog_y, scale=dog_scale)
+    sprite_cache = None
+    if BONE_ANGLE_STEPS > 0:
+        sprite_cache = RotationSpriteCache(angle_steps=BONE_ANGLE_STEPS)
+    scene = NightGarden(columns, sprite_cache)
+    grid = scene.grid
+
+    # Areas covered by moving objects last frame (dirty-rect mode)
+    prev_rects = []
+
+    # Frame timing (does nothing until switched on with --profile or F3)
+    profiler = FrameProfiler(enabled=profile is not None, export_path=profile or None)
+
+    # Level of detail: fixed, or chosen by the governor from the frame times
+    governor = None
+    if quality == "auto":
+        governor = QualityGovernor(target_fps=FPS)
+        scene.set_quality(governor.level)
+    else:
+        scene.set_quality(QUALITY_NAMES[quality])
 
     # MAIN ANIMATION LOOP
     running = True  # Loop control variable
@@ -326,39 +465,77 @@ def main(csv_path: str):
         # tick(60) waits to maintain 60 FPS, returns milliseconds
         # Divide by 1000 to convert to seconds (dt = delta time)
         dt = clock.tick(FPS) / 1000.0
+        frame_start = time.perf_counter()   # Work starts here (the wait is over)
+        profiler.begin_frame()
 
         # === EVENT HANDLING ===
         # Check for user inputs (quit, key presses, mouse, etc.)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:  # User closed window
                 running = False  # Exit the loop
+            elif profiler.handle_event(event):
+                grid.changed = True  # Redraw everything to add/remove the overlay
+            elif event.type == pygame.KEYDOWN:
+                # Arrow keys scroll one row, Page Up/Down a whole page
+                if event.key == pygame.K_DOWN:
+                    grid.scroll_rows(1)
+                elif event.key == pygame.K_UP:
+                    grid.scroll_rows(-1)
+                elif event.key == pygame.K_PAGEDOWN:
+                    grid.page(1)
+                elif event.key == pygame.K_PAGEUP:
+                    grid.page(-1)
+            elif event.type == pygame.MOUSEWHEEL:
+                grid.scroll_rows(-event.y)
+        profiler.mark("events")
 
         # UPDATE PHASE 
         # Update all animations (called every frame)
-        dog.update(dt)  # Update dog tail wag animation
-        
-        for b in bones:
-            b.update(dt)  # Update each bone (rotation, glow, particles)
+        scene.update(dt)
+        profiler.mark("update")
 
         # RENDER PHASE 
-        # Draw everything in correct layer order (back to front)
-        
-        draw_sky(screen)      # Layer 1: Sky gradient (background)
-        draw_grass(screen)    # Layer 2: Grass strip
-
-        dog.draw(screen)      # Layer 3: Dog sprite
-        
-        for b in bones:
-            b.draw(screen)    # Layer 4: All bones (each bone draws its own layers)
-
-        # DISPLAY 
-        # Flip the display buffers (show what we just drew)
-        # pygame uses double buffering: draw to back buffer,
-        # then flip() swaps it to the screen instantly
-        pygame.display.flip()
+        if dirty_rects and not grid.changed:
+            # Only restore and redraw the areas that moved, and only
+            # send those areas to the display
+            rects = scene.dirty_regions(prev_rects)
+            if profiler.overlay_rect:
+                rects.append(profiler.overlay_rect)  # The overlay is see-through
+            scene.draw(screen, rects, profiler)
+            profiler.draw_overlay(screen)
+            profiler.mark("overlay")
+            pygame.display.update(rects)
+        else:
+            # Full redraw (always, or in dirty-rect mode on the first
+            # frame and whenever the grid scrolls)
+            scene.draw(screen, profiler=profiler)
+            profiler.draw_overlay(screen)
+            profiler.mark("overlay")
+
+            # DISPLAY 
+            # Flip the display buffers (show what we just drew)
+            # pygame uses double buffering: draw to back buffer,
+            # then flip() swaps it to the screen instantly
+            pygame.display.flip()
+        profiler.mark("flip")
+
+        grid.changed = False
+        if dirty_rects:
+            prev_rects = scene.object_rects()
+        profiler.end_frame()
+
+        # QUALITY 
+        # Too slow for FPS: less detail; lots of time to spare: more
+        if governor is not None:
+            level = governor.record((time.perf_counter() - frame_start) * 1000)
+            if level is not None:
+                scene.set_quality(level)
+                grid.changed = True  # Full redraw with the new detail
+                pygame.display.set_caption(f"Dog Park Night Garden ({level.name} quality)")
 
     # CLEANUP 
-    # User quit the loop, shut down pygame properly
+    # User quit the loop, save the frame times (if asked), shut down pygame properly
+    profiler.close()
     pygame.quit()
 
 
@@ -366,10 +543,47 @@ def main(csv_path: str):
 # This special check ensures main() only runs when this file is
 # executed directly (not when imported as a module)
 
+def parse_args(argv=None):
+    """Read the command-line options."""
+    # Usage: python Sanjay_data_art.py my_data.csv [--dirty-rects] [--timing]
+    #        python Sanjay_data_art.py my_data.csv --export frames/ --frames 600
+    parser = argparse.ArgumentParser(description="Dog Park Night Garden")
+    parser.add_argument("csv_path", nargs="?", default="dog_data.csv",
+                        help="dog breed CSV file (default: dog_data.csv)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only redraw the areas that move (for slow hardware)")
+    parser.add_argument("--timing", action="store_true",
+                        help="print cold vs warm (cached) data load times")
+    parser.add_argument("--profile", nargs="?", const="", metavar="OUT",
+                        help="show frame times per phase (F3 toggles) and save every "
+                             "frame's times to OUT (.csv or .json) when the window closes")
+    parser.add_argument("--quality", choices=["auto"] + list(QUALITY_NAMES), default="auto",
+                        help="level of detail; auto lowers it when the frame rate drops "
+                             "below the target (default: auto)")
+
+    # Headless export (no window, see offline_render.py)
+    parser.add_argument("--export", metavar="OUT",
+                        help="render frames without a window: a folder for PNGs, "
+                             "or a file / '-' (stdout) for raw RGB")
+    parser.add_argument("--frames", type=int, default=600,
+                        help="number of frames to export (default: 600)")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="frames per second of the export (default: 60)")
+    parser.add_argument("--format", choices=["png", "rgb"], default="png",
+                        help="export format (default: png)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed for the export (default: 0)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to render the export with (default: 1)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    # Check if user provided CSV filename as command-line argument
-    # Usage: python Sanjay_data_art.py my_data.csv
-    if len(sys.argv) > 1:
-        main(sys.argv[1])  # Use provided filename
+    args = parse_args()
+    if args.export:
+        from offline_render import export
+        export(args.csv_path, args.export, args.frames, fps=args.fps,
+               fmt=args.format, seed=args.seed, workers=args.workers)
     else:
-        main("dog_data.csv")  # Default filename
\ No newline at end of file
+        main(args.csv_path, dirty_rects=args.dirty_rects, timing=args.timing, profile=args.profile,
+             quality=args.quality)
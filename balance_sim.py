@@ -0,0 +1,244 @@
+# balance_sim.py
+# Headless balance testing for Stick Dash and Boulder Runner
+
+"""
+Plays huge numbers of games with no window and reports how long players
+survive and how much they score, for different game settings.
+
+The spawn chances, gaps and speed ramp of both games were tuned by hand.
+This runs the real game logic (runner_core.py) with a scripted or random
+jump policy, spread over a process pool, and prints survival time and
+score percentiles for each configuration side by side.
+
+Every game is seeded from its number, and batches are collected in
+order, so results are the same for any number of worker processes.
+
+Usage:
+    python balance_sim.py --game runner --policy random --games 100000 --workers 8 \\
+        --config BOULDER_CHANCE=40 --config BOULDER_CHANCE=90 BOULDER_GAP=250,350
+    python balance_sim.py --game dash --policy bot --config SPEED_STEP=0.25 --json dash.json
+
+The first row is always the game's own settings; each --config adds a
+row with those UPPERCASE constants (see runner_core.py) overridden.
+"""
+
+import argparse
+import ast
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from runner_core import TICK_RATE, BoulderRunnerSim, StickDashSim, jump_when_close, simulate
+
+
+GAMES = {"dash": StickDashSim, "runner": BoulderRunnerSim}
+
+BATCH_GAMES = 500       # Games per job sent to a worker
+POLICY_SALT = 0x5EED    # Keeps the policy's random numbers apart from the game's
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+# JUMP POLICIES
+# Each one is called every tick with the simulation and its own random
+# generator, and returns True to jump.
+
+def never_jump(sim, rng, jump_chance):
+    return False
+
+
+def random_jumps(sim, rng, jump_chance):
+    return rng.random() < jump_chance
+
+
+def bot_jumps(sim, rng, jump_chance):
+    return jump_when_close(sim)
+
+
+POLICIES = {"never": never_jump, "random": random_jumps, "bot": bot_jumps}
+
+
+def play(game, config, policy, seed, max_ticks, jump_chance=0.05):
+    """
+    Play one game to the end (or max_ticks).
+
+    Returns:
+        (ticks survived, score)
+    """
+    sim = GAMES[game](seed=seed, config=config)
+    rng = random.Random(seed ^ POLICY_SALT)
+    choose = POLICIES[policy]
+    simulate(sim, lambda s: choose(s, rng, jump_chance), max_ticks)
+    return sim.tick, sim.score
+
+
+def _play_batch(job):
+    """Worker process: play `count` games with seeds first_seed, first_seed+1, ..."""
+    game, config, policy, first_seed, count, max_ticks, jump_chance = job
+    ticks = np.empty(count, dtype=np.int64)
+    scores = np.empty(count, dtype=np.int64)
+    for i in range(count):
+        ticks[i], scores[i] = play(game, config, policy, first_seed + i, max_ticks, jump_chance)
+    return ticks, scores
+
+
+# CLASS: BalanceReport
+class BalanceReport:
+    """
+    Results of many games with one configuration.
+
+    Attributes:
+        config (dict): The overridden settings ({} = the game's own)
+        ticks (ndarray): Ticks survived in each game
+        scores (ndarray): Final score of each game
+        max_ticks (int): Length cap of one game
+    """
+
+    def __init__(self, config, ticks, scores, max_ticks):
+        self.config = config
+        self.ticks = ticks
+        self.scores = scores
+        self.max_ticks = max_ticks
+
+    @property
+    def seconds(self):
+        return self.ticks / TICK_RATE
+
+    @property
+    def label(self):
+        if not self.config:
+            return "(default)"
+        return " ".join(f"{k}={v}" for k, v in self.config.items())
+
+    def summary(self):
+        """Statistics and histograms as a plain dict (JSON-friendly)."""
+        seconds = self.seconds
+        counts, edges = np.histogram(seconds, bins=20, range=(0, self.max_ticks / TICK_RATE))
+        return {
+            "config": {k: list(v) if isinstance(v, tuple) else v for k, v in self.config.items()},
+            "games": int(len(self.ticks)),
+            "survived_to_cap": float(np.mean(self.ticks >= self.max_ticks)),
+            "seconds": {
+                "mean": float(seconds.mean()),
+                **{f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(seconds, PERCENTILES))},
+                "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+            },
+            "score": {
+                "mean": float(self.scores.mean()),
+                **{f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(self.scores, PERCENTILES))},
+                "histogram": dict(zip(*(a.tolist() for a in np.unique(self.scores, return_counts=True)))),
+            },
+        }
+
+
+def run_config(game, config, policy, games, max_ticks, jump_chance=0.05, seed=0, pool=None):
+    """
+    Play `games` games with one configuration.
+
+    Args:
+        pool: Optional ProcessPoolExecutor to spread the batches over
+
+    Returns:
+        BalanceReport
+    """
+    jobs = []
+    for first in range(0, games, BATCH_GAMES):
+        count = min(BATCH_GAMES, games - first)
+        jobs.append((game, config, policy, seed + first, count, max_ticks, jump_chance))
+
+    # map() keeps the batches in order, so the result doesn't depend on
+    # how many workers there are
+    results = list(pool.map(_play_batch, jobs) if pool else map(_play_batch, jobs))
+    ticks = np.concatenate([r[0] for r in results])
+    scores = np.concatenate([r[1] for r in results])
+    return BalanceReport(config, ticks, scores, max_ticks)
+
+
+def parse_config(pairs):
+    """Turn ["NAME=value", ...] into a dict ("250,350" becomes a tuple)."""
+    config = {}
+    for pair in pairs:
+        name, _, text = pair.partition("=")
+        try:
+            config[name] = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            raise ValueError(f"bad setting {pair!r}, use NAME=value") from None
+    return config
+
+
+def print_table(reports):
+    """Print one row of survival/score percentiles per configuration."""
+    print(f"{'config':<36} {'games':>8} {'capped':>7} "
+          f"{'sec p10':>8} {'p50':>7} {'p90':>7} {'mean':>7} "
+          f"{'score p10':>10} {'p50':>6} {'p90':>6} {'mean':>7}")
+    for report in reports:
+        s = report.summary()
+        t, sc = s["seconds"], s["score"]
+        print(f"{report.label:<36} {s['games']:>8} {s['survived_to_cap']:>7.1%} "
+              f"{t['p10']:>8.1f} {t['p50']:>7.1f} {t['p90']:>7.1f} {t['mean']:>7.1f} "
+              f"{sc['p10']:>10.0f} {sc['p50']:>6.0f} {sc['p90']:>6.0f} {sc['mean']:>7.2f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless balance testing for the runner games")
+    parser.add_argument("--game", choices=sorted(GAMES), default="runner",
+                        help="dash = Stick Dash, runner = Boulder Runner (default: runner)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random",
+                        help="how the simulated player jumps (default: random)")
+    parser.add_argument("--jump-chance", type=float, default=0.05,
+                        help="chance per tick to jump for the random policy (default: 0.05)")
+    parser.add_argument("--games", type=int, default=10000,
+                        help="games per configuration (default: 10000)")
+    parser.add_argument("--max-seconds", type=float, default=120,
+                        help="stop a game after this much game time (default: 120)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (default: 1)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first game (default: 0)")
+    parser.add_argument("--config", nargs="+", action="append", default=[], metavar="NAME=VALUE",
+                        help="add a configuration with these settings overridden (repeatable)")
+    parser.add_argument("--json", metavar="OUT",
+                        help="also save the full statistics and histograms as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    max_ticks = int(args.max_seconds * TICK_RATE)
+
+    # Catch misspelled settings before starting any workers
+    try:
+        configs = [{}] + [parse_config(pairs) for pairs in args.config]
+        for config in configs:
+            GAMES[args.game](config=config)
+    except ValueError as error:
+        raise SystemExit(f"error: {error}")
+
+    start = time.perf_counter()
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    try:
+        reports = [run_config(args.game, config, args.policy, args.games, max_ticks,
+                              args.jump_chance, args.seed, pool)
+                   for config in configs]
+    finally:
+        if pool:
+            pool.shutdown()
+    elapsed = time.perf_counter() - start
+
+    print_table(reports)
+    total_ticks = sum(int(r.ticks.sum()) for r in reports)
+    print(f"\n{len(configs) * args.games} games, {total_ticks:,} ticks in {elapsed:.1f} s "
+          f"({total_ticks / elapsed:,.0f} ticks/s)", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"game": args.game, "policy": args.policy,
+                       "max_seconds": args.max_seconds,
+                       "results": [r.summary() for r in reports]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
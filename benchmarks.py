@@ -0,0 +1,424 @@
+# benchmarks.py
+# Timing benchmarks for the drawing and game logic hot paths
+
+"""
+Times the code that runs every frame (glow halos, sparks, bone drawing,
+the sky, collisions, whole game frames) and the data loading, with no
+window (SDL dummy driver), and compares the times with a stored baseline
+so performance changes can be measured.
+
+Each benchmark reports microseconds per call: the best of several
+rounds for the small ones, the median frame for the game frames. The
+whole suite runs --repeat times (default 3) and each result keeps its
+best time, so a moment of background load on the machine doesn't count
+as a slowdown.
+
+The machine's speed also drifts as a whole (CPU clocks, other work), so
+every run also times a fixed pure-Python calibration loop. Results are
+compared after dividing out how much slower that loop got since the
+baseline was saved.
+
+Usage:
+    python benchmarks.py                    # Run all, compare with the baseline
+    python benchmarks.py --save-baseline    # Store this machine's times as the baseline
+    python benchmarks.py --only spark collision --threshold 1.5
+
+A benchmark more than --threshold times slower than its baseline
+(default 1.5 = 50% slower) is reported as a regression and the exit
+status is 1. Back-to-back runs of an unchanged tree still differed by
+up to about 1.45x on a busy machine even after that correction, so a
+smaller threshold reports noise. Times depend on the machine, so save a baseline on the
+machine you compare on.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import runpy
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+# No window and no pygame banner (set before pygame is imported)
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+import replay
+import Sanjay_data_art as art
+from dog_data import load_columns
+from offline_render import init_headless
+from runner_core import BodyLane, jump_when_close
+from visual_objects import AuraHalo, BoneCrystal, ParticleSystem, SparkEmitter
+
+
+HERE = Path(__file__).resolve().parent
+BASELINE_PATH = HERE / "benchmarks_baseline.json"
+DEFAULT_THRESHOLD = 1.5     # Slower than baseline x this = regression
+DEFAULT_REPEAT = 3          # Runs of the whole suite (best result counts)
+ROUNDS = 9                  # Timing rounds per benchmark and run (best one counts)
+GAME_FRAMES = 600           # Frames timed in each Boulder Runner state
+
+BENCHMARKS = {}     # name -> function returning {result name: microseconds}
+CALIBRATION = "calibration"     # Result name of the machine speed reference
+
+
+def benchmark(func):
+    """Register a benchmark function (its name without "bench_")."""
+    BENCHMARKS[func.__name__[len("bench_"):]] = func
+    return func
+
+
+def time_call(run):
+    """Microseconds per call of run(), best of ROUNDS rounds of ~0.1 s."""
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    return min(timer.repeat(ROUNDS, number)) / number * 1e6
+
+
+def screen():
+    """The off-screen display surface (pygame is started if needed)."""
+    surface = pygame.display.get_surface()
+    if surface is None:
+        surface = init_headless((art.SCREEN_WIDTH, art.SCREEN_HEIGHT))
+    return surface
+
+
+def write_synthetic_csv(path, rows, seed=0):
+    """A dog breed CSV with random ratings (and a few missing ones)."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("breed,energy_level_value,barking_level_value,"
+                "shedding_level_value,trainability_level_value\n")
+        for i in range(rows):
+            ratings = [str(rng.randint(1, 5)) if rng.random() > 0.05 else "" for _ in range(4)]
+            f.write(f"Breed {i}," + ",".join(ratings) + "\n")
+
+
+def calibration_loop():
+    """Fixed pure-Python work, the yardstick for the machine's current speed."""
+    total = 0
+    for i in range(5000):
+        total += i * i % 7
+    return total
+
+
+# RENDERING
+
+@benchmark
+def bench_aura():
+    """AuraHalo.draw (3 cached glow layers) on the full-size screen."""
+    surface = screen()
+    aura = AuraHalo((300, 300), 70, 0.8, (200, 120, 255), 0.8)
+
+    def run():
+        aura.update(1 / 60)
+        aura.draw(surface)
+    return {"aura_draw": time_call(run)}
+
+
+@benchmark
+def bench_spark():
+    """SparkEmitter.update with a private pool of 50, 500 and 5000 particles."""
+    results = {}
+    for count in (50, 500, 5000):
+        random.seed(0)
+        emitter = SparkEmitter((300, 500), count, count, (255, 200, 100), 60)
+        for _ in range(180):    # Three seconds, so the pool is full
+            emitter.update(1 / 60)
+        results[f"spark_update_{count}"] = time_call(lambda: emitter.update(1 / 60))
+        emitter.release()
+    return results
+
+
+@benchmark
+def bench_bone():
+    """BoneCrystal._draw_bone (the bone drawn with pygame.draw, no sprite cache)."""
+    surface = screen()
+    bone = BoneCrystal((300, 300), 120, 0.6, (200, 120, 255), 0.5, 0.7, 0.5,
+                       rng=random.Random(0))
+
+    def run():
+        bone.angle += 0.01
+        bone._draw_bone(surface)
+    result = time_call(run)
+    bone.sparks.release()
+    return {"bone_draw_bone": result}
+
+
+@benchmark
+def bench_sky():
+    """draw_sky: the full-screen gradient (drawn once per theme in the app)."""
+    surface = screen()
+    return {"draw_sky": time_call(lambda: art.draw_sky(surface))}
+
+
+@benchmark
+def bench_scene():
+    """One update + draw of the whole night garden (300 breeds)."""
+    surface = screen()
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "dogs.csv"
+        write_synthetic_csv(path, 300)
+        random.seed(0)
+        scene = art.NightGarden(load_columns(path), particles=ParticleSystem(), seed=0)
+    for _ in range(120):
+        scene.update(1 / 60)
+
+    def run():
+        scene.update(1 / 60)
+        scene.draw(surface)
+    return {"night_garden_frame": time_call(run)}
+
+
+# DATA LOADING
+
+@benchmark
+def bench_load():
+    """
+    Reading a 10,000-row CSV (as BreedRecords and as NumPy columns), and
+    building bones: create_bones (the fixed 20-breed layout) and one
+    BoneCrystal per breed for all 10,000.
+    """
+    screen()
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "dogs.csv"
+        write_synthetic_csv(path, 10000)
+        results = {"load_dog_data_10k": time_call(lambda: art.load_dog_data(path)),
+                   "load_columns_10k": time_call(lambda: load_columns(path))}
+        records = art.load_dog_data(path)
+
+    def create_20():
+        for bone in art.create_bones(records):
+            bone.sparks.release()    # Don't fill the shared pool's slots
+    results["create_bones_20"] = time_call(create_20)
+
+    def build_10k():
+        rng = random.Random(0)
+        for record in records:
+            bone = BoneCrystal((0, 0), rng=rng, **art.bone_params(record))
+            bone.sparks.release()
+    results["build_bones_10k"] = time_call(build_10k)
+    return results
+
+
+# GAME LOGIC
+
+@benchmark
+def bench_collision():
+    """Boulder Runner's collision test against a dense lane of 400 boulders."""
+    lane = BodyLane()
+    for x in range(0, 800, 2):
+        lane.spawn(x, 270, 40, 40)
+
+    def run():
+        hits = 0
+        for body in lane.near(100, 140):
+            if body.sweeps(100, 240, 250, 40, 60):
+                hits += 1
+        return hits
+    return {"collision_dense": time_call(run)}
+
+
+@benchmark
+def bench_game2():
+    """
+    One frame of Addictive_game_2 in each state (menu, character select,
+    playing, game over).
+
+    The real game script runs with fake input: pygame.event.get() is
+    replaced by a driver that clicks through the screens and jumps with
+    the bot, and times each frame from one event.get() call to the next.
+    The clock doesn't wait, and the run's seed is fixed.
+    """
+    driver = _GameDriver(GAME_FRAMES)
+    real_get, real_pos, real_clock = pygame.event.get, pygame.mouse.get_pos, pygame.time.Clock
+    real_seed, cwd = replay.new_seed, os.getcwd()
+    pygame.event.get = driver.get
+    pygame.mouse.get_pos = lambda: driver.mouse
+    pygame.time.Clock = _NoWaitClock
+    replay.new_seed = lambda: 1
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)    # The game saves its replay here
+            runpy.run_path(str(HERE / "Addictive_game_2.py"))
+    finally:
+        os.chdir(cwd)
+        pygame.event.get, pygame.mouse.get_pos, pygame.time.Clock = real_get, real_pos, real_clock
+        replay.new_seed = real_seed
+    return {f"game2_{state}": statistics.median(times) for state, times in driver.times.items()}
+
+
+class _NoWaitClock:
+    """Stands in for pygame.time.Clock: every frame is exactly 1/60 s."""
+
+    def tick(self, framerate=0):
+        return 1000 / 60
+
+
+class _GameDriver:
+    """Fake input for the game loop, and the frame timer (see bench_game2)."""
+
+    # Where to click on each screen to move on
+    CLICKS = {"menu": (400, 270), "character_select": (130, 240), "game_over": (300, 275)}
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.times = {"menu": [], "character_select": [], "playing": [], "game_over": []}
+        self.mouse = (0, 0)
+        self._last = None
+        self._last_state = None
+        self._clicked = False
+
+    def get(self):
+        now = time.perf_counter()
+        game = sys._getframe(1).f_globals      # The game script's variables
+        state = game["game_state"]
+        # Time the previous frame, unless it was a click that changed screens
+        if self._last is not None and not self._clicked:
+            self.times[self._last_state].append((now - self._last) * 1e6)
+        self._last, self._last_state, self._clicked = now, state, False
+        pygame.event.pump()
+
+        if all(len(t) >= self.frames for t in self.times.values()):
+            return [pygame.event.Event(pygame.QUIT)]
+        if state == "playing":
+            # Jump like the bot until enough frames are timed, then let it crash
+            if len(self.times["playing"]) < self.frames and jump_when_close(game["sim"]):
+                return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+            return []
+        if len(self.times[state]) < self.frames:
+            return []
+        # Hover over the button this frame (the game reads the mouse
+        # before the events), click it on the next
+        target = self.CLICKS[state]
+        if self.mouse != target:
+            self.mouse = target
+            return []
+        self._clicked = True
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=target, button=1)]
+
+
+# RUNNING AND COMPARING
+
+def run_benchmarks(names, repeat=DEFAULT_REPEAT):
+    """
+    Run the named benchmarks (in registration order) `repeat` times.
+
+    The runs take turns instead of repeating one benchmark straight
+    away, so a slow spell on the machine only spoils one run of each.
+
+    Returns:
+        {result name: best microseconds over the runs}
+    """
+    results = {}
+    for run in range(repeat):
+        us = time_call(calibration_loop)
+        results[CALIBRATION] = min(us, results.get(CALIBRATION, us))
+        for name, func in BENCHMARKS.items():
+            if names and not any(n in name for n in names):
+                continue
+            start = time.perf_counter()
+            for result, us in func().items():
+                results[result] = min(us, results.get(result, us))
+            print(f"  {name} (run {run + 1}/{repeat}): done in {time.perf_counter() - start:.1f} s",
+                  file=sys.stderr)
+    return results
+
+
+def load_baseline(path):
+    """Stored results ({} if there is no baseline yet)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, results):
+    """Store results (merged into the existing baseline) with the machine they came from."""
+    merged = dict(load_baseline(path))
+    merged.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "machine": f"{platform.system()} {platform.machine()} {platform.processor()}".strip(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "results": {name: round(us, 3) for name, us in sorted(merged.items())},
+        }, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baseline, threshold):
+    """
+    Print each result next to its baseline, corrected for machine speed.
+
+    The ratio shown is (now / baseline) divided by the same ratio of the
+    calibration loop, so a machine that is 20% slower right now doesn't
+    make everything look 20% slower.
+
+    Returns:
+        Names of the results more than threshold times slower
+    """
+    speed = 1.0
+    if baseline.get(CALIBRATION) and CALIBRATION in results:
+        speed = results[CALIBRATION] / baseline[CALIBRATION]
+    print(f"Machine speed: calibration loop {speed:.2f}x its baseline time (ratios below are divided by this)")
+
+    regressions = []
+    print(f"{'benchmark':<26} {'baseline us':>12} {'now us':>12} {'ratio':>7}")
+    for name, us in results.items():
+        if name == CALIBRATION:
+            continue
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<26} {'-':>12} {us:>12.2f} {'new':>7}")
+            continue
+        ratio = us / base / speed
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"{name:<26} {base:>12.2f} {us:>12.2f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the rendering and game logic hot paths")
+    parser.add_argument("--only", nargs="+", metavar="NAME", default=[],
+                        help=f"only run benchmarks whose name contains one of these ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"slowdown vs baseline that counts as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs of the suite; each result keeps its best (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help="baseline file (default: benchmarks_baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline instead of comparing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.only, max(1, args.repeat))
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Saved {len(results)} results to {args.baseline}")
+        return
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    if regressions:
+        raise SystemExit(f"\n{len(regressions)} regression(s) over {args.threshold}x: "
+                         + ", ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
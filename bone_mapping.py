@@ -0,0 +1,152 @@
+# bone_mapping.py
+# Data → visual mapping for Dog Park Night Garden, done in batches
+
+"""
+Turns breed ratings into bone visuals for every breed at once.
+
+This is the same mapping as bone_params() in Sanjay_data_art.py, but it
+works on whole NumPy columns (see dog_data.load_columns) instead of one
+row at a time. It needs no window, so tests and headless renderers can
+use it directly.
+
+Run this file to compare it with the per-row path:
+    python bone_mapping.py [rows]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+
+DEFAULT_LEVEL = 0.5     # Normalized default (a rating of 3 on the 1-5 scale)
+
+
+class BoneParams:
+    """
+    Visual values for many bones, one NumPy array per value.
+
+    Attributes:
+        length (ndarray): Bone length in pixels (120-200)
+        rotation_speed (ndarray): Spin speed in radians/second (0.3-1.1)
+        color (ndarray): (N, 3) uint8 RGB colors
+        color_packed (ndarray): Colors packed as 0xRRGGBB uint32
+        symmetry (ndarray): Crystal orderliness (0.3-0.9)
+        glow_intensity (ndarray): Halo brightness (0.4-0.9)
+        barking_level (ndarray): Spark amount (0.0-1.0)
+    """
+
+    def __init__(self, length, rotation_speed, color, symmetry, glow_intensity, barking_level):
+        self.length = length
+        self.rotation_speed = rotation_speed
+        self.color = color
+        self.symmetry = symmetry
+        self.glow_intensity = glow_intensity
+        self.barking_level = barking_level
+
+    @property
+    def color_packed(self):
+        c = self.color.astype(np.uint32)
+        return (c[:, 0] << 16) | (c[:, 1] << 8) | c[:, 2]
+
+    def __len__(self):
+        return len(self.length)
+
+    def __getitem__(self, i):
+        """
+        Values for bone i as a dict of plain Python numbers.
+
+        Same keys as bone_params(), so it can be passed straight to
+        BoneCrystal(**params) or used as BoneGrid records.
+        """
+        r, g, b = self.color[i].tolist()
+        return {
+            "length": self.length[i].item(),
+            "rotation_speed": self.rotation_speed[i].item(),
+            "color": (r, g, b),
+            "symmetry": self.symmetry[i].item(),
+            "glow_intensity": self.glow_intensity[i].item(),
+            "barking_level": self.barking_level[i].item(),
+        }
+
+
+def _level(values):
+    """
+    Clean one column of normalized ratings.
+
+    Missing values (NaN) become the default and everything is clamped
+    to 0.0-1.0, all in one pass.
+    """
+    v = np.asarray(values, dtype=np.float64)
+    v = np.where(np.isnan(v), DEFAULT_LEVEL, v)
+    return np.clip(v, 0.0, 1.0)
+
+
+def map_columns(energy, barking, shedding, trainability):
+    """
+    Map normalized (0.0-1.0) rating columns to bone visuals.
+
+    Args:
+        energy, barking, shedding, trainability: Array-likes of equal
+            length; NaN means "missing" and uses the default
+
+    Returns:
+        BoneParams with one entry per breed
+    """
+    energy = _level(energy)
+    barking = _level(barking)
+    shedding = _level(shedding)
+    trainability = _level(trainability)
+
+    # BONE LENGTH: More energy = longer bone (120-200 pixels)
+    length = 120 + energy * 80
+
+    # ROTATION SPEED: Less trainable = faster spin (0.3-1.1 radians/sec)
+    rotation_speed = 0.3 + (1.0 - trainability) * 0.8
+
+    # COLOR: energy -> red, less shedding -> green, quieter -> blue
+    # (truncated to whole numbers like int() does, then clamped)
+    color = np.empty((len(energy), 3), dtype=np.uint8)
+    color[:, 0] = np.clip(140 + np.trunc(80 * energy), 0, 255)
+    color[:, 1] = np.clip(120 + np.trunc(50 * (1.0 - shedding)), 0, 255)
+    color[:, 2] = np.clip(190 + np.trunc(40 * (1.0 - barking)), 0, 255)
+
+    # CRYSTAL SYMMETRY: More trainable = more orderly (0.3-0.9)
+    symmetry = 0.3 + trainability * 0.6
+
+    # GLOW INTENSITY: More shedding = stronger halo (0.4-0.9)
+    glow_intensity = 0.4 + shedding * 0.5
+
+    return BoneParams(length, rotation_speed, color, symmetry, glow_intensity, barking)
+
+
+def map_breeds(columns):
+    """Map a dog_data.BreedColumns object to BoneParams."""
+    return map_columns(columns.energy, columns.barking, columns.shedding, columns.trainability)
+
+
+def _benchmark(rows):
+    """Time the per-row bone_params() path against map_columns()."""
+    from dog_data import BreedRecord
+    from Sanjay_data_art import bone_params
+
+    rng = np.random.default_rng(0)
+    levels = rng.integers(0, 5, size=(4, rows)) / 4.0
+    records = [BreedRecord("", *map(float, col)) for col in levels.T]
+
+    start = time.perf_counter()
+    per_row = [bone_params(r) for r in records]
+    row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = map_columns(*levels)
+    batch_time = time.perf_counter() - start
+
+    same = all(per_row[i] == batched[i] for i in range(0, rows, max(1, rows // 1000)))
+    print(f"{rows} rows: per-row {row_time * 1000:.1f} ms, "
+          f"batched {batch_time * 1000:.1f} ms ({row_time / batch_time:.0f}x), "
+          f"results match: {same}")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
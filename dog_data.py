@@ -0,0 +1,319 @@
+# dog_data.py
+# Loading dog breed data for Dog Park Night Garden
+
+"""
+Streaming CSV loader for the dog breed data.
+
+The column names are looked up once per file (CSV files name them
+differently), then each row becomes a small BreedRecord with the four
+ratings already normalized to 0.0-1.0. Rows are read one at a time, so
+even very large files load in bounded memory.
+
+load_columns_cached() also saves the parsed columns in a binary cache
+next to the CSV, so later launches skip CSV parsing entirely.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+
+# Possible column names for each value, in order of preference
+HEADER_ALIASES = {
+    "name": ["breed", "Breed", "name", "Name", ""],
+    "energy": ["energy_level_value", "Energy Level", "energy_level"],
+    "barking": ["barking_level_value", "Barking Level", "barking_level"],
+    "shedding": ["shedding_level_value", "Shedding Level", "shedding_level"],
+    "trainability": ["trainability_level_value", "Trainability", "trainability_level"],
+}
+
+# The four 1-5 ratings every breed gets
+RATINGS = ("energy", "barking", "shedding", "trainability")
+
+DEFAULT_RATING = 3.0    # Used when a rating is missing or not a number
+CHUNK_ROWS = 65536      # Rows read at a time in columnar mode
+
+# Binary cache files saved next to the CSV (bump the version whenever
+# the parsing or the cache layout changes, to ignore old caches)
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".cache.npy"
+CACHE_META_SUFFIX = ".cache.json"
+
+
+class BreedRecord(NamedTuple):
+    """
+    One dog breed, with every rating normalized to 0.0-1.0.
+
+    A NamedTuple is a plain tuple underneath, so it is much smaller
+    than the dict csv.DictReader makes for each row.
+    """
+    name: str
+    energy: float
+    barking: float
+    shedding: float
+    trainability: float
+
+
+def normalize_1_to_5(value_str, default=DEFAULT_RATING):
+    """
+    Convert a (possibly empty) 1–5 rating into 0–1 normalized float.
+
+    """
+    # Try to convert string to float
+    try:
+        v = float(value_str)
+    except (TypeError, ValueError):
+        # If conversion fails (empty string, None, invalid text)
+        # Use the default value instead
+        v = float(default)
+
+    # Clamp value to valid 1-5 range
+    # (in case CSV has weird values like 0 or 10)
+    if v < 1.0:
+        v = 1.0
+    if v > 5.0:
+        v = 5.0
+
+    # Normalize from [1, 5] range to [0, 1] range
+    # Formula: (value - min) / (max - min)
+    # (v - 1) / (5 - 1) = (v - 1) / 4
+    return (v - 1.0) / 4.0
+
+
+def resolve_columns(header):
+    """
+    Find which column indices hold each value, once per file.
+
+    Returns a dict like {"energy": [3], ...}. A value can have several
+    matching columns (e.g. both "Energy Level" and "energy_level"); the
+    first non-empty one wins on each row, like the old per-row lookup.
+    The name falls back to the first column.
+    """
+    positions = {}
+    for field, aliases in HEADER_ALIASES.items():
+        positions[field] = [header.index(a) for a in aliases if a in header]
+    if not positions["name"] and header:
+        positions["name"] = [0]
+    return positions
+
+
+def _first_non_empty(row, indices):
+    """Value of the first listed column that isn't blank ("" if none)."""
+    for i in indices:
+        if i < len(row):
+            value = row[i]
+            if value.strip() != "":
+                return value
+    return ""
+
+
+def iter_breeds(path: Path):
+    """
+    Read a breed CSV one row at a time, yielding BreedRecords.
+
+    Only one row is in memory at once, so this works for files of any
+    size. A missing or empty file yields nothing.
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+
+    # 'newline=""' handles different line ending styles (Windows vs Mac)
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        cols = resolve_columns(header)
+        name_cols = cols["name"]
+        energy_cols, barking_cols, shedding_cols, train_cols = (cols[f] for f in RATINGS)
+
+        # Local names are faster to look up inside the loop
+        first = _first_non_empty
+        norm = normalize_1_to_5
+
+        for row in reader:
+            if not row:
+                continue  # Skip blank lines
+            yield BreedRecord(
+                first(row, name_cols),
+                norm(first(row, energy_cols)),
+                norm(first(row, barking_cols)),
+                norm(first(row, shedding_cols)),
+                norm(first(row, train_cols)),
+            )
+
+
+def load_breeds(path: Path):
+    """Load every breed in a CSV file into a list of BreedRecords."""
+    return list(iter_breeds(path))
+
+
+class BreedColumns:
+    """
+    Breed data stored column by column in NumPy arrays.
+
+    Handy for mapping every breed to visuals in one batched step.
+    Each rating array is float32 and already normalized to 0.0-1.0.
+
+    Attributes:
+        names (sequence): Breed names
+        energy, barking, shedding, trainability (ndarray): The ratings
+        from_cache (bool): True if loaded from the binary cache
+    """
+
+    def __init__(self, names, energy, barking, shedding, trainability, from_cache=False):
+        self.names = names
+        self.energy = energy
+        self.barking = barking
+        self.shedding = shedding
+        self.trainability = trainability
+        self.from_cache = from_cache
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        """Row i as a BreedRecord (so a BoneGrid can use columns too)."""
+        return BreedRecord(
+            str(self.names[i]),
+            float(self.energy[i]),
+            float(self.barking[i]),
+            float(self.shedding[i]),
+            float(self.trainability[i]),
+        )
+
+
+def load_columns(path: Path, chunk_rows=CHUNK_ROWS):
+    """
+    Load a breed CSV straight into NumPy columns.
+
+    Ratings are collected in compact float arrays (4 bytes each) while
+    streaming, CHUNK_ROWS at a time, and never held as Python objects.
+    """
+    names = []
+    ratings = {field: array("f") for field in RATINGS}
+    chunk = []
+
+    def flush():
+        # Move one chunk of rows into the compact rating arrays
+        for field, values in zip(RATINGS, zip(*chunk)):
+            ratings[field].extend(values)
+        chunk.clear()
+
+    for record in iter_breeds(path):
+        names.append(record.name)
+        chunk.append(record[1:])
+        if len(chunk) >= chunk_rows:
+            flush()
+    if chunk:
+        flush()
+
+    return BreedColumns(
+        names,
+        *(np.frombuffer(ratings[field], dtype=np.float32) for field in RATINGS),
+    )
+
+
+# BINARY CACHE
+
+def cache_paths(path: Path):
+    """The (data, metadata) cache file paths for a CSV file."""
+    path = Path(path)
+    return (path.with_name(path.name + CACHE_SUFFIX),
+            path.with_name(path.name + CACHE_META_SUFFIX))
+
+
+def file_fingerprint(path: Path):
+    """
+    Identify the exact contents of a file.
+
+    Returns a dict with the resolved path, size, modification time and
+    a BLAKE2 hash of the contents. Hashing reads the file once but is
+    far faster than parsing it as CSV.
+    """
+    path = Path(path)
+    stat = path.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {
+        "version": CACHE_VERSION,
+        "path": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": digest.hexdigest(),
+    }
+
+
+def _read_cache(path, fingerprint):
+    """Memory-map the cached columns, or return None if stale/missing."""
+    data_path, meta_path = cache_paths(path)
+    try:
+        with meta_path.open(encoding="utf-8") as f:
+            meta = json.load(f)
+        if {k: meta.get(k) for k in fingerprint} != fingerprint:
+            return None
+        table = np.load(data_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None  # No cache yet, or a broken one - just re-parse
+
+    return BreedColumns(
+        table["name"],
+        *(table[field] for field in RATINGS),
+        from_cache=True,
+    )
+
+
+def _write_cache(path, fingerprint, columns):
+    """Save columns as one structured .npy file plus a JSON fingerprint."""
+    data_path, meta_path = cache_paths(path)
+    longest = max((len(n) for n in columns.names), default=1)
+    dtype = [("name", f"U{max(1, longest)}")] + [(field, "<f4") for field in RATINGS]
+
+    table = np.empty(len(columns), dtype=dtype)
+    table["name"] = columns.names
+    for field in RATINGS:
+        table[field] = getattr(columns, field)
+
+    try:
+        # Write to temporary files first so a crash never leaves a
+        # half-written cache behind, then swap them into place
+        tmp_data = data_path.with_name(data_path.name + ".tmp")
+        with tmp_data.open("wb") as f:
+            np.save(f, table)
+        os.replace(tmp_data, data_path)
+
+        tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+        with tmp_meta.open("w", encoding="utf-8") as f:
+            json.dump(dict(fingerprint, rows=len(columns)), f, indent=2)
+        os.replace(tmp_meta, meta_path)
+    except OSError:
+        pass  # Read-only folder etc. - the cache is only a speed-up
+
+
+def load_columns_cached(path: Path):
+    """
+    Load breed columns, using the binary cache when it is up to date.
+
+    The cache is keyed on the CSV's path, size, modification time and
+    content hash; if any of them changed, the CSV is parsed again and
+    the cache rewritten. A missing CSV gives empty columns.
+    """
+    path = Path(path)
+    if not path.exists():
+        return load_columns(path)
+
+    fingerprint = file_fingerprint(path)
+    columns = _read_cache(path, fingerprint)
+    if columns is None:
+        columns = load_columns(path)
+        _write_cache(path, fingerprint, columns)
+    return columns
@@ -0,0 +1,310 @@
+# frame_profiler.py
+# Per-frame timing of the pygame loops, with an on-screen overlay
+
+"""
+Measures where each frame's time goes, split into named phases (events,
+update, background, entities, HUD, flip, ...).
+
+The loop calls mark(name) at the end of each phase; the time since the
+previous mark (or the start of the frame) is added to that name. This
+needs no extra indentation, so it fits the module-level game loops too:
+
+    profiler = FrameProfiler(enabled=True)
+    while running:
+        clock.tick(60)
+        profiler.begin_frame()
+        ...handle events...
+        profiler.mark("events")
+        ...update...
+        profiler.mark("update")
+        ...
+        profiler.draw_overlay(screen)
+        pygame.display.flip()
+        profiler.mark("flip")
+        profiler.end_frame()
+    profiler.close()        # Saves the samples if an export path was given
+
+F3 (see handle_event) switches profiling and the overlay on and off.
+The overlay shows the p50/p95/p99 frame times and the average time of
+each phase over the last few seconds. Every frame's sample can be saved
+as CSV or JSON. While disabled, each call returns straight away.
+
+The games read the export path from the FRAME_PROFILE environment
+variable (FRAME_PROFILE=dash.csv python ADDICTIVE_GAME_1.py);
+Sanjay_data_art.py has a --profile option.
+
+Run this file to measure the profiler's own overhead, and to check that
+the overlay still draws after pygame has been shut down and started
+again (Sanjay_data_art.main() run twice in one process):
+    python frame_profiler.py
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+from text_cache import TEXT_CACHE
+
+PROFILE_ENV = "FRAME_PROFILE"   # Environment variable with the export path
+TOGGLE_KEY = pygame.K_F3
+PERCENTILES = (50, 95, 99)
+OVERLAY_FONT_SIZE = 18
+OVERLAY_REFRESH = 30        # Frames between overlay updates (it's text, so not every frame)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))
+    return sorted_values[index]
+
+
+# CLASS: FrameProfiler
+class FrameProfiler:
+    """
+    Records how long each named phase of every frame takes.
+
+    Args:
+        enabled: Start recording (and showing the overlay) right away
+        window: Frames the overlay statistics are taken over
+        export_path: Where close() saves the samples (.json = JSON,
+            anything else = CSV; None = don't save)
+
+    Attributes:
+        enabled (bool): True while frames are being recorded
+        show_overlay (bool): True while draw_overlay() draws anything
+        samples (list): One (frame, interval_ms, work_ms, {phase: ms})
+            tuple per recorded frame (only kept with an export_path);
+            interval is the time since the previous frame started, work
+            the time from begin_frame() to end_frame()
+        phases (list): Phase names, in the order first seen
+        overlay_rect: Screen area of the last drawn overlay (or None)
+    """
+
+    def __init__(self, enabled=False, window=300, export_path=None):
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self.export_path = export_path
+        self.samples = []
+        self.phases = []
+        self._recent = deque(maxlen=window)   # The last `window` samples
+        self._frame = 0
+        self._frame_start = None
+        self._last = 0.0
+        self._interval = 0.0
+        self._current = None                # {phase: ms} of the frame being recorded
+        self._overlay = None
+        self._overlay_age = OVERLAY_REFRESH
+        self.overlay_rect = None
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """A profiler that records from the start if FRAME_PROFILE names an export file."""
+        path = os.environ.get(PROFILE_ENV) or None
+        return cls(enabled=path is not None, export_path=path, **kwargs)
+
+    def toggle(self):
+        """Switch recording and the overlay on or off."""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        # Don't count the time spent switched off as one long frame
+        self._frame_start = None
+        self._current = None
+
+    def handle_event(self, event):
+        """Toggle on F3. Returns True if the event was used."""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def begin_frame(self):
+        """Start timing a frame (call after clock.tick, so waiting isn't counted)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._interval = (now - self._frame_start) * 1000
+        self._frame_start = self._last = now
+        self._current = {}
+
+    def mark(self, phase):
+        """Add the time since the previous mark (or begin_frame) to a phase."""
+        current = self._current
+        if current is None or not self.enabled:
+            return
+        now = time.perf_counter()
+        current[phase] = current.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        """Finish the frame and store its sample."""
+        current = self._current
+        if current is None or not self.enabled:
+            return
+        work = (time.perf_counter() - self._frame_start) * 1000
+        for phase in current:
+            if phase not in self.phases:
+                self.phases.append(phase)
+        sample = (self._frame, self._interval, work, current)
+        if self.export_path:
+            self.samples.append(sample)
+        self._recent.append(sample)
+        self._frame += 1
+        self._current = None
+
+    def summary(self):
+        """
+        Statistics of the recent frames as a dict (JSON-friendly).
+
+        frame_ms has the p50/p95/p99 work time per frame, fps comes from
+        the time between frames, and phases has the mean and p95 of each
+        phase (counting frames that skipped it as 0 ms).
+        """
+        recent = list(self._recent)
+        work = sorted(s[2] for s in recent)
+        intervals = [s[1] for s in recent if s[1] > 0]
+        phases = {}
+        for phase in self.phases:
+            times = sorted(s[3].get(phase, 0.0) for s in recent)
+            phases[phase] = {"mean": sum(times) / len(times) if times else 0.0,
+                             "p95": percentile(times, 95)}
+        return {
+            "frames": len(recent),
+            "fps": 1000 * len(intervals) / sum(intervals) if intervals else 0.0,
+            "frame_ms": {f"p{p}": percentile(work, p) for p in PERCENTILES},
+            "phases": phases,
+        }
+
+    def draw_overlay(self, surface, position=(8, 8)):
+        """
+        Draw the statistics panel (if shown).
+
+        The panel is rebuilt every OVERLAY_REFRESH frames; in between the
+        same surface is blitted again.
+
+        Returns:
+            The Rect that was drawn, or None
+        """
+        if not self.show_overlay:
+            self.overlay_rect = None
+            return None
+        self._overlay_age += 1
+        if self._overlay is None or self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay = self._render_overlay()
+            self._overlay_age = 0
+        self.overlay_rect = surface.blit(self._overlay, position)
+        return self.overlay_rect
+
+    def _render_overlay(self):
+        stats = self.summary()
+        frame = stats["frame_ms"]
+        # One row per line: (left column, right column)
+        rows = [("frame", f"p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  "
+                          f"p99 {frame['p99']:.2f} ms  {stats['fps']:.1f} fps")]
+        for phase, times in stats["phases"].items():
+            rows.append((phase, f"{times['mean']:.2f} ms  (p95 {times['p95']:.2f})"))
+
+        # TEXT_CACHE drops its fonts at pygame.quit(), so this is always
+        # a Font of the current pygame session
+        font = TEXT_CACHE.font(OVERLAY_FONT_SIZE)
+        white = (255, 255, 255)
+        rendered = [(font.render(name, True, white), font.render(value, True, white))
+                    for name, value in rows]
+        column = max(name.get_width() for name, _ in rendered) + 12
+        line_height = font.get_linesize()
+        width = column + max(value.get_width() for _, value in rendered) + 6
+        panel = pygame.Surface((width, line_height * len(rows) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, (name, value) in enumerate(rendered):
+            y = 5 + i * line_height
+            panel.blit(name, (6, y))
+            panel.blit(value, (column, y))
+        if pygame.display.get_surface() is not None:
+            panel = panel.convert_alpha()
+        return panel
+
+    def save(self, path):
+        """Save every recorded frame (.json = JSON with a summary, otherwise CSV)."""
+        if str(path).lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "phases": self.phases,
+                    "summary": self.summary(),
+                    "frames": [{"frame": frame, "interval_ms": interval, "work_ms": work,
+                                "phases": phases}
+                               for frame, interval, work, phases in self.samples],
+                }, f, indent=1)
+            return
+
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "interval_ms", "work_ms"] + self.phases)
+            for frame, interval, work, phases in self.samples:
+                writer.writerow([frame, f"{interval:.4f}", f"{work:.4f}"]
+                                + [f"{phases.get(p, 0.0):.4f}" for p in self.phases])
+
+    def close(self):
+        """Save the samples to export_path (if set and anything was recorded)."""
+        if self.export_path and self.samples:
+            self.save(self.export_path)
+
+
+def _overhead(frames=200000, phases=("events", "update", "background", "entities", "HUD", "flip")):
+    """Time the profiler calls of one frame, disabled and enabled."""
+    for enabled in (False, True):
+        profiler = FrameProfiler(enabled=enabled)
+        start = time.perf_counter()
+        for _ in range(frames):
+            profiler.begin_frame()
+            for phase in phases:
+                profiler.mark(phase)
+            profiler.end_frame()
+        elapsed = time.perf_counter() - start
+        print(f"{'enabled' if enabled else 'disabled':>8}: {elapsed / frames * 1e6:.2f} us per frame "
+              f"({len(phases)} phases, {elapsed / frames / (1 / 60):.4%} of a 60 FPS frame)")
+
+
+def _check_restart(frames=30):
+    """
+    Run the night garden twice in one process with the overlay on (no
+    window), so the second run draws text after a pygame.quit().
+    """
+    import tempfile
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import Sanjay_data_art as art
+
+    real_get = pygame.event.get
+    count = [0]
+
+    def get():
+        # Quit each run after a few frames (the last one still draws)
+        count[0] += 1
+        if count[0] % frames == 0:
+            return [pygame.event.Event(pygame.QUIT)]
+        return real_get()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "dogs.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("breed,energy_level_value,barking_level_value,"
+                    "shedding_level_value,trainability_level_value\n")
+            for i in range(25):
+                f.write(f"Breed {i},{i % 5 + 1},{i % 4 + 1},{i % 3 + 1},{i % 2 + 1}\n")
+        pygame.event.get = get
+        try:
+            for dirty_rects in (False, True):
+                art.main(path, dirty_rects=dirty_rects, profile="")
+        finally:
+            pygame.event.get = real_get
+    print(f"night garden ran twice in one process with the overlay ({count[0]} frames)")
+
+
+if __name__ == "__main__":
+    _overhead()
+    _check_restart()
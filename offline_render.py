@@ -0,0 +1,288 @@
+# offline_render.py
+# Headless frame export for Dog Park Night Garden
+
+"""
+Renders the night garden without a window, as fast as the CPU allows.
+
+SDL's "dummy" video driver gives pygame an off-screen display, so this
+works on servers with no screen. The scene is stepped with a fixed dt
+(1 / fps) instead of the wall clock, so the same seed always gives the
+same frames, and frames are written either as a numbered PNG sequence
+or as raw RGB bytes (e.g. piped into ffmpeg).
+
+Long exports can be split across processes (workers > 1). Each worker
+builds the scene from the same seed, fast-forwards the simulation to the
+start of its chunk without drawing, and renders only its own frames, so
+the output is byte-identical whatever the number of workers.
+
+Usage (through the main program):
+    python Sanjay_data_art.py dog_data.csv --export frames/ --frames 600
+    python Sanjay_data_art.py dog_data.csv --export - --format rgb --frames 600 \\
+        | ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 60 -i - loop.mp4
+    python Sanjay_data_art.py dog_data.csv --export frames/ --frames 36000 --workers 8
+"""
+
+import multiprocessing
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Keep pygame's welcome message off stdout (raw frames may go there)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+
+def encode_png(rgb, width, height, level=1):
+    """
+    Encode raw 24-bit RGB bytes as a PNG file (returns the bytes).
+
+    pygame.image.save uses slow, strong compression; a low zlib level
+    is several times faster and zlib lets other threads run meanwhile.
+    """
+    rows = np.frombuffer(rgb, dtype=np.uint8).reshape(height, width * 3)
+    scanlines = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    scanlines[:, 1:] = rows     # Each row starts with filter type 0 (none)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(scanlines.tobytes(), level))
+            + chunk(b"IEND", b""))
+
+
+# CLASS: PngSequenceWriter
+class PngSequenceWriter:
+    """
+    Saves each frame as frame_000000.png, frame_000001.png, ... in a folder.
+
+    Frames are compressed on background threads while the next frame
+    renders; at most `max_pending` frames wait in memory at once.
+    """
+
+    def __init__(self, folder, threads=4, max_pending=16):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+        self._pending = deque()
+
+    def write(self, index, surface):
+        width, height = surface.get_size()
+        rgb = pygame.image.tobytes(surface, "RGB")   # Copy: surface is reused
+        path = self.folder / f"frame_{index:06d}.png"
+        self._pending.append(self._pool.submit(self._save, path, rgb, width, height))
+        while len(self._pending) > self.max_pending:
+            self._pending.popleft().result()         # Also re-raises errors
+
+    @staticmethod
+    def _save(path, rgb, width, height):
+        path.write_bytes(encode_png(rgb, width, height))
+
+    def close(self):
+        while self._pending:
+            self._pending.popleft().result()
+        self._pool.shutdown()
+
+
+# CLASS: RawRGBWriter
+class RawRGBWriter:
+    """
+    Writes frames back to back as raw 24-bit RGB bytes.
+
+    Each frame is exactly width * height * 3 bytes with no header,
+    which is what `ffmpeg -f rawvideo -pix_fmt rgb24` expects.
+    """
+
+    def __init__(self, target):
+        # "-" means standard output (for piping into another program)
+        if str(target) == "-":
+            self.stream = sys.stdout.buffer
+            self._owned = False
+        else:
+            self.stream = open(target, "wb")
+            self._owned = True
+
+    def write(self, index, surface):
+        self.stream.write(pygame.image.tobytes(surface, "RGB"))
+
+    def close(self):
+        self.stream.flush()
+        if self._owned:
+            self.stream.close()
+
+
+def open_writer(out, fmt):
+    """Create the frame writer for an output path and format ("png" or "rgb")."""
+    if fmt == "png":
+        return PngSequenceWriter(out)
+    if fmt == "rgb":
+        return RawRGBWriter(out)
+    raise ValueError(f"unknown frame format: {fmt!r} (use 'png' or 'rgb')")
+
+
+def init_headless(size):
+    """
+    Start pygame with the SDL dummy video driver.
+
+    Returns an off-screen display surface of the given size; nothing is
+    shown, but convert()/convert_alpha() work like with a real window.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    return pygame.display.set_mode(size)
+
+
+def render_frames(scene, surface, first, count, fps):
+    """
+    Step the scene with a fixed dt and draw each frame.
+
+    Yields (frame_index, surface) for frames first .. first+count-1.
+    The surface is reused, so write it out before asking for the next.
+    """
+    dt = 1.0 / fps
+    for i in range(first, first + count):
+        scene.update(dt)
+        scene.draw(surface)
+        yield i, surface
+
+
+def build_scene(columns, seed):
+    """
+    Build a fresh night garden scene for a given seed.
+
+    Everything random comes from the `random` module (the sparks' NumPy
+    generators are seeded from it too), so seeding it first makes the
+    whole simulation repeatable.
+    """
+    from Sanjay_data_art import NightGarden
+    from visual_objects import ParticleSystem
+
+    random.seed(seed)
+    return NightGarden(columns, particles=ParticleSystem(), seed=seed)
+
+
+def split_frames(frames, chunks):
+    """Split frames 0..frames-1 into `chunks` contiguous (first, count) ranges."""
+    chunks = max(1, min(chunks, frames))
+    base, extra = divmod(frames, chunks)
+    ranges = []
+    first = 0
+    for c in range(chunks):
+        count = base + (1 if c < extra else 0)
+        ranges.append((first, count))
+        first += count
+    return ranges
+
+
+def _render_chunk(job):
+    """
+    Worker process: render frames first .. first+count-1.
+
+    The simulation is stepped (without drawing) from frame 0 to `first`
+    so this chunk starts from exactly the state a single process would
+    have reached. PNGs go straight into the output folder; raw RGB goes
+    to a part file that the parent joins in order.
+    """
+    from Sanjay_data_art import SCREEN_HEIGHT, SCREEN_WIDTH
+    from dog_data import load_columns_cached
+
+    csv_path, out, fmt, fps, seed, first, count = job
+    surface = init_headless((SCREEN_WIDTH, SCREEN_HEIGHT))
+    scene = build_scene(load_columns_cached(csv_path), seed)
+
+    # Fast-forward: update only, drawing doesn't change the simulation
+    dt = 1.0 / fps
+    for _ in range(first):
+        scene.update(dt)
+
+    writer = open_writer(out, fmt)
+    for i, frame in render_frames(scene, surface, first, count, fps):
+        writer.write(i, frame)
+    writer.close()
+    pygame.quit()
+    return count
+
+
+def _export_parallel(csv_path, out, frames, fps, fmt, seed, workers):
+    """Render chunks of the timeline in a process pool and merge them in order."""
+    ranges = split_frames(frames, workers)
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = []
+        for c, (first, count) in enumerate(ranges):
+            target = out if fmt == "png" else os.path.join(tmp, f"part_{c:04d}.rgb")
+            jobs.append((str(csv_path), target, fmt, fps, seed, first, count))
+
+        # "spawn" gives every worker a clean pygame (no forked SDL state)
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(len(jobs)) as pool:
+            if fmt == "png":
+                for _ in pool.imap(_render_chunk, jobs):
+                    pass
+                return
+
+            # imap returns chunks in timeline order, so each part can be
+            # appended to the output as soon as it (and all before it) are done
+            writer = RawRGBWriter(out)
+            for job, _ in zip(jobs, pool.imap(_render_chunk, jobs)):
+                with open(job[1], "rb") as part:
+                    shutil.copyfileobj(part, writer.stream)
+                os.remove(job[1])
+            writer.close()
+
+
+def export(csv_path, out, frames, fps=60, fmt="png", seed=0, workers=1):
+    """
+    Render `frames` frames of the night garden without a window.
+
+    Args:
+        csv_path: Dog breed CSV file
+        out: Folder for PNGs, or a file / "-" (stdout) for raw RGB
+        frames: Number of frames to render
+        fps: Frames per second of the output (sets the fixed dt)
+        fmt: "png" or "rgb"
+        seed: Random seed, the same seed gives the same frames
+        workers: Number of processes to split the timeline over
+    """
+    # Imported here so importing this module doesn't pull in the scene
+    from Sanjay_data_art import SCREEN_HEIGHT, SCREEN_WIDTH, load_dog_columns
+
+    # Loading once here also makes sure the binary cache exists before
+    # any worker starts, so workers never parse the CSV themselves
+    columns = load_dog_columns(Path(csv_path))
+    if len(columns) == 0:
+        print("CSV is empty or missing", file=sys.stderr)
+        return
+
+    start = time.perf_counter()
+    if workers > 1:
+        _export_parallel(csv_path, out, frames, fps, fmt, seed, workers)
+    else:
+        surface = init_headless((SCREEN_WIDTH, SCREEN_HEIGHT))
+        scene = build_scene(columns, seed)
+        writer = open_writer(out, fmt)
+        for i, frame in render_frames(scene, surface, 0, frames, fps):
+            writer.write(i, frame)
+        writer.close()
+        pygame.quit()
+    elapsed = time.perf_counter() - start
+
+    # Report on stderr so raw frames on stdout stay clean
+    video_seconds = frames / fps
+    print(f"Rendered {frames} frames ({video_seconds:.1f} s of video) in {elapsed:.1f} s "
+          f"with {max(1, workers)} process(es) "
+          f"({video_seconds / max(elapsed, 1e-9):.1f}x real time)", file=sys.stderr)
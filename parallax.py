@@ -0,0 +1,120 @@
+# parallax.py
+# Scrolling background layers drawn from pre-rendered tiles
+
+"""
+A parallax background: a few layers (sky, stars, hills, grass) that each
+scroll at their own fraction of the game speed, so far-away things move
+slowly and the ground moves with the boulders.
+
+Every layer is painted once into a surface that tiles horizontally (its
+right edge joins up with its left edge). Drawing a layer is then at most
+two blits: the tile, and the start of the next copy where the first one
+runs out.
+
+    background = ParallaxBackground([
+        ParallaxLayer((800, 400), paint_sky, factor=0),
+        ParallaxLayer((810, 105), paint_grass, factor=1, y=295, transparent=True),
+    ])
+    background.scroll(sim.obstacle_speed)   # once per tick
+    background.draw(screen, alpha)           # once per frame
+
+Like runner_core.Body, the background remembers where it was on the
+last tick and draws part of the way to where it is now, so the ground
+lines up with the interpolated boulders.
+"""
+
+import pygame
+
+from runner_core import lerp
+
+
+KEY_COLOR = (255, 0, 255)   # See-through color of transparent layers
+
+
+# CLASS: ParallaxLayer
+class ParallaxLayer:
+    """
+    One horizontally tiling background layer.
+
+    Args:
+        size: (width, height) of the tile; the width must be at least
+            the screen width so two copies always cover it
+        painter: Function painter(surface) that draws the tile
+        factor: How fast the layer scrolls compared to the game
+            (0 = fixed, 1 = moves with the boulders)
+        y: Screen height of the tile's top edge
+        transparent: True if the painter leaves parts see-through
+            (they start out KEY_COLOR)
+
+    Attributes:
+        surface: The painted tile (None until built)
+    """
+
+    def __init__(self, size, painter, factor, y=0, transparent=False):
+        self.size = size
+        self.painter = painter
+        self.factor = factor
+        self.y = y
+        self.transparent = transparent
+        self.surface = None
+
+    def build(self):
+        """Paint the tile (needs a display, to convert it)."""
+        surface = pygame.Surface(self.size)
+        if self.transparent:
+            surface.fill(KEY_COLOR)
+        self.painter(surface)
+        surface = surface.convert()
+        if self.transparent:
+            surface.set_colorkey(KEY_COLOR, pygame.RLEACCEL)
+        self.surface = surface
+
+    def draw(self, target, distance):
+        """Draw the layer after the game has scrolled `distance` pixels."""
+        if self.surface is None:
+            self.build()
+        width = self.size[0]
+        x = -(int(distance * self.factor) % width)
+        target.blit(self.surface, (x, self.y))
+        if x + width < target.get_width():
+            target.blit(self.surface, (x + width, self.y))
+
+
+# CLASS: ParallaxBackground
+class ParallaxBackground:
+    """
+    Layers drawn back to front, all scrolled together.
+
+    Args:
+        layers: ParallaxLayers, farthest first
+
+    Attributes:
+        distance (float): Pixels scrolled so far (after the last tick)
+        prev_distance (float): Pixels scrolled before the last tick
+    """
+
+    def __init__(self, layers):
+        self.layers = layers
+        self.distance = 0.0
+        self.prev_distance = 0.0
+
+    def build(self):
+        """Paint every layer now instead of on the first draw."""
+        for layer in self.layers:
+            layer.build()
+
+    def scroll(self, dx):
+        """Move everything on by one tick of dx pixels."""
+        self.prev_distance = self.distance
+        self.distance += dx
+
+    def reset(self):
+        """Back to the start, for a new run."""
+        self.distance = 0.0
+        self.prev_distance = 0.0
+
+    def draw(self, target, alpha=1.0):
+        """Draw every layer, alpha of the way through the last tick."""
+        distance = lerp(self.prev_distance, self.distance, alpha)
+        for layer in self.layers:
+            layer.draw(target, distance)
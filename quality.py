@@ -0,0 +1,174 @@
+# quality.py
+# Adaptive level of detail for the night garden
+
+"""
+Keeps the night garden at its target frame rate on slow machines by
+drawing less detail when frames take too long, and more again when
+there is time to spare.
+
+A QualityLevel says how much each bone draws: glow layers, how many
+sparks it may have, how many crystal groups, and how finely the glow
+sizes are rounded (a bigger GlowCache.radius_step means fewer different
+glow sprites to render and keep).
+
+The QualityGovernor is told how long each frame's work took (not
+counting the wait in clock.tick). Every `window` frames it looks at the
+90th percentile:
+    - over `slow` of the frame budget -> one level down, straight away
+    - under `fast` of the budget for `patience` windows in a row -> one up
+
+The gap between `fast` and `slow` is the hysteresis: a level that only
+just fits is kept, instead of flipping up and down every second. If a
+step up is followed at once by a step down, the governor waits twice as
+long before trying that again.
+
+    governor = QualityGovernor(target_fps=60)
+    level = governor.record(work_ms)    # once per frame
+    if level is not None:
+        scene.set_quality(level)
+
+Run this file to watch the governor react to made-up frame times:
+    python quality.py
+"""
+
+import random
+from typing import NamedTuple
+
+
+class QualityLevel(NamedTuple):
+    """
+    How much detail every bone draws.
+
+    aura_layers: Circles in each glow halo (AuraHalo.layers)
+    particle_scale: Fraction of each bone's spark limit that is used
+    shard_groups: Crystal groups drawn on each bone (out of 5)
+    glow_step: Glow radius rounding in pixels (GlowCache.radius_step)
+    """
+    name: str
+    aura_layers: int
+    particle_scale: float
+    shard_groups: int
+    glow_step: int
+
+
+# Lowest detail first; "high" is how the garden always looked
+QUALITY_LEVELS = (
+    QualityLevel("low", aura_layers=1, particle_scale=0.25, shard_groups=2, glow_step=8),
+    QualityLevel("medium", aura_layers=2, particle_scale=0.5, shard_groups=3, glow_step=5),
+    QualityLevel("high", aura_layers=3, particle_scale=1.0, shard_groups=5, glow_step=3),
+)
+QUALITY_NAMES = {level.name: level for level in QUALITY_LEVELS}
+
+MAX_PATIENCE = 32   # Most windows the governor waits before trying a step up
+
+
+def p90(values):
+    """90th percentile (nearest rank) of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+
+
+# CLASS: QualityGovernor
+class QualityGovernor:
+    """
+    Steps the quality level up and down to hold a target frame rate.
+
+    Args:
+        levels: QualityLevels, lowest detail first
+        target_fps: Frame rate to hold
+        window: Frames looked at before each decision
+        slow: Step down when the p90 frame takes more than this
+            fraction of the budget (1000 / target_fps ms)
+        fast: Step up when it takes less than this fraction...
+        patience: ...for this many windows in a row
+        level: Index of the starting level (None = the highest)
+
+    Attributes:
+        index (int): Index of the current level in levels
+        level (QualityLevel): The current level
+        budget_ms (float): Time one frame may take
+        changes (int): How many times the level has changed
+    """
+
+    def __init__(self, levels=QUALITY_LEVELS, target_fps=60, window=60, slow=0.85, fast=0.5,
+                 patience=3, level=None):
+        self.levels = levels
+        self.budget_ms = 1000 / target_fps
+        self.window = window
+        self.slow = slow
+        self.fast = fast
+        self.patience = patience
+        self.index = len(levels) - 1 if level is None else level
+        self.changes = 0
+        self._times = []
+        self._fast_windows = 0      # Windows in a row with time to spare
+        self._just_raised = False   # True for the first window after a step up
+        self._settling = True       # Skip the first window (caches are still filling)
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def record(self, work_ms):
+        """
+        Add one frame's work time (in ms).
+
+        Returns:
+            The new QualityLevel if it changed, otherwise None
+        """
+        times = self._times
+        times.append(work_ms)
+        if len(times) < self.window:
+            return None
+        slowest = p90(times)
+        times.clear()
+        if self._settling:
+            # A new level renders new glow sprites and bone sprites for
+            # a while, so its first window says little about its speed
+            self._settling = False
+            return None
+
+        if slowest > self.budget_ms * self.slow and self.index > 0:
+            if self._just_raised:
+                # That level was too much last time as well: wait longer
+                self.patience = min(MAX_PATIENCE, self.patience * 2)
+            return self._change(-1)
+        self._just_raised = False
+
+        if slowest < self.budget_ms * self.fast and self.index < len(self.levels) - 1:
+            self._fast_windows += 1
+            if self._fast_windows >= self.patience:
+                return self._change(+1)
+        else:
+            self._fast_windows = 0
+        return None
+
+    def _change(self, step):
+        self.index += step
+        self.changes += 1
+        self._fast_windows = 0
+        self._just_raised = step > 0
+        self._settling = True
+        return self.level
+
+
+def _simulate(seconds=60, fps=60):
+    """
+    Feed the governor made-up frame times from a machine that is only
+    just too slow for "medium", and print every change of level.
+    """
+    rng = random.Random(1)
+    governor = QualityGovernor(target_fps=fps)
+    cost = {"low": 6.0, "medium": 13.0, "high": 19.0}   # ms of work per frame
+    frames = {level.name: 0 for level in QUALITY_LEVELS}
+    for frame in range(seconds * fps):
+        frames[governor.level.name] += 1
+        work = cost[governor.level.name] * rng.uniform(0.9, 1.15)
+        level = governor.record(work)
+        if level is not None:
+            print(f"{frame / fps:6.1f} s: -> {level.name}")
+    print(f"{governor.changes} changes; frames per level: {frames}; patience now {governor.patience}")
+
+
+if __name__ == "__main__":
+    _simulate()
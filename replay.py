@@ -0,0 +1,310 @@
+# replay.py
+# Compact replays of Stick Dash and Boulder Runner runs
+
+"""
+Records a run as its random seed plus the ticks where a jump happened,
+and checks a replay by playing it again with no window.
+
+A run only depends on its seed and its jumps (see runner_core.py), so
+that is all a replay stores. Only jumps that took effect are recorded
+(pressing space in the air does nothing), and each one is stored as the
+number of ticks since the previous jump, as a variable-length integer:
+a jump every half second or more is one byte. A minute of play is a
+28 byte header plus around 100 bytes, far under 1 KB.
+
+File layout (little-endian):
+    magic "BRRP", format version (u8), game (u8), rules version (u16),
+    seed (u64), ticks (u32), score (u32), jump count (u32),
+    jump deltas (LEB128 varints), CRC-32 of everything before it (u32)
+
+    recorder = ReplayRecorder("runner", new_seed())
+    recorder.step(jump)         # instead of sim.step(jump)
+    save_run(recorder)          # at game over: replays/runner_<date>_<score>.brr
+
+    python replay.py verify run.brr [more.brr ...]
+    python replay.py info run.brr
+    python replay.py demo           # record a bot run, check it, time it
+"""
+
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+
+from runner_core import RULES_VERSION, TICK_RATE, BoulderRunnerSim, StickDashSim, jump_when_close
+
+
+MAGIC = b"BRRP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBHQIII")
+CRC = struct.Struct("<I")
+REPLAY_FOLDER = "replays"   # Where the games save finished runs
+
+GAMES = {"dash": StickDashSim, "runner": BoulderRunnerSim}
+GAME_IDS = {"dash": 1, "runner": 2}
+GAME_NAMES = {number: name for name, number in GAME_IDS.items()}
+
+
+class ReplayError(ValueError):
+    """A replay file that is damaged or from another version of the games."""
+
+
+def new_seed():
+    """A random seed for a new run (recorded, so the run can be replayed)."""
+    return random.getrandbits(64)
+
+
+def encode_varint(value, out):
+    """Append value as a LEB128 varint (7 bits per byte, low bits first)."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    """
+    Read a LEB128 varint.
+
+    Returns:
+        (value, position after it)
+    """
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("replay ends in the middle of a number")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+# CLASS: Replay
+class Replay:
+    """
+    Everything needed to play a run again.
+
+    Attributes:
+        game (str): "dash" or "runner"
+        seed (int): Seed of the run's random numbers
+        jumps (list): Tick numbers (1 = first tick) where a jump took effect
+        ticks (int): How many ticks the run lasted
+        score (int): Final score claimed for the run
+        rules_version (int): runner_core.RULES_VERSION when it was recorded
+    """
+
+    def __init__(self, game, seed, jumps, ticks, score, rules_version=RULES_VERSION):
+        if game not in GAME_IDS:
+            raise ReplayError(f"unknown game {game!r}")
+        self.game = game
+        self.seed = seed
+        self.jumps = jumps
+        self.ticks = ticks
+        self.score = score
+        self.rules_version = rules_version
+
+    @property
+    def seconds(self):
+        return self.ticks / TICK_RATE
+
+    def to_bytes(self):
+        data = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, GAME_IDS[self.game],
+                                     self.rules_version, self.seed, self.ticks,
+                                     self.score, len(self.jumps)))
+        previous = 0
+        for tick in self.jumps:
+            encode_varint(tick - previous, data)
+            previous = tick
+        data += CRC.pack(zlib.crc32(data))
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size + CRC.size or data[:4] != MAGIC:
+            raise ReplayError("not a replay file")
+        (crc,) = CRC.unpack_from(data, len(data) - CRC.size)
+        if zlib.crc32(data[:-CRC.size]) != crc:
+            raise ReplayError("replay is damaged (checksum mismatch)")
+
+        _, version, game_id, rules, seed, ticks, score, count = HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ReplayError(f"unsupported replay format {version}")
+        if game_id not in GAME_NAMES:
+            raise ReplayError(f"unknown game number {game_id}")
+
+        jumps = []
+        pos = HEADER.size
+        tick = 0
+        body = data[:-CRC.size]
+        for _ in range(count):
+            delta, pos = decode_varint(body, pos)
+            tick += delta
+            jumps.append(tick)
+        if pos != len(body):
+            raise ReplayError("unexpected data after the jumps")
+        return cls(GAME_NAMES[game_id], seed, jumps, ticks, score, rules)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+# CLASS: ReplayRecorder
+class ReplayRecorder:
+    """
+    Runs a new game and remembers the jumps that took effect.
+
+    Args:
+        game: "dash" or "runner"
+        seed: Seed for the run (see new_seed())
+
+    Attributes:
+        sim: The simulation being played (read it to draw)
+    """
+
+    def __init__(self, game, seed):
+        self.game = game
+        self.seed = seed
+        self.sim = GAMES[game](seed=seed)
+        self.jumps = []
+
+    def step(self, jump=False):
+        """Advance the game one tick, like sim.step(jump)."""
+        sim = self.sim
+        if jump and sim.can_jump:
+            self.jumps.append(sim.tick + 1)
+        sim.step(jump)
+
+    def finish(self):
+        """The Replay of the run so far (normally called at game over)."""
+        return Replay(self.game, self.seed, list(self.jumps), self.sim.tick, self.sim.score)
+
+
+def save_run(recorder, folder=REPLAY_FOLDER):
+    """
+    Save a finished run into the replay folder.
+
+    Returns:
+        The path of the new replay file
+    """
+    replay = recorder.finish()
+    os.makedirs(folder, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(folder, f"{replay.game}_{stamp}_{replay.score}.brr")
+    replay.save(path)
+    return path
+
+
+def replay_sim(replay):
+    """
+    Play a replay again from its seed and jumps.
+
+    Returns:
+        The simulation after replay.ticks ticks (or where it ended)
+    """
+    sim = GAMES[replay.game](seed=replay.seed)
+    step = sim.step
+    previous = 0
+    for tick in replay.jumps:
+        # No input between jumps, then one jump tick
+        for _ in range(tick - previous - 1):
+            step(False)
+        step(True)
+        previous = tick
+        if sim.game_over:
+            break
+    while sim.tick < replay.ticks and not sim.game_over:
+        step(False)
+    return sim
+
+
+def verify(replay):
+    """
+    Check that a replay really gives the score it claims.
+
+    Returns:
+        (ok, reason): ok is True if replaying it ends at the same tick
+        with the same score; reason says what didn't match
+    """
+    if replay.rules_version != RULES_VERSION:
+        return False, f"recorded with rules version {replay.rules_version}, these are {RULES_VERSION}"
+    previous = 0
+    for tick in replay.jumps:
+        if tick <= previous:
+            return False, "jump ticks are not increasing"
+        previous = tick
+    if previous > replay.ticks:
+        return False, "jump after the end of the run"
+
+    sim = replay_sim(replay)
+    if sim.tick != replay.ticks:
+        return False, f"run ends at tick {sim.tick}, replay says {replay.ticks}"
+    if sim.score != replay.score:
+        return False, f"replayed score is {sim.score}, replay says {replay.score}"
+    return True, "ok"
+
+
+def _demo(seconds=600):
+    """Record a bot run, save and reload it, and time the verifier."""
+    for game in GAMES:
+        recorder = ReplayRecorder(game, new_seed())
+        while recorder.sim.tick < seconds * TICK_RATE and not recorder.sim.game_over:
+            recorder.step(jump_when_close(recorder.sim))
+        replay = Replay.from_bytes(recorder.finish().to_bytes())
+
+        start = time.perf_counter()
+        ok, reason = verify(replay)
+        elapsed = time.perf_counter() - start
+
+        minutes = replay.seconds / 60
+        size = len(replay.to_bytes())
+        print(f"{game}: {replay.seconds:.0f} s, score {replay.score}, {len(replay.jumps)} jumps, "
+              f"{size} bytes ({size / max(minutes, 1 / 60):.0f} bytes/min), "
+              f"verified {reason} at {replay.ticks / elapsed:,.0f} ticks/s")
+
+        cheat = Replay(game, replay.seed, replay.jumps, replay.ticks, replay.score + 1)
+        print(f"  same replay claiming one more point: {verify(cheat)[1]}")
+
+
+def main(argv):
+    if not argv or argv[0] not in ("verify", "info", "demo"):
+        raise SystemExit("usage: python replay.py verify|info FILE... | demo")
+    if argv[0] == "demo":
+        _demo()
+        return
+
+    failed = False
+    for path in argv[1:]:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ReplayError) as error:
+            print(f"{path}: error: {error}")
+            failed = True
+            continue
+
+        if argv[0] == "info":
+            print(f"{path}: {replay.game}, seed {replay.seed}, score {replay.score}, "
+                  f"{replay.seconds:.1f} s, {len(replay.jumps)} jumps, rules v{replay.rules_version}")
+            continue
+
+        start = time.perf_counter()
+        ok, reason = verify(replay)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {'OK' if ok else 'FAIL'} ({reason}) - {replay.game} score {replay.score}, "
+              f"{replay.seconds:.1f} s, replayed at {replay.ticks / max(elapsed, 1e-9):,.0f} ticks/s")
+        failed = failed or not ok
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,608 @@
+# runner_core.py
+# Fixed-timestep game logic for the two Boulder Runner games
+
+"""
+The game rules of Stick Dash (ADDICTIVE_GAME_1.py) and Boulder Runner
+(Addictive_game_2.py), with no pygame and no drawing.
+
+Both games used to move everything once per drawn frame, so a slow frame
+slowed the whole game down. Now the logic always advances in fixed ticks
+of 1/60 second:
+
+    timestep = FixedTimestep()
+    while running:
+        for _ in range(timestep.advance(clock.tick(60) / 1000)):
+            sim.step(jump)
+        draw(sim, timestep.alpha)   # alpha: how far we are into the next tick
+
+A slow frame just runs two ticks; a fast one may run none and draws the
+objects part of the way between their last two positions instead.
+
+The UPPERCASE class constants of each simulation are its tuning (speeds,
+spawn chances, gaps); any of them can be overridden for one run with
+config={"NAME": value}, which is how balance_sim.py compares settings.
+
+Each simulation has its own random.Random, so the same seed and the same
+jumps always give exactly the same run. Without a window the logic runs
+thousands of times faster than real time (for bots and balance testing):
+    python runner_core.py [ticks]
+
+Boulder Runner's steady play makes no new bodies and keeps no new memory
+(spare bodies are reused); this is checked with tracemalloc, and the
+check fails (exit status 1) if that stops being true:
+    python runner_core.py check [ticks]
+"""
+
+import random
+import sys
+import time
+from collections import deque
+
+
+TICK_RATE = 60          # Game logic ticks per second (the old frame rate)
+MAX_FRAME = 0.25        # Longest frame we catch up on (after that, slow down)
+RULES_VERSION = 1       # Bump whenever a rule or constant changes (old replays stop matching)
+
+
+def lerp(a, b, alpha):
+    """Blend from a to b (alpha 0.0 = a, 1.0 = b)."""
+    return a + (b - a) * alpha
+
+
+# CLASS: FixedTimestep
+class FixedTimestep:
+    """
+    Turns real frame times into a whole number of fixed ticks.
+
+    Leftover time is kept in an accumulator for the next frame, and
+    alpha tells the drawing code how far it is into the next tick.
+
+    Attributes:
+        dt (float): Length of one tick in seconds
+        accumulator (float): Real time not yet simulated
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, max_frame=MAX_FRAME):
+        self.dt = 1.0 / tick_rate
+        self.max_frame = max_frame
+        self.accumulator = 0.0
+
+    def advance(self, frame_seconds):
+        """
+        Add one frame's worth of real time.
+
+        Returns how many ticks to run now. Very long frames (dragging
+        the window, breakpoints...) are capped at max_frame so the game
+        doesn't try to run hundreds of ticks at once.
+        """
+        self.accumulator += min(frame_seconds, self.max_frame)
+        steps = 0
+        while self.accumulator >= self.dt:
+            self.accumulator -= self.dt
+            steps += 1
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a tick since the last one (0.0-1.0), for drawing."""
+        return self.accumulator / self.dt
+
+
+# CLASS: Body
+class Body:
+    """
+    A moving rectangle, like a boulder or a coin.
+
+    __slots__ gives each body a fixed set of fields instead of a dict,
+    so bodies are small and cheap to create (and BodyLane reuses them).
+
+    Attributes:
+        x, y (float): Top-left corner
+        width, height (int): Size in pixels
+        prev_x (float): x at the previous tick (for smooth drawing)
+    """
+
+    __slots__ = ("x", "y", "width", "height", "prev_x")
+
+    def __init__(self, x, y, width, height):
+        self.reset(x, y, width, height)
+
+    def reset(self, x, y, width, height):
+        """Place the body again (used when it is recycled)."""
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.prev_x = x
+
+    @property
+    def radius(self):
+        """Radius of a round obstacle of this size."""
+        return self.width // 2
+
+    def x_at(self, alpha):
+        """Drawing x between the last two ticks."""
+        return lerp(self.prev_x, self.x, alpha)
+
+    def overlaps(self, x, y, width, height):
+        """Check if this body overlaps another rectangle."""
+        return (x < self.x + self.width and x + width > self.x and
+                y < self.y + self.height and y + height > self.y)
+
+    def sweeps(self, x, prev_y, y, width, height):
+        """
+        Check if this body touched a rectangle at any time during the tick.
+
+        The body moved from prev_x to x and the rectangle from prev_y to
+        y (both in straight lines), so a fast body can't jump past a thin
+        one between two ticks. If they overlap at the end of the tick
+        this is always True, like overlaps().
+        """
+        # Work in the rectangle's frame: where is the body relative to it
+        # at the start (t = 0) and end (t = 1) of the tick?
+        t_x = _slab(self.prev_x - x, self.x - x, -self.width, width)
+        if t_x is None:
+            return False
+        t_y = _slab(self.y - prev_y, self.y - y, -self.height, height)
+        if t_y is None:
+            return False
+        return max(t_x[0], t_y[0]) < min(t_x[1], t_y[1])
+
+
+def _slab(start, end, low, high):
+    """
+    Times t in 0..1 when start + (end - start) * t is strictly between
+    low and high, as a (first, last) pair, or None if never.
+    """
+    move = end - start
+    if move == 0:
+        return (0.0, 1.0) if low < start < high else None
+    t0 = (low - start) / move
+    t1 = (high - start) / move
+    if t0 > t1:
+        t0, t1 = t1, t0
+    return max(t0, 0.0), min(t1, 1.0)
+
+
+# CLASS: BodyLane
+class BodyLane:
+    """
+    Bodies that all scroll left at the same speed, sorted by x.
+
+    New bodies always appear at the right edge, so appending keeps the
+    deque sorted; bodies leave from the left with O(1) pops, and
+    collision checks only look at the few bodies around the player
+    instead of every body on screen.
+
+    Bodies that leave are kept on a free list and reused by spawn(), so
+    once the game has warmed up no new bodies are created at all.
+
+    Args:
+        spare: Bodies to create up front (about the most ever on screen)
+
+    Attributes:
+        bodies (deque): Bodies on screen, left to right
+        free (list): Spare Body objects waiting to be reused
+    """
+
+    def __init__(self, spare=0):
+        self.bodies = deque()
+        self.free = [Body(0, 0, 0, 0) for _ in range(spare)]
+        self._near = []     # Reused result list for near()
+
+    def __len__(self):
+        return len(self.bodies)
+
+    def __iter__(self):
+        return iter(self.bodies)
+
+    def __getitem__(self, i):
+        return self.bodies[i]
+
+    def spawn(self, x, y, width, height):
+        """
+        Add a body at the right (it must not be left of the last one).
+
+        Reuses a spare body when there is one. Returns the body.
+        """
+        if self.free:
+            body = self.free.pop()
+            body.reset(x, y, width, height)
+        else:
+            body = Body(x, y, width, height)
+        self.bodies.append(body)
+        return body
+
+    def scroll(self, dx):
+        """Move every body dx pixels to the left."""
+        for body in self.bodies:
+            body.prev_x = body.x
+            body.x -= dx
+
+    def cull(self):
+        """Drop bodies that have left the screen on the left."""
+        bodies = self.bodies
+        while bodies and bodies[0].x < -bodies[0].width:
+            self.free.append(bodies.popleft())
+
+    def near(self, left, right):
+        """
+        Bodies whose path this tick crosses the x-span left..right.
+
+        Returns a list (so the caller can remove bodies while using it).
+        The same list is reused on every call, so use it before the next.
+        """
+        found = self._near
+        found.clear()
+        for body in self.bodies:
+            if body.x >= right:
+                break       # Sorted: everything after is further right
+            if body.prev_x + body.width > left:
+                found.append(body)
+        return found
+
+    def remove(self, body):
+        """Take out one body (e.g. a collected coin, near the left end)."""
+        self.bodies.remove(body)
+        self.free.append(body)
+
+    def clear(self):
+        """Remove every body (they all go to the free list)."""
+        self.free.extend(self.bodies)
+        self.bodies.clear()
+
+
+def apply_config(sim, config):
+    """Override a simulation's tuning constants for this one instance."""
+    for name, value in (config or {}).items():
+        if not name.isupper() or not hasattr(type(sim), name):
+            raise ValueError(f"{type(sim).__name__} has no setting {name!r}")
+        setattr(sim, name, value)
+
+
+# CLASS: StickDashSim
+class StickDashSim:
+    """
+    Game logic of Stick Dash (ADDICTIVE_GAME_1.py).
+
+    Three boulders roll in forever; every boulder that leaves the screen
+    comes back with a new size and gives a point, and the speed goes up
+    by 0.5 every 5 points.
+
+    Args:
+        seed: Seed for this run's random numbers (None = random)
+        config: Optional dict overriding the UPPERCASE tuning constants
+
+    Attributes:
+        player_y, velocity_y (float): Player height and vertical speed
+        obstacles (list): The three boulder Bodies
+        score (int): Boulders passed
+        obstacle_speed (float): Current boulder speed (pixels per tick)
+        tick (int): Ticks simulated so far
+        game_over (bool): True once the player hit a boulder
+    """
+
+    WIDTH = 800
+    HEIGHT = 600
+    PLAYER_X = 100
+    PLAYER_WIDTH = 50
+    PLAYER_HEIGHT = 50
+    GROUND_LEVEL = HEIGHT - PLAYER_HEIGHT - 50
+    GRAVITY = 0.8
+    JUMP_STRENGTH = -15
+    BASE_SPEED = 6
+    SPEED_STEP = 0.5        # Speed added ...
+    POINTS_PER_STEP = 5     # ... every this many points
+    RESPAWN_GAP = (200, 500)    # Extra distance off screen when a boulder comes back
+    SIZES = (45, 50, 60)
+
+    def __init__(self, seed=None, config=None):
+        apply_config(self, config)
+        self.rng = random.Random(seed)
+        self.player_y = 450
+        self.prev_y = self.player_y
+        self.velocity_y = 0
+        self.obstacle_speed = self.BASE_SPEED
+        self.obstacles = [
+            Body(800, self.GROUND_LEVEL, 50, 50),
+            Body(1100, self.GROUND_LEVEL, 60, 60),
+            Body(1450, self.GROUND_LEVEL, 45, 45),
+        ]
+        self.score = 0
+        self.tick = 0
+        self.game_over = False
+
+    @property
+    def on_ground(self):
+        return self.player_y >= self.GROUND_LEVEL
+
+    @property
+    def can_jump(self):
+        """True if a jump on the next tick would take effect."""
+        return self.on_ground and not self.game_over
+
+    @property
+    def seconds(self):
+        """Whole seconds survived (game time, not wall-clock time)."""
+        return self.tick // TICK_RATE
+
+    def player_y_at(self, alpha):
+        """Drawing height of the player between the last two ticks."""
+        return lerp(self.prev_y, self.player_y, alpha)
+
+    def step(self, jump=False):
+        """
+        Advance the game by one tick.
+
+        Args:
+            jump: True if the jump key was pressed since the last tick
+                (ignored while in the air)
+        """
+        if self.game_over:
+            return
+        self.tick += 1
+        self.prev_y = self.player_y
+
+        if jump and self.on_ground:
+            self.velocity_y = self.JUMP_STRENGTH
+
+        # Gravity, then move, then land
+        self.velocity_y += self.GRAVITY
+        self.player_y += self.velocity_y
+        if self.player_y >= self.GROUND_LEVEL:
+            self.player_y = self.GROUND_LEVEL
+            self.velocity_y = 0
+
+        # Speed up by SPEED_STEP every POINTS_PER_STEP points (0.5 every 5)
+        self.obstacle_speed = (self.BASE_SPEED
+                               + (self.score // self.POINTS_PER_STEP) * self.SPEED_STEP)
+
+        for obstacle in self.obstacles:
+            obstacle.prev_x = obstacle.x
+            obstacle.x -= self.obstacle_speed
+
+            # Off the left side: come back on the right with a new size
+            if obstacle.x < -obstacle.width:
+                obstacle.x = self.WIDTH + self.rng.randint(*self.RESPAWN_GAP)
+                obstacle.prev_x = obstacle.x    # Don't slide across the screen
+                size = self.rng.choice(self.SIZES)
+                obstacle.width = size
+                obstacle.height = size
+                self.score += 1
+
+            if obstacle.overlaps(self.PLAYER_X, self.player_y,
+                                 self.PLAYER_WIDTH, self.PLAYER_HEIGHT):
+                self.game_over = True
+
+
+# CLASS: BoulderRunnerSim
+class BoulderRunnerSim:
+    """
+    Game logic of the "playing" state of Boulder Runner (Addictive_game_2.py).
+
+    Boulders spawn at random (but never too close together) and end the
+    run when touched; coins float at jump height and each one is a point.
+
+    Args:
+        seed: Seed for this run's random numbers (None = random)
+        config: Optional dict overriding the UPPERCASE tuning constants
+
+    Attributes:
+        player_y, velocity_y (float): Player height and vertical speed
+        is_jumping (bool): True while in the air after a jump
+        obstacles, coins (BodyLane): Boulder and coin Bodies on screen
+        score (int): Coins collected
+        obstacle_speed (float): Scroll speed (pixels per tick)
+        tick (int): Ticks simulated so far
+        game_over (bool): True once the player hit a boulder
+    """
+
+    WIDTH = 800
+    PLAYER_X = 100
+    PLAYER_WIDTH = 40
+    PLAYER_HEIGHT = 60
+    GROUND_LEVEL = 250
+    GRAVITY = 1
+    JUMP_STRENGTH = -20
+    OBSTACLE_SPEED = 5
+    BOULDER_Y = 270
+    BOULDER_SIZE = 40
+    BOULDER_CHANCE = 60     # 1 in 60 chance per tick ...
+    BOULDER_GAP = (300, 400)    # ... once the last boulder is this far away
+    COIN_CHANCE = 100       # 1 in 100 chance per tick
+    COIN_SIZE = 30
+    COIN_HEIGHTS = (150, 165, 180, 195)   # Within reach of a jump
+
+    def __init__(self, seed=None, config=None):
+        apply_config(self, config)
+        self.rng = random.Random(seed)
+        self.player_y = self.GROUND_LEVEL
+        self.prev_y = self.player_y
+        self.velocity_y = 0
+        self.is_jumping = False
+        self.obstacles = BodyLane(spare=8)
+        self.coins = BodyLane(spare=16)
+        self.score = 0
+        self.obstacle_speed = self.OBSTACLE_SPEED
+        self.tick = 0
+        self.game_over = False
+
+    @property
+    def can_jump(self):
+        """True if a jump on the next tick would take effect."""
+        return not self.is_jumping and not self.game_over
+
+    def player_y_at(self, alpha):
+        """Drawing height of the player between the last two ticks."""
+        return lerp(self.prev_y, self.player_y, alpha)
+
+    def step(self, jump=False):
+        """
+        Advance the game by one tick.
+
+        Args:
+            jump: True if the jump key was pressed since the last tick
+                (ignored while in the air)
+        """
+        if self.game_over:
+            return
+        self.tick += 1
+        self.prev_y = self.player_y
+
+        if jump and not self.is_jumping:
+            self.is_jumping = True
+            self.velocity_y = self.JUMP_STRENGTH
+
+        # Apply gravity while in the air
+        if self.is_jumping or self.player_y < self.GROUND_LEVEL:
+            self.velocity_y += self.GRAVITY
+            self.player_y += self.velocity_y
+            if self.player_y >= self.GROUND_LEVEL:
+                self.player_y = self.GROUND_LEVEL
+                self.is_jumping = False
+                self.velocity_y = 0
+
+        rng = self.rng
+
+        # Spawn boulders, only once the last one is 300-400 pixels away
+        if not self.obstacles or self.obstacles[-1].x < self.WIDTH - rng.randint(*self.BOULDER_GAP):
+            if rng.randint(1, self.BOULDER_CHANCE) == 1:
+                self.obstacles.spawn(self.WIDTH, self.BOULDER_Y,
+                                     self.BOULDER_SIZE, self.BOULDER_SIZE)
+
+        # Spawn coins at jump arc heights
+        if rng.randint(1, self.COIN_CHANCE) == 1:
+            self.coins.spawn(self.WIDTH, rng.choice(self.COIN_HEIGHTS),
+                             self.COIN_SIZE, self.COIN_SIZE)
+
+        self.obstacles.scroll(self.obstacle_speed)
+        self.coins.scroll(self.obstacle_speed)
+
+        # Only bodies passing the player's column can touch the player;
+        # the swept test also sees hits that happen between two ticks
+        x = self.PLAYER_X
+        width = self.PLAYER_WIDTH
+        height = self.PLAYER_HEIGHT
+        for obstacle in self.obstacles.near(x, x + width):
+            if obstacle.sweeps(x, self.prev_y, self.player_y, width, height):
+                self.game_over = True
+        for coin in self.coins.near(x, x + width):
+            if coin.sweeps(x, self.prev_y, self.player_y, width, height):
+                self.coins.remove(coin)
+                self.score += 1
+
+        self.obstacles.cull()
+        self.coins.cull()
+
+
+def simulate(sim, policy, max_ticks):
+    """
+    Run a simulation with no window until game over or max_ticks.
+
+    Args:
+        sim: A StickDashSim or BoulderRunnerSim
+        policy: Function sim -> bool, True to jump this tick
+
+    Returns:
+        Number of ticks simulated
+    """
+    start = sim.tick
+    while not sim.game_over and sim.tick - start < max_ticks:
+        sim.step(policy(sim))
+    return sim.tick - start
+
+
+def jump_when_close(sim, distance=60):
+    """Simple bot: jump when a boulder is about to reach the player."""
+    for obstacle in sim.obstacles:
+        gap = obstacle.x - (sim.PLAYER_X + sim.PLAYER_WIDTH)
+        if 0 <= gap < distance:
+            return True
+    return False
+
+
+# Limits for _check_allocations (steady play, after a warm-up)
+# (what stays in use is the bodies' current float positions and the
+# lanes' deque blocks, so it depends on how many bodies are on screen,
+# not on how long the game runs)
+ALLOC_KEPT_LIMIT = 4096     # Bytes allocated by this file still in use at the end
+ALLOC_TICK_LIMIT = 2048     # Bytes allocated at once during any single tick
+
+
+def _check_allocations(ticks):
+    """
+    Check that steady play doesn't allocate.
+
+    After a warm-up, every Body created is counted and tracemalloc
+    measures how much memory allocated by this file is still in use
+    after `ticks` more ticks, and the most allocated at once during any
+    single tick (short-lived numbers and iterators that Python itself
+    creates, but no bodies).
+
+    Raises:
+        SystemExit: If a body was created or a limit was passed
+    """
+    import tracemalloc
+
+    sim = BoulderRunnerSim(seed=3)
+    simulate(sim, jump_when_close, 3000)
+
+    created = 0
+    real_init = Body.__init__
+
+    def counting_init(body, *args):
+        nonlocal created
+        created += 1
+        real_init(body, *args)
+
+    Body.__init__ = counting_init
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        worst_tick = 0
+        for _ in range(ticks):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            sim.step(jump_when_close(sim))
+            worst_tick = max(worst_tick, tracemalloc.get_traced_memory()[1] - current)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        Body.__init__ = real_init
+
+    kept = sum(stat.size_diff for stat in after.compare_to(before, "filename")
+               if stat.traceback[0].filename == __file__)
+    print(f"Steady state over {ticks} ticks: {created} new bodies, {kept} bytes kept "
+          f"(limit {ALLOC_KEPT_LIMIT}), at most {worst_tick} bytes allocated in one tick "
+          f"(limit {ALLOC_TICK_LIMIT})")
+
+    problems = []
+    if created:
+        problems.append(f"{created} bodies were created instead of reused")
+    if kept > ALLOC_KEPT_LIMIT:
+        problems.append(f"{kept} bytes kept, over {ALLOC_KEPT_LIMIT}")
+    if worst_tick > ALLOC_TICK_LIMIT:
+        problems.append(f"{worst_tick} bytes allocated in one tick, over {ALLOC_TICK_LIMIT}")
+    if problems:
+        raise SystemExit("Allocation check failed: " + "; ".join(problems))
+
+
+def _benchmark(ticks):
+    """Time headless ticks for both games."""
+    for sim_class in (StickDashSim, BoulderRunnerSim):
+        total = 0
+        runs = 0
+        start = time.perf_counter()
+        while total < ticks:
+            total += simulate(sim_class(seed=runs), jump_when_close, ticks - total)
+            runs += 1
+        elapsed = time.perf_counter() - start
+        print(f"{sim_class.__name__}: {total} ticks in {elapsed:.2f} s "
+              f"({total / elapsed:,.0f} ticks/s, {runs} runs)")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["check"]:
+        _check_allocations(int(sys.argv[2]) if len(sys.argv) > 2 else 20000)
+    else:
+        _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
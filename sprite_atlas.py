@@ -0,0 +1,141 @@
+# sprite_atlas.py
+# Pre-rendered pixel-art sprites packed into one surface
+
+"""
+A sprite atlas: every pose and animation frame is drawn once into one
+big surface, and drawing a sprite is then a single blit of its area.
+
+Sprites are registered with a "painter" (a function that draws the
+sprite with pygame.draw calls at 1x); nothing is drawn until the atlas
+is first used, after the display exists, so the atlas can be converted
+to the display's pixel format.
+
+    ATLAS = SpriteAtlas()
+    ATLAS.add(("coin", 0), (30, 30), lambda s: draw_coin_frame(s, 0, 0, 0))
+    ATLAS.blit(screen, ("coin", 0), (x, y))
+    ATLAS.scaled(2).blit(screen, ("coin", 0), (x, y))   # Twice as big
+
+Scaled copies use nearest-neighbour scaling, so pixel art stays sharp.
+"""
+
+import pygame
+
+
+KEY_COLOR = (255, 0, 255)   # Transparent color (no sprite uses pure magenta)
+ATLAS_WIDTH = 1024          # Sprites are packed in rows up to this width
+PADDING = 1                 # Gap between sprites so they never bleed
+
+
+# CLASS: SpriteAtlas
+class SpriteAtlas:
+    """
+    Many small sprites packed into one color-keyed surface.
+
+    Args:
+        scale: Whole-number scale factor for every sprite
+
+    Attributes:
+        surface: The packed sprites (None until built)
+        rects (dict): Area of each sprite in the surface, by name
+    """
+
+    def __init__(self, scale=1):
+        self.scale = scale
+        self.surface = None
+        self.rects = {}
+        self._painters = {}     # name -> (size at 1x, painter)
+        self._scaled = {}       # Scale -> scaled copy of this atlas
+        self._source = None     # The atlas a scaled copy is made from
+
+    def add(self, name, size, painter):
+        """
+        Register a sprite.
+
+        Args:
+            name: Any hashable key, e.g. ("pig", "run", 2)
+            size: (width, height) of the sprite at 1x
+            painter: Function painter(surface) that draws the sprite with
+                its top-left corner at (0, 0)
+        """
+        self._painters[name] = (size, painter)
+        self.surface = None     # Rebuild on next use
+        self._scaled.clear()
+
+    def __contains__(self, name):
+        return name in self._painters
+
+    def build(self):
+        """Draw every registered sprite into the atlas (needs a display)."""
+        if self._source is not None:
+            self._build_scaled()
+            return
+
+        # Shelf packing: left to right, starting a new row when full
+        places = {}
+        x = y = row_height = 0
+        for name, ((w, h), _) in self._painters.items():
+            if x + w > ATLAS_WIDTH and x > 0:
+                x = 0
+                y += row_height + PADDING
+                row_height = 0
+            places[name] = pygame.Rect(x, y, w, h)
+            x += w + PADDING
+            row_height = max(row_height, h)
+
+        sheet = pygame.Surface((ATLAS_WIDTH, max(1, y + row_height)))
+        sheet.fill(KEY_COLOR)
+        for name, rect in places.items():
+            # Each painter draws on a subsurface, so it can use (0, 0)
+            # as its corner and can't draw over its neighbours
+            self._painters[name][1](sheet.subsurface(rect))
+
+        if self.scale != 1:
+            sheet = pygame.transform.scale_by(sheet, self.scale)
+            places = {name: pygame.Rect(r.x * self.scale, r.y * self.scale,
+                                        r.w * self.scale, r.h * self.scale)
+                      for name, r in places.items()}
+        self._finish(sheet, places)
+
+    def _build_scaled(self):
+        """Build a scaled copy from the 1x atlas instead of repainting."""
+        source = self._source
+        if source.surface is None:
+            source.build()
+        factor = self.scale // source.scale
+        sheet = pygame.transform.scale_by(source.surface, factor)
+        places = {name: pygame.Rect(r.x * factor, r.y * factor, r.w * factor, r.h * factor)
+                  for name, r in source.rects.items()}
+        self._finish(sheet, places)
+
+    def _finish(self, sheet, places):
+        # Convert to the display format with a run-length encoded color
+        # key: the fastest way to blit sprites with see-through pixels
+        sheet = sheet.convert()
+        sheet.set_colorkey(KEY_COLOR, pygame.RLEACCEL)
+        self.surface = sheet
+        self.rects = places
+
+    def scaled(self, factor):
+        """The same sprites at a whole-number scale factor (built once)."""
+        # Every copy is made from (and remembered by) the original atlas
+        root = self._source or self
+        scale = self.scale * factor
+        if scale == root.scale:
+            return root
+        if scale not in root._scaled:
+            atlas = SpriteAtlas(scale)
+            atlas._painters = root._painters
+            atlas._source = root
+            root._scaled[scale] = atlas
+        return root._scaled[scale]
+
+    def size(self, name):
+        """(width, height) of a sprite at this atlas's scale."""
+        (w, h), _ = self._painters[name]
+        return w * self.scale, h * self.scale
+
+    def blit(self, target, name, position):
+        """Draw one sprite with its top-left corner at position."""
+        if self.surface is None:
+            self.build()
+        return target.blit(self.surface, position, self.rects[name])
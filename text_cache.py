@@ -0,0 +1,184 @@
+# text_cache.py
+# Cached text rendering for the Boulder Runner games
+
+"""
+Rendering text with font.render() is one of the slowest things a pygame
+game does every frame, and most HUD and menu text never changes.
+
+TextCache keeps each rendered string (keyed by font, size, text, color
+and antialiasing) and reuses it; the least recently used ones are
+dropped when the cache is full. Fonts are created once per size too.
+
+Counters (score, speed, timer) change all the time, so they get a fast
+path: the label and every digit are rendered once, and a new value is
+put together from the cached digit glyphs instead of calling
+font.render() again.
+
+Fonts and converted surfaces belong to one pygame session: they must
+not be used after pygame.quit() (an old Font crashes the interpreter).
+The cache empties itself when pygame (or its font module) is shut
+down, so a new pygame.init() starts from scratch.
+
+    TEXT_CACHE.draw(screen, "SPACEBAR: Jump", (10, 10), 24, WHITE)
+    TEXT_CACHE.draw_counter(screen, "Score: ", score, (780, 15), 32, WHITE, anchor="topright")
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+GLYPHS = "0123456789.-"     # Characters the counter fast path draws one by one
+
+
+# CLASS: TextCache
+class TextCache:
+    """
+    LRU cache of rendered text surfaces.
+
+    Attributes:
+        max_items (int): How many rendered strings to keep
+        hits (int): Lookups that found a ready surface
+        misses (int): Lookups that had to call font.render()
+    """
+
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._fonts = {}                # (name, size) -> Font
+        self._surfaces = OrderedDict()  # key -> Surface, oldest first
+        self._session = False           # True once reset() is hooked to pygame.quit()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def font(self, size, name=None):
+        """The Font for a size (name None = pygame's default font), made once."""
+        self._check_session()
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self._fonts[key] = font
+        return font
+
+    def render(self, text, size, color, antialias=True, name=None):
+        """
+        Rendered text, like font.render(text, antialias, color).
+
+        The returned surface is shared, so don't draw on it.
+        """
+        self._check_session()
+        key = (name, size, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)     # Mark as recently used
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, name).render(text, antialias, color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()   # Faster to blit
+        self._surfaces[key] = surface
+
+        # Evict the least recently used text if we are over budget
+        while len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def draw(self, target, text, position, size, color, antialias=True, name=None, anchor="topleft"):
+        """
+        Draw text with one corner (or its center) at position.
+
+        Args:
+            anchor: Which point of the text goes at position, any
+                pygame.Rect position name ("topleft", "center", "topright", ...)
+
+        Returns:
+            The Rect that was drawn
+        """
+        surface = self.render(text, size, color, antialias, name)
+        rect = surface.get_rect(**{anchor: position})
+        target.blit(surface, rect)
+        return rect
+
+    def counter(self, label, value, size, color, suffix="", antialias=True, name=None):
+        """
+        Rendered label + value + suffix, e.g. "Score: " 12 or "Time: " 5 "s".
+
+        The label, suffix and each digit are rendered once and cached;
+        the counter is assembled from those pieces only when its value
+        changes, and then cached like any other text.
+        """
+        self._check_session()
+        number = str(value)
+        key = ("counter", name, size, label, number, suffix, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        pieces = []
+        if label:
+            pieces.append(self.render(label, size, color, antialias, name))
+        if all(ch in GLYPHS for ch in number):
+            pieces.extend(self.render(ch, size, color, antialias, name) for ch in number)
+        else:
+            pieces.append(self.render(number, size, color, antialias, name))
+        if suffix:
+            pieces.append(self.render(suffix, size, color, antialias, name))
+
+        width = sum(piece.get_width() for piece in pieces)
+        height = max(piece.get_height() for piece in pieces)
+        surface = pygame.Surface((width, height), pygame.SRCALPHA, pieces[0])
+        x = 0
+        for piece in pieces:
+            # BLEND_RGBA_MAX onto the empty surface copies the pixels
+            # (alpha included) instead of blending them
+            surface.blit(piece, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += piece.get_width()
+
+        self._surfaces[key] = surface
+        while len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def draw_counter(self, target, label, value, position, size, color,
+                     suffix="", antialias=True, name=None, anchor="topleft"):
+        """
+        Draw a counter (see counter()) with its anchor point at position.
+
+        Returns:
+            The Rect that was drawn
+        """
+        surface = self.counter(label, value, size, color, suffix, antialias, name)
+        rect = surface.get_rect(**{anchor: position})
+        target.blit(surface, rect)
+        return rect
+
+    def clear(self):
+        """Forget every rendered string (fonts are kept)."""
+        self._surfaces.clear()
+
+    def reset(self):
+        """Forget the fonts too (they die with the pygame session)."""
+        self._fonts.clear()
+        self._surfaces.clear()
+        self._session = False
+
+    def _check_session(self):
+        """Make sure reset() runs when this pygame session ends."""
+        if not pygame.font.get_init():
+            # pygame.font.quit() on its own (pygame.quit() already reset us)
+            self.reset()
+        elif not self._session:
+            # Quit functions run once, so hook up again for every session
+            pygame.register_quit(self.reset)
+            self._session = True
+
+
+# Shared by everything that draws text
+TEXT_CACHE = TextCache()
@@ -0,0 +1,236 @@
+# vector_env.py
+# Thousands of Stick Dash games stepped together with NumPy
+
+"""
+A batched version of runner_core.StickDashSim for training bots.
+
+N games are stored as NumPy arrays (one row per game) instead of N
+objects, so gravity, boulder motion, respawning and collisions for every
+game happen in a handful of array operations per tick. The rules and
+constants are exactly StickDashSim's; only the random numbers come from
+one NumPy generator instead of one random.Random per game.
+
+The API follows the "gym" style used by most bot-training code:
+
+    env = StickDashVecEnv(4096, seed=0)
+    obs = env.reset()
+    while training:
+        obs, reward, done, info = env.step(actions)   # actions: N bools (jump)
+
+Games that end are restarted automatically; their final score and
+length are reported in info for that step.
+
+Run this file to check it against StickDashSim and time it:
+    python vector_env.py [num_envs] [ticks]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from runner_core import StickDashSim, apply_config
+
+
+# CLASS: StickDashVecEnv
+class StickDashVecEnv:
+    """
+    Many Stick Dash games in lockstep.
+
+    Args:
+        num_envs: Number of games
+        seed: Seed for the shared random generator
+        max_ticks: End (and restart) a game after this many ticks
+            (0 = no limit)
+        config: Optional dict overriding the UPPERCASE tuning constants,
+            like StickDashSim(config=...)
+
+    Attributes:
+        player_y, velocity_y (ndarray): (N,) player height and speed
+        obstacle_x (ndarray): (N, 3) boulder left edges
+        obstacle_size (ndarray): (N, 3) boulder widths (= heights)
+        score (ndarray): (N,) boulders passed
+        ticks (ndarray): (N,) ticks since each game started
+
+    Observations are float32 rows of:
+        player_y, velocity_y, obstacle_speed, then (distance, size) for
+        each boulder, sorted nearest first
+    """
+
+    # Same rules as the single game
+    WIDTH = StickDashSim.WIDTH
+    PLAYER_X = StickDashSim.PLAYER_X
+    PLAYER_WIDTH = StickDashSim.PLAYER_WIDTH
+    PLAYER_HEIGHT = StickDashSim.PLAYER_HEIGHT
+    GROUND_LEVEL = StickDashSim.GROUND_LEVEL
+    GRAVITY = StickDashSim.GRAVITY
+    JUMP_STRENGTH = StickDashSim.JUMP_STRENGTH
+    BASE_SPEED = StickDashSim.BASE_SPEED
+    SPEED_STEP = StickDashSim.SPEED_STEP
+    POINTS_PER_STEP = StickDashSim.POINTS_PER_STEP
+    RESPAWN_GAP = StickDashSim.RESPAWN_GAP
+    SIZES = StickDashSim.SIZES
+
+    START_Y = 450
+    START_X = (800, 1100, 1450)
+    START_SIZES = (50, 60, 45)
+
+    OBS_SIZE = 9
+
+    def __init__(self, num_envs, seed=None, max_ticks=0, config=None):
+        apply_config(self, config)
+        self.num_envs = num_envs
+        self.max_ticks = max_ticks
+        self.rng = np.random.default_rng(seed)
+        self._sizes = np.array(self.SIZES, dtype=np.float64)
+
+        # float64 like Python floats, so results match StickDashSim exactly
+        self.player_y = np.empty(num_envs)
+        self.velocity_y = np.empty(num_envs)
+        self.obstacle_x = np.empty((num_envs, 3))
+        self.obstacle_size = np.empty((num_envs, 3))
+        self.score = np.empty(num_envs, dtype=np.int64)
+        self.ticks = np.empty(num_envs, dtype=np.int64)
+        self._reset_rows(np.ones(num_envs, dtype=bool))
+
+    @property
+    def obstacle_speed(self):
+        return self.BASE_SPEED + (self.score // self.POINTS_PER_STEP) * self.SPEED_STEP
+
+    def _reset_rows(self, rows):
+        """Put the selected games back at the start."""
+        self.player_y[rows] = self.START_Y
+        self.velocity_y[rows] = 0.0
+        self.obstacle_x[rows] = self.START_X
+        self.obstacle_size[rows] = self.START_SIZES
+        self.score[rows] = 0
+        self.ticks[rows] = 0
+
+    def reset(self):
+        """Restart every game and return the first observations."""
+        self._reset_rows(np.ones(self.num_envs, dtype=bool))
+        return self.observe()
+
+    def observe(self):
+        """(N, OBS_SIZE) float32 observations of every game."""
+        obs = np.empty((self.num_envs, self.OBS_SIZE), dtype=np.float32)
+        obs[:, 0] = self.player_y
+        obs[:, 1] = self.velocity_y
+        obs[:, 2] = self.obstacle_speed
+
+        # Boulders nearest first, as distance from the player's front edge
+        order = np.argsort(self.obstacle_x, axis=1)
+        distance = np.take_along_axis(self.obstacle_x, order, axis=1) - (self.PLAYER_X + self.PLAYER_WIDTH)
+        obs[:, 3::2] = distance
+        obs[:, 4::2] = np.take_along_axis(self.obstacle_size, order, axis=1)
+        return obs
+
+    def step(self, actions):
+        """
+        Advance every game by one tick.
+
+        Args:
+            actions: (N,) bools, True = jump (ignored in the air)
+
+        Returns:
+            (obs, reward, done, info): observations after the step (of
+            the restarted game where done), points scored this tick,
+            which games ended, and info with "final_score",
+            "final_ticks" (valid where done) and "truncated"
+        """
+        actions = np.asarray(actions, dtype=bool)
+        self.ticks += 1
+
+        # Jump only from the ground, then gravity, move and land
+        jump = actions & (self.player_y >= self.GROUND_LEVEL)
+        self.velocity_y[jump] = self.JUMP_STRENGTH
+        self.velocity_y += self.GRAVITY
+        self.player_y += self.velocity_y
+        landed = self.player_y >= self.GROUND_LEVEL
+        self.player_y[landed] = self.GROUND_LEVEL
+        self.velocity_y[landed] = 0.0
+
+        # Speed comes from the score before this tick's points
+        self.obstacle_x -= self.obstacle_speed[:, None]
+
+        # Boulders off the left side come back on the right with a new size
+        gone = self.obstacle_x < -self.obstacle_size
+        count = int(np.count_nonzero(gone))
+        if count:
+            low, high = self.RESPAWN_GAP
+            self.obstacle_x[gone] = self.WIDTH + self.rng.integers(low, high + 1, size=count)
+            self.obstacle_size[gone] = self.rng.choice(self._sizes, size=count)
+        reward = gone.sum(axis=1)
+        self.score += reward
+
+        # Bounding-box overlap with each boulder (they sit on the ground)
+        top = self.player_y[:, None]
+        hit = ((self.PLAYER_X < self.obstacle_x + self.obstacle_size)
+               & (self.PLAYER_X + self.PLAYER_WIDTH > self.obstacle_x)
+               & (top < self.GROUND_LEVEL + self.obstacle_size)
+               & (top + self.PLAYER_HEIGHT > self.GROUND_LEVEL))
+        done = hit.any(axis=1)
+
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_ticks:
+            truncated = ~done & (self.ticks >= self.max_ticks)
+            done |= truncated
+
+        info = {
+            "final_score": self.score.copy(),
+            "final_ticks": self.ticks.copy(),
+            "truncated": truncated,
+        }
+        if done.any():
+            self._reset_rows(done)
+        return self.observe(), reward, done, info
+
+
+def _check_against_scalar(num_envs=64, ticks=3000):
+    """
+    Step the batched env and StickDashSim games with the same jumps.
+
+    Respawns use a single gap and size here so both sides need no
+    random numbers and must agree exactly.
+    """
+    config = {"RESPAWN_GAP": (300, 300), "SIZES": (50,)}
+    env = StickDashVecEnv(num_envs, config=config)
+    sims = [StickDashSim(config=config) for _ in range(num_envs)]
+    jumps = np.random.default_rng(1).random((ticks, num_envs)) < 0.05
+    finished = 0
+
+    for t in range(ticks):
+        _, _, done, info = env.step(jumps[t])
+        for i, sim in enumerate(sims):
+            sim.step(bool(jumps[t, i]))
+            if sim.game_over != done[i]:
+                return False
+            if sim.game_over:
+                if (sim.score, sim.tick) != (info["final_score"][i], info["final_ticks"][i]):
+                    return False
+                sims[i] = StickDashSim(config=config)
+                finished += 1
+    return finished > 0
+
+
+def _benchmark(num_envs, ticks):
+    """Time batched steps with random jumps."""
+    env = StickDashVecEnv(num_envs, seed=0)
+    env.reset()
+    actions = np.random.default_rng(0).random((64, num_envs)) < 0.05
+    games = 0
+
+    start = time.perf_counter()
+    for t in range(ticks):
+        _, _, done, _ = env.step(actions[t % 64])
+        games += int(done.sum())
+    elapsed = time.perf_counter() - start
+
+    steps = num_envs * ticks
+    print(f"{num_envs} envs x {ticks} ticks: {steps / elapsed:,.0f} game-steps/s "
+          f"({games} games finished), matches StickDashSim: {_check_against_scalar()}")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 4096,
+               int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
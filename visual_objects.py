@@ -13,6 +13,9 @@
 import pygame
 import math
 import random
+from collections import OrderedDict
+
+import numpy as np
 
 
 # COLOR CONSTANTS
@@ -23,6 +26,92 @@ BONE_HIGHLIGHT = (255, 250, 235)   # Lighter shade for shine
 
 
 
+# CLASS: GlowCache
+class GlowCache:
+    """
+    Keeps pre-rendered glow circles so halos don't redraw them every frame.
+
+    Creating a new SRCALPHA surface and drawing a circle into it is slow.
+    The pulse animation keeps reusing the same few sizes, so we draw each
+    (radius, color, alpha) sprite once and just blit it afterwards.
+
+    The cache is LRU (Least Recently Used): when it is full, the sprite
+    that hasn't been used for the longest time is thrown away.
+
+    Attributes:
+        max_sprites (int): How many sprites to keep before evicting
+        radius_step (int): Radii are rounded to a multiple of this
+        hits (int): How many lookups found a ready sprite
+        misses (int): How many lookups had to render a new sprite
+    """
+
+    def __init__(self, max_sprites=1024, radius_step=3):
+        """
+        Initialize an empty glow cache.
+
+        Args:
+            max_sprites: Maximum number of sprites kept at once
+            radius_step: Radius quantization in pixels (bigger = fewer sprites)
+        """
+        self.max_sprites = max_sprites
+        self.radius_step = max(1, int(radius_step))
+        self.hits = 0
+        self.misses = 0
+        self._sprites = OrderedDict()   # key -> Surface, oldest first
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def quantize(self, radius):
+        """Round a radius to the nearest cached size (at least 1 pixel)."""
+        step = self.radius_step
+        return max(1, int(round(radius / step)) * step)
+
+    def get(self, radius, color, alpha):
+        """
+        Return a glow sprite of about `radius` pixels.
+
+        The sprite is (2r x 2r) with the circle centered in it, where r is
+        the quantized radius.
+        """
+        r = self.quantize(radius)
+        key = (r, tuple(color), int(alpha))
+
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)  # Mark as recently used
+            return sprite
+
+        self.misses += 1
+        sprite = self._render(r, key[1], key[2])
+        self._sprites[key] = sprite
+
+        # Evict the least recently used sprites if we are over budget
+        while len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def clear(self):
+        """Forget every cached sprite (e.g. after changing quality)."""
+        self._sprites.clear()
+
+    def _render(self, r, color, alpha):
+        """Draw one glow circle on its own transparent surface."""
+        glow = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        pygame.draw.circle(glow, (*color, alpha), (r, r), r)
+
+        # Match the display pixel format when there is one (faster blits)
+        if pygame.display.get_surface() is not None:
+            glow = glow.convert_alpha()
+        return glow
+
+
+# Shared by every AuraHalo - bones with the same color reuse sprites
+GLOW_CACHE = GlowCache()
+
+
+
 # CLASS: AuraHalo
 class AuraHalo:
     """
@@ -38,9 +127,11 @@ class AuraHalo:
         color (tuple): RGB color of the glow (r, g, b)
         pulse_speed (float): How fast the glow breathes in/out
         time (float): Tracks animation time for pulsing effect
+        cache (GlowCache): Where the pre-rendered glow sprites come from
+        layers (int): Number of circles drawn (fewer = cheaper, see quality.py)
     """
     
-    def __init__(self, position, base_radius, intensity, color, pulse_speed):
+    def __init__(self, position, base_radius, intensity, color, pulse_speed, cache=None):
         """
         Initialize the glowing halo.
         
@@ -50,6 +141,7 @@ class AuraHalo:
             intensity: Brightness (0.0-1.0)
             color: RGB tuple like (255, 200, 100)
             pulse_speed: Animation speed multiplier
+            cache: GlowCache to use (defaults to the shared GLOW_CACHE)
         """
         self.position = list(position)      # Copy position so we can modify it
         self.base_radius = base_radius      # Store base size
@@ -57,6 +149,8 @@ class AuraHalo:
         self.color = color                  # Store color
         self.pulse_speed = pulse_speed      # Store animation speed
         self.time = 0.0                     # Animation timer starts at 0
+        self.cache = cache if cache is not None else GLOW_CACHE
+        self.layers = 3                     # Concentric circles per glow
 
     def update(self, dt):
         """
@@ -65,43 +159,250 @@ class AuraHalo:
         """
         self.time += dt  # Add time to make pulse animation progress
 
+    def radius(self):
+        """Current (pulsing) radius of the outer glow layer in pixels."""
+        # Calculate pulsing size using sine wave
+        # sin() gives values between -1 and 1
+        # We multiply by 0.3 to get -0.3 to 0.3
+        # Then add 1.0 to get range of 0.7 to 1.3
+        # This makes the glow shrink/grow smoothly
+        pulse = math.sin(self.time * self.pulse_speed) * 0.3 + 1.0
+        return int(self.base_radius * pulse)
+
+    def get_rect(self):
+        """Screen area the glow covers this frame (for dirty-rect drawing)."""
+        r = self.cache.quantize(max(1, self.radius()))  # Outer layer is biggest
+        return pygame.Rect(int(self.position[0]) - r, int(self.position[1]) - r, r * 2, r * 2)
+
     def draw(self, surface):
         """
         Draw the pulsing glow on screen.
         Creates a "breathing" effect using sine waves and draws
-        3 layers of circles with transparency for a soft look.
+        3 layers of circles (self.layers) with transparency for a soft look.
+        The circles come from the glow cache, so this only blits.
         """
         # Get integer coordinates for drawing
         x = int(self.position[0])
         y = int(self.position[1])
+        radius = self.radius()
 
-        # Calculate pulsing size using sine wave
-        # sin() gives values between -1 and 1
-        # We multiply by 0.3 to get -0.3 to 0.3
-        # Then add 1.0 to get range of 0.7 to 1.3
-        # This makes the glow shrink/grow smoothly
-        pulse = math.sin(self.time * self.pulse_speed) * 0.3 + 1.0
-        radius = int(self.base_radius * pulse)
-
-        # Draw 3 concentric circles for smooth gradient effect
-        for i in range(3):
+        # Draw concentric circles (3 at full quality) for smooth gradient effect
+        for i in range(self.layers):
             # Each layer is smaller than the last
             r = max(1, radius - i * 8)  # Subtract 8 pixels per layer
             
             # Each layer is more transparent than the last
             alpha = max(40, int(140 * self.intensity) - i * 30)
 
-            # Create a temporary surface with transparency support
-            # SRCALPHA means this surface can have transparent pixels
-            glow = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
-            
-            # Draw a circle on the temporary surface
-            # The * unpacks the RGB tuple, and we add alpha for transparency
-            pygame.draw.circle(glow, (*self.color, alpha), (r, r), r)
+            # Get the pre-rendered circle from the shared cache
+            # (only the first time a size is seen does it get drawn)
+            glow = self.cache.get(r, self.color, alpha)
             
             # Draw (blit) the glow onto the main screen
-            # Centered at (x, y) by offsetting by radius
-            surface.blit(glow, (x - r, y - r))
+            # Centered at (x, y) by offsetting by half the sprite size
+            half = glow.get_width() // 2
+            surface.blit(glow, (x - half, y - half))
+
+
+
+# PARTICLE SPRITES
+# Every particle is the same little dot, so we draw one dot per color
+# and blit it many times instead of calling pygame.draw.circle each time.
+_DOT_SPRITES = {}
+DOT_RADIUS = 2
+
+
+def _dot_sprite(color):
+    """Return a cached (5x5) dot sprite in the given color."""
+    sprite = _DOT_SPRITES.get(color)
+    if sprite is None:
+        size = DOT_RADIUS * 2 + 1
+        sprite = pygame.Surface((size, size))
+        sprite.fill((0, 0, 0))
+        sprite.set_colorkey((0, 0, 0))     # Black = transparent
+        pygame.draw.circle(sprite, color, (DOT_RADIUS, DOT_RADIUS), DOT_RADIUS)
+        _DOT_SPRITES[color] = sprite
+    return sprite
+
+
+
+# CLASS: ParticleSystem
+class ParticleSystem:
+    """
+    One shared pool of particles that many SparkEmitters spawn into.
+
+    Instead of every bone moving and drawing its own particles, all of
+    them live here and are updated and drawn in one batch per frame.
+    So the cost depends on how many particles are alive, not on how
+    many bones there are.
+
+    Particles are stored "structure of arrays" style: one preallocated
+    NumPy row per field (x, y, vertical speed, age, lifetime, priority).
+    Only the first `count` columns are alive.
+
+    When the pool is full, new particles replace the lowest priority ones
+    (for example sparks from quiet, low-barking breeds).
+
+    Attributes:
+        budget (int): Maximum number of live particles across all emitters
+        data (ndarray): (6, budget) particle fields, see X/Y/VY/AGE/LIFE/PRIORITY
+        owner (ndarray): Emitter slot of each particle (picks its color)
+        count (int): Number of live particles
+        counts (ndarray): Live particles per emitter slot
+    """
+
+    # Row index of each particle field inside self.data
+    X, Y, VY, AGE, LIFE, PRIORITY = range(6)
+
+    def __init__(self, budget=4096):
+        """
+        Initialize an empty particle pool.
+
+        Args:
+            budget: Maximum number of particles alive at once
+        """
+        self.budget = budget
+        self.data = np.zeros((6, budget), dtype=np.float32)
+        self.owner = np.zeros(budget, dtype=np.int32)
+        self.count = 0
+
+        self._emitters = []      # Emitter for each slot (None = free slot)
+        self._free_slots = []    # Slots freed by remove(), reused first
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, emitter):
+        """Register an emitter and return its slot number."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._emitters[slot] = emitter
+        else:
+            slot = len(self._emitters)
+            self._emitters.append(emitter)
+            self.counts = np.append(self.counts, 0)
+        self.counts[slot] = 0
+        return slot
+
+    def remove(self, emitter):
+        """Unregister an emitter and delete all of its particles."""
+        self.clear(emitter)
+        self._emitters[emitter.slot] = None
+        self._free_slots.append(emitter.slot)
+
+    def clear(self, emitter):
+        """Delete all of one emitter's particles (it stays registered)."""
+        n = self.count
+        mine = self.owner[:n] == emitter.slot
+        self.data[self.AGE, :n][mine] = np.inf  # Mark them as dead
+        self._compact()
+
+    def emit(self, emitter, n):
+        """
+        Spawn n particles for an emitter and return how many were made.
+
+        If the pool is full, the lowest priority particles that rank
+        below this emitter are shed to make room.
+        """
+        free = self.budget - self.count
+        start = self.count
+        slots = np.arange(start, start + min(n, free))
+
+        if n > free:
+            # Pool is full - look for lower priority particles to replace
+            prio = self.data[self.PRIORITY, :self.count]
+            weaker = np.flatnonzero(prio < emitter.priority)
+            k = min(n - free, len(weaker))
+            if k > 0:
+                if k < len(weaker):
+                    lowest = np.argpartition(prio[weaker], k - 1)[:k]
+                    weaker = weaker[lowest]
+                victims = weaker[:k]
+                np.subtract.at(self.counts, self.owner[victims], 1)
+                slots = np.concatenate((slots, victims))
+
+        made = len(slots)
+        if made == 0:
+            return 0
+
+        x, y = emitter.origin      # Get spawn position
+        rng = emitter.rng
+        d = self.data
+        d[self.X, slots] = x + rng.uniform(-4, 4, made)         # Slight X spread
+        d[self.Y, slots] = y + rng.uniform(-4, 4, made)         # Slight Y spread
+        d[self.VY, slots] = -emitter.speed * rng.uniform(0.8, 1.2, made)  # Upward
+        d[self.AGE, slots] = 0.0                                # Age starts at 0
+        d[self.LIFE, slots] = rng.uniform(1.0, 2.0, made)       # Lives 1-2 seconds
+        d[self.PRIORITY, slots] = emitter.priority
+        self.owner[slots] = emitter.slot
+
+        self.count += min(n, free)
+        self.counts[emitter.slot] += made
+        return made
+
+    def update(self, dt):
+        """Move and age every particle at once, then drop the dead ones."""
+        live = self.data[:, :self.count]
+        live[self.Y] += live[self.VY] * dt  # Move Y position by velocity
+        live[self.AGE] += dt                # Increase age
+        self._compact()
+
+    def _compact(self):
+        """
+        Drop dead particles with swap-remove.
+
+        Dead particles near the front are overwritten by live particles
+        from the back, so only the holes are moved - not every particle.
+        """
+        n = self.count
+        alive = self.data[self.AGE, :n] < self.data[self.LIFE, :n]
+        new_n = int(np.count_nonzero(alive))
+        if new_n == n:
+            return
+
+        # Holes in the part we keep, and survivors in the part we drop
+        # (there are always exactly as many of one as the other)
+        holes = np.flatnonzero(~alive[:new_n])
+        movers = np.flatnonzero(alive[new_n:]) + new_n
+        self.data[:, holes] = self.data[:, movers]
+        self.owner[holes] = self.owner[movers]
+        self.count = new_n
+
+        # Recount particles per emitter in one pass
+        self.counts = np.bincount(self.owner[:new_n], minlength=len(self._emitters))
+
+    def draw(self, surface, emitter=None):
+        """
+        Draw live particles as small dots with one batched blit call.
+
+        Args:
+            surface: Where to draw
+            emitter: Only draw this emitter's particles (default: all)
+        """
+        n = self.count
+        if n == 0:
+            return
+        xs = self.data[self.X, :n].astype(np.int32) - DOT_RADIUS
+        ys = self.data[self.Y, :n].astype(np.int32) - DOT_RADIUS
+        owner = self.owner[:n]
+
+        if emitter is not None:
+            mine = owner == emitter.slot
+            dot = _dot_sprite(emitter.color)
+            surface.blits([(dot, pos) for pos in zip(xs[mine].tolist(), ys[mine].tolist())], False)
+            return
+
+        # One dot sprite per emitter color
+        dots = [_dot_sprite(e.color) if e is not None else None for e in self._emitters]
+        surface.blits(
+            [(dots[o], (x, y)) for o, x, y in zip(owner.tolist(), xs.tolist(), ys.tolist())],
+            False,
+        )
+
+
+# Shared pool used by every BoneCrystal (update and draw it once per frame)
+PARTICLE_SYSTEM = ParticleSystem()
 
 
 
@@ -112,6 +413,10 @@ class SparkEmitter:
     
     This particle system emits tiny dots that rise slowly, creating
     the effect of warm embers or heat rising from the bones.
+
+    The particles themselves live in a ParticleSystem. Without one the
+    emitter gets its own private pool and works on its own; with a shared
+    pool, update() only spawns and the pool moves and draws everything.
     
     Attributes:
         origin (list): [x, y] where particles spawn
@@ -119,11 +424,15 @@ class SparkEmitter:
         spawn_rate (float): How many particles per second
         color (tuple): RGB color for the particles
         speed (float): How fast particles move upward (pixels/second)
-        particles (list): List of active particles (each is a list of data)
+        priority (float): Higher priority particles survive a full pool
+        system (ParticleSystem): Pool the particles are stored in
+        shared (bool): True if the pool is shared with other emitters
+        slot (int): This emitter's id inside the pool
         timer (float): Tracks when to spawn next particle
     """
     
-    def __init__(self, origin, max_particles, spawn_rate, color, speed):
+    def __init__(self, origin, max_particles, spawn_rate, color, speed,
+                 system=None, priority=0.0):
         """
         Initialize the particle emitter.
         Args:
@@ -132,19 +441,36 @@ class SparkEmitter:
             spawn_rate: Particles spawned per second
             color: RGB tuple
             speed: Upward speed in pixels/second
+            system: Shared ParticleSystem (None = private pool)
+            priority: Shedding priority when the shared pool is full
         """
         self.origin = list(origin)              # Where particles spawn
         self.max_particles = max_particles      # Limit on particle count
         self.spawn_rate = spawn_rate            # Emission frequency
         self.color = color                      # Particle color
         self.speed = speed                      # Movement speed
+        self.priority = priority                # Who survives a full pool
 
-        self.particles = []  # List to hold all active particles
+        self.shared = system is not None
+        self.system = system if self.shared else ParticleSystem(max_particles)
+        self.slot = self.system.add(self)
         self.timer = 0.0     # Timer to control spawning
 
+        # NumPy random generator seeded from `random`, so seeding the
+        # random module still makes the particles reproducible
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
+    @property
+    def count(self):
+        """Number of live particles from this emitter."""
+        return int(self.system.counts[self.slot])
+
+    def __len__(self):
+        return self.count
+
     def update(self, dt):
         """
-        Update all particles - spawn new ones and move existing ones.
+        Spawn new particles (and move them too if the pool is private).
 
         """
         self.timer += dt  # Advance spawn timer
@@ -153,39 +479,156 @@ class SparkEmitter:
         # If spawn_rate is 5, interval is 0.2 seconds
         interval = 1.0 / self.spawn_rate
 
-        # Spawn particles when timer is ready
-        while self.timer >= interval and len(self.particles) < self.max_particles:
-            self.timer -= interval  # Reset timer for next spawn
-            x, y = self.origin      # Get spawn position
-            
-            # Create new particle as a list:
-            # [x, y, vertical_velocity, age, lifetime]
-            self.particles.append([
-                x + random.uniform(-4, 4),      # Random X offset (slight spread)
-                y + random.uniform(-4, 4),      # Random Y offset
-                -self.speed * random.uniform(0.8, 1.2),  # Upward speed (negative Y)
-                0.0,                            # Age starts at 0
-                random.uniform(1.0, 2.0),       # Lives 1-2 seconds
-            ])
-
-        # Update all existing particles
-        for p in self.particles:
-            p[1] += p[2] * dt  # Move Y position (index 1) by velocity (index 2)
-            p[3] += dt         # Increase age (index 3)
-
-        # Remove dead particles (age >= lifetime)
-        # List comprehension: keep only particles where age < lifetime
-        self.particles = [p for p in self.particles if p[3] < p[4]]
+        # Spawn as many particles as the timer allows (and as fit)
+        free = self.max_particles - self.count
+        n = min(int(self.timer / interval), free)
+        if n > 0:
+            self.timer -= n * interval  # Reset timer for the spawned ones
+            self.system.emit(self, n)
+
+        # A shared pool is updated once per frame by its owner instead
+        if not self.shared:
+            self.system.update(dt)
 
     def draw(self, surface):
         """
-        Draw all active particles as small circles.
+        Draw this emitter's particles (shared pools draw in one batch).
     
         """
-        for p in self.particles:
-            # Draw each particle as a small circle (radius 2)
-            # p[0] is X, p[1] is Y
-            pygame.draw.circle(surface, self.color, (int(p[0]), int(p[1])), 2)
+        if not self.shared:
+            self.system.draw(surface)
+
+    def get_rect(self):
+        """
+        Screen area this emitter's particles can be in.
+
+        Particles start within 4 pixels of the origin and rise at most
+        speed * 1.2 for at most 2 seconds, so this box always holds them.
+        """
+        x, y = self.origin
+        rise = self.speed * 1.2 * 2.0      # Fastest particle, longest life
+        pad = 4 + DOT_RADIUS + 1           # Spawn spread + dot size
+        return pygame.Rect(int(x) - pad, int(y - rise) - pad, pad * 2, int(rise) + pad * 2)
+
+    def clear(self):
+        """Delete this emitter's particles and restart its spawn timer."""
+        self.system.clear(self)
+        self.timer = 0.0
+
+    def release(self):
+        """Give this emitter's slot and particles back to the pool."""
+        self.system.remove(self)
+
+
+
+# CLASS: RotationSpriteCache
+class RotationSpriteCache:
+    """
+    Pre-rendered bone bodies (bone + crystal shards) at fixed angles.
+
+    A bone's shape only depends on its length, color, shards and angle,
+    so instead of ~19 draw calls per frame we round the angle to one of
+    `angle_steps` buckets and blit a sprite rendered for that bucket.
+
+    More steps = smoother rotation but more memory. Sprites are cropped
+    to the bone and use a run-length encoded colorkey (fast to blit, and
+    the transparent corners cost almost nothing). The cache is LRU with a
+    memory budget in bytes.
+
+    Attributes:
+        angle_steps (int): Angle buckets per full turn (quality knob)
+        max_bytes (int): Memory budget for all cached sprites
+        used_bytes (int): Memory used by cached sprites right now
+    """
+
+    COLORKEY = (255, 0, 255)   # Transparent color (never used by a bone)
+
+    def __init__(self, angle_steps=64, max_bytes=96 * 1024 * 1024):
+        """
+        Initialize an empty rotation cache.
+
+        Args:
+            angle_steps: Number of angle buckets (e.g. 64 or 128)
+            max_bytes: Memory budget before old sprites are evicted
+        """
+        self.angle_steps = max(1, int(angle_steps))
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._sprites = OrderedDict()   # key -> (sprite, offset, nbytes), oldest first
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def bucket(self, angle):
+        """Index of the angle bucket closest to `angle` (radians)."""
+        steps = self.angle_steps
+        return int(round(angle / (2 * math.pi) * steps)) % steps
+
+    def get(self, bone):
+        """
+        Return (sprite, (dx, dy), nbytes) for the bone at its current angle.
+
+        Blit the sprite at the bone's center plus (dx, dy). nbytes is
+        roughly how much memory the run-length encoded sprite takes.
+        """
+        b = self.bucket(bone.angle)
+        key = (bone.length, bone.color, tuple(bone.shards), b)
+
+        entry = self._sprites.get(key)
+        if entry is not None:
+            self._sprites.move_to_end(key)  # Mark as recently used
+            return entry
+
+        entry = self._render(bone, b * 2 * math.pi / self.angle_steps)
+        self._sprites[key] = entry
+        self.used_bytes += entry[2]
+
+        # Evict the least recently used sprites if we are over budget
+        while self.used_bytes > self.max_bytes and len(self._sprites) > 1:
+            _, old = self._sprites.popitem(last=False)
+            self.used_bytes -= old[2]
+        return entry
+
+    def prerender(self, bone):
+        """Render every angle bucket of a bone ahead of time."""
+        angle = bone.angle
+        for b in range(self.angle_steps):
+            bone.angle = b * 2 * math.pi / self.angle_steps
+            self.get(bone)
+        bone.angle = angle
+
+    def clear(self):
+        """Forget every cached sprite (e.g. after changing quality)."""
+        self._sprites.clear()
+        self.used_bytes = 0
+
+    def _render(self, bone, angle):
+        """Draw the bone body once onto its own surface."""
+        half = bone.reach     # Big enough for the bone at any angle
+        canvas = pygame.Surface((half * 2, half * 2), depth=8)
+
+        # Draw in 8-bit: transparent key first, then the few bone colors
+        palette = [self.COLORKEY, BONE_BASE, BONE_SHADOW, BONE_HIGHLIGHT, bone.shard_color]
+        canvas.set_palette(palette + [self.COLORKEY] * (256 - len(palette)))
+        canvas.fill(self.COLORKEY)
+        canvas.set_colorkey(self.COLORKEY)
+
+        bone._draw_bone(canvas, (half, half), angle)
+        bone._draw_shards(canvas, (half, half), angle)
+
+        # Crop to the pixels actually drawn
+        rect = canvas.get_bounding_rect()
+        sprite = canvas.subsurface(rect).copy()
+
+        # Match the display pixel format when there is one (faster blits)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        sprite.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+
+        # RLE only stores the opaque pixels (plus a little per row)
+        opaque = pygame.mask.from_surface(sprite).count()
+        nbytes = (opaque + rect.height * 4) * sprite.get_bytesize()
+        return sprite, (rect.x - half, rect.y - half), nbytes
 
 
 
@@ -211,11 +654,16 @@ class BoneCrystal:
         glow_intensity (float): 0.0-1.0, how bright the glow is
         angle (float): Current rotation angle in radians
         aura (AuraHalo): The glow object (composition!)
-        sparks (SparkEmitter): The particle system (composition!)
+        sparks (SparkEmitter): The particle emitter (composition!)
         shards (list): Data for crystal spikes
+        sprite_cache (RotationSpriteCache): Optional pre-rendered bone bodies
+        quality (QualityLevel): Level of detail (None = full, see quality.py)
     """
+
+    SHARD_GROUPS = 5    # Groups of crystal spikes at full detail
     
-    def __init__(self, position, length, rotation_speed, color, symmetry, glow_intensity, barking_level):
+    def __init__(self, position, length, rotation_speed, color, symmetry, glow_intensity, barking_level,
+                 particles=None, sprite_cache=None, rng=None):
         """
         Initialize a bone crystal.
 
@@ -226,6 +674,11 @@ class BoneCrystal:
             symmetry: 0.0-1.0, crystal orderliness
             glow_intensity: 0.0-1.0, glow brightness
             barking_level: 0.0-1.0, controls spark amount
+            particles: ParticleSystem the sparks go into
+                       (defaults to the shared PARTICLE_SYSTEM)
+            sprite_cache: RotationSpriteCache for the bone body
+                          (None = draw it with pygame.draw every frame)
+            rng: random.Random for the shards (None = the random module)
         """
         # Store basic properties
         self.position = list(position)          # Center position
@@ -234,7 +687,9 @@ class BoneCrystal:
         self.color = color                      # Color scheme
         self.symmetry = symmetry                # Crystal pattern
         self.glow_intensity = glow_intensity    # Glow brightness
+        self.barking_level = barking_level      # Spark amount
         self.angle = 0.0                        # Current rotation (starts at 0)
+        self.quality = None                     # Full detail until set_quality()
 
         # COMPOSITION EXAMPLE 1: Create a glow halo object
         # BoneCrystal "has a" AuraHalo
@@ -250,16 +705,107 @@ class BoneCrystal:
         # BoneCrystal "has a" SparkEmitter
         self.sparks = SparkEmitter(
             origin=position,
-            max_particles=10 + int(barking_level * 40),  # More barking = more particles
+            max_particles=self._max_particles(),         # More barking = more particles
             spawn_rate=4 + barking_level * 15,           # Barking affects spawn rate
             color=color,
             speed=20 + barking_level * 50,               # Barking affects speed
+            system=particles if particles is not None else PARTICLE_SYSTEM,
+            priority=barking_level,                      # Quiet breeds shed first
         )
 
         self.shards = []        # Will hold crystal spike data
-        self._make_shards()     # Generate the crystals
+        self._shard_groups = [] # Every group, even those hidden at low quality
+        self._make_shards(rng)  # Generate the crystals
+        self.sprite_cache = sprite_cache
+
+    def configure(self, position, length, rotation_speed, color, symmetry, glow_intensity, barking_level,
+                  rng=None):
+        """
+        Turn this bone into a different breed without making a new object.
 
-    def _make_shards(self):
+        Used by BoneGrid to recycle bones that scrolled out of view.
+        Takes the same values as __init__.
+        """
+        self.length = length
+        self.rotation_speed = rotation_speed
+        self.color = color
+        self.symmetry = symmetry
+        self.glow_intensity = glow_intensity
+        self.barking_level = barking_level
+        self.angle = 0.0
+
+        # Same formulas as in __init__, applied to the existing parts
+        aura = self.aura
+        aura.base_radius = length * 0.35
+        aura.intensity = glow_intensity
+        aura.color = color
+        aura.time = 0.0
+
+        sparks = self.sparks
+        sparks.clear()                                    # Old breed's sparks
+        sparks.max_particles = self._max_particles()
+        sparks.spawn_rate = 4 + barking_level * 15
+        sparks.color = color
+        sparks.speed = 20 + barking_level * 50
+        sparks.priority = barking_level
+
+        self.move_to(*position)
+        self._make_shards(rng)
+
+    def set_quality(self, quality):
+        """
+        Change the level of detail (a quality.QualityLevel).
+
+        Fewer glow layers, a lower spark limit and fewer crystal groups
+        make the bone cheaper to draw; the breed's look stays the same.
+        """
+        self.quality = quality
+        self.aura.layers = quality.aura_layers
+        self.sparks.max_particles = self._max_particles()
+        self._show_shards()
+
+    def _max_particles(self):
+        """Spark limit: 10-50 by barking level, scaled down at lower quality."""
+        count = 10 + int(self.barking_level * 40)
+        if self.quality is not None:
+            count = max(1, int(count * self.quality.particle_scale))
+        return count
+
+    def move_to(self, x, y):
+        """Move the bone together with its glow and spark origin."""
+        self.position = [x, y]
+        self.aura.position = [x, y]
+        self.sparks.origin = [x, y]
+
+    @property
+    def reach(self):
+        """
+        Distance from the center to the farthest pixel of the bone body.
+
+        Covers the end knobs, lobes and the longest shard at any angle.
+        """
+        end_r = self.length * 0.22
+        reach = self.length / 2 + end_r * 1.8
+        reach = max(reach, max((abs(off) + 12 + size for off, _, size in self.shards), default=0))
+        return int(reach) + 4
+
+    def get_rect(self):
+        """
+        Screen area the bone, its glow and its sparks cover this frame.
+
+        Used by dirty-rect drawing to know what needs to be redrawn.
+        """
+        r = self.reach
+        body = pygame.Rect(int(self.position[0]) - r, int(self.position[1]) - r, r * 2, r * 2)
+        return body.union(self.aura.get_rect()).union(self.sparks.get_rect())
+
+    @property
+    def shard_color(self):
+        """Crystal color: slightly brighter than the base color."""
+        r, g, b = self.color
+        return (min(255, r+25), min(255, g+25), min(255, b+25))
+
+    def _make_shards(self, rng=None):
         """
         Generate crystal spike positions.
         
@@ -269,24 +815,34 @@ class BoneCrystal:
         
         This is a private helper method (starts with _)
         """
-        self.shards.clear()  # Clear any existing shards
+        rng = rng or random  # Own generator, or the shared random module
+        self._shard_groups.clear()  # Clear any existing shards
         
-        # Create 5 groups of crystals
-        for _ in range(5):
+        # Create 5 groups of crystals (all of them, whatever the quality,
+        # so the same breed always gets the same crystals)
+        for _ in range(self.SHARD_GROUPS):
             # Random position along the bone (-30% to +30% of length)
-            offset = random.uniform(-0.3, 0.3) * self.length
+            offset = rng.uniform(-0.3, 0.3) * self.length
             
             # Random spike size
-            size = random.uniform(10, 18)
+            size = rng.uniform(10, 18)
 
             # Check symmetry to decide placement
-            if random.random() < self.symmetry:
+            if rng.random() < self.symmetry:
                 # High symmetry: add matching spikes on both sides
-                self.shards.append((offset, 1, size))   # Right side (1)
-                self.shards.append((offset, -1, size))  # Left side (-1)
+                self._shard_groups.append([(offset, 1, size),    # Right side (1)
+                                           (offset, -1, size)])  # Left side (-1)
             else:
                 # Low symmetry: add spike on random side only
-                self.shards.append((offset, random.choice([-1, 1]), size))
+                self._shard_groups.append([(offset, rng.choice([-1, 1]), size)])
+        self._show_shards()
+
+    def _show_shards(self):
+        """Fill self.shards with the groups this quality level draws."""
+        count = self.SHARD_GROUPS if self.quality is None else self.quality.shard_groups
+        self.shards.clear()
+        for group in self._shard_groups[:count]:
+            self.shards.extend(group)
 
     def update(self, dt):
         """
@@ -302,11 +858,18 @@ class BoneCrystal:
     def draw(self, surface):
     
         self.aura.draw(surface)         # Layer 1: Background glow
-        self._draw_bone(surface)        # Layer 2: Bone shape
-        self._draw_shards(surface)      # Layer 3: Crystal spikes
-        self.sparks.draw(surface)       # Layer 4: Particles
 
-    def _draw_bone(self, surface):
+        if self.sprite_cache is not None:
+            # Layers 2+3 in one blit from the pre-rendered angle buckets
+            sprite, (ox, oy), _ = self.sprite_cache.get(self)
+            surface.blit(sprite, (int(self.position[0]) + ox, int(self.position[1]) + oy))
+        else:
+            self._draw_bone(surface)    # Layer 2: Bone shape
+            self._draw_shards(surface)  # Layer 3: Crystal spikes
+
+        self.sparks.draw(surface)       # Layer 4: Particles (no-op for a shared pool)
+
+    def _draw_bone(self, surface, center=None, angle=None):
         """
         Draw the cartoon bone shape with shading.
         
@@ -316,9 +879,11 @@ class BoneCrystal:
         - Small lobes on each end
         - Shadow and highlight lines for depth
 
+        center and angle default to the bone's own position and angle
+        (the sprite cache passes its own to render off-screen).
         """
-        cx, cy = self.position  # Center position
-        a = self.angle          # Current rotation angle
+        cx, cy = self.position if center is None else center  # Center position
+        a = self.angle if angle is None else angle             # Current rotation angle
 
         # Calculate direction vectors using trigonometry
         # dx, dy = direction along the bone
@@ -379,7 +944,7 @@ class BoneCrystal:
             max(1, shaft_w // 5)  # Highlight line thickness
         )
 
-    def _draw_shards(self, surface):
+    def _draw_shards(self, surface, center=None, angle=None):
         """
         Draw the crystal spikes growing from the bone.
         
@@ -387,8 +952,8 @@ class BoneCrystal:
         They rotate with the bone!
         
         """
-        cx, cy = self.position  # Center position
-        a = self.angle          # Current rotation
+        cx, cy = self.position if center is None else center  # Center position
+        a = self.angle if angle is None else angle             # Current rotation
 
         # Calculate direction vectors (same as bone drawing)
         dx = math.cos(a)
@@ -397,8 +962,7 @@ class BoneCrystal:
         ny = dx
 
         # Make crystals slightly brighter than base color
-        r, g, b = self.color
-        shard_color = (min(255, r+25), min(255, g+25), min(255, b+25))
+        shard_color = self.shard_color
 
         # Draw each crystal spike
         for off, side, size in self.shards:
@@ -417,6 +981,274 @@ class BoneCrystal:
 
 
 
+# CLASS: BoneGrid
+class BoneGrid:
+    """
+    A scrollable grid of bones that can hold any number of breeds.
+
+    Only the rows that are on screen have BoneCrystal objects. When a
+    row scrolls out of view its bones are put in a free list and reused
+    for the rows scrolling in (object recycling), so memory and frame
+    time stay the same for 20 breeds or 20,000.
+
+    Attributes:
+        records (sequence): One entry per breed (any type to_params accepts)
+        to_params (function): record -> dict of BoneCrystal values
+                              (length, rotation_speed, color, ...);
+                              None if the records already are those dicts
+        area (pygame.Rect): Screen area the grid is laid out in
+        cols (int): Bones per row
+        rows_per_page (int): Rows that fit in the area at once
+        scroll (float): How far down the grid is scrolled, in pixels
+        changed (bool): True if bones moved or were recycled this frame
+        quality (QualityLevel): Level of detail of every bone (None = full)
+        reach (int): Farthest any bone made so far reaches from its center;
+                     rows this close to the area are kept too, so a bone
+                     sticking into view isn't recycled (or made) too late
+    """
+
+    def __init__(self, records, to_params, area, cols=5, rows_per_page=4,
+                 particles=None, sprite_cache=None, seed=0):
+        """
+        Initialize the grid and create the bones for the first page.
+
+        Args:
+            records: Breed data, one entry per bone
+            to_params: Function turning one record into BoneCrystal values
+                       (None = records[i] already is that dict)
+            area: pygame.Rect (or tuple) the grid fills
+            cols: Number of columns
+            rows_per_page: Number of rows visible without scrolling
+            particles: ParticleSystem for the sparks (None = shared pool)
+            sprite_cache: Optional RotationSpriteCache for the bone bodies
+            seed: Makes each breed's shards look the same every time it
+                  scrolls back into view
+        """
+        self.records = records
+        self.to_params = to_params
+        self.area = pygame.Rect(area)
+        self.cols = cols
+        self.rows_per_page = rows_per_page
+        self.particles = particles
+        self.sprite_cache = sprite_cache
+        self.seed = seed
+
+        # Same spacing rules as the original fixed 5x4 grid
+        self.spacing_x = self.area.width / (cols + 1)
+        self.spacing_y = self.area.height / (rows_per_page + 1)
+
+        self.scroll = 0.0       # Current scroll position (pixels)
+        self.target = 0.0       # Where smooth scrolling is heading
+        self.changed = True
+        self.quality = None     # Full detail until set_quality()
+        self.reach = 0          # Grows as bones are made (see _sync)
+
+        self._active = {}       # record index -> BoneCrystal on screen
+        self._free = []         # Recycled bones waiting for a new breed
+        self._sync()
+
+    @property
+    def total_rows(self):
+        return -(-len(self.records) // self.cols)   # Round up
+
+    @property
+    def max_scroll(self):
+        return max(0.0, (self.total_rows - self.rows_per_page) * self.spacing_y)
+
+    @property
+    def bones(self):
+        """The bones currently on screen, in data order."""
+        return [self._active[i] for i in sorted(self._active)]
+
+    @property
+    def pool_size(self):
+        """Total BoneCrystal objects ever made (on screen + recycled)."""
+        return len(self._active) + len(self._free)
+
+    def scroll_rows(self, rows):
+        """Scroll by a number of rows (negative = up)."""
+        self.scroll_to(self.target + rows * self.spacing_y)
+
+    def page(self, pages):
+        """Scroll by whole pages (negative = up)."""
+        self.scroll_rows(pages * self.rows_per_page)
+
+    def scroll_to(self, pixels):
+        """Set where the grid should scroll to (clamped to the data)."""
+        self.target = max(0.0, min(self.max_scroll, pixels))
+
+    def set_quality(self, quality):
+        """Change the level of detail of every bone, recycled ones included."""
+        self.quality = quality
+        for bone in list(self._active.values()) + self._free:
+            bone.set_quality(quality)
+        self.changed = True
+
+    def visible_range(self):
+        """
+        Record indices [first, last) that are on screen right now.
+
+        A row counts while its bones reach into the area, not only while
+        their centers are inside it.
+        """
+        sy = self.spacing_y
+        first_row = max(0, math.floor((self.scroll - self.reach) / sy))
+        last_row = math.ceil((self.scroll + self.reach) / sy + self.rows_per_page) - 1
+        last_row = min(last_row, self.total_rows - 1)
+        first = first_row * self.cols
+        last = min(len(self.records), (last_row + 1) * self.cols)
+        return first, max(first, last)
+
+    def update(self, dt):
+        """Ease the scroll position toward the target and animate bones."""
+        if self.scroll != self.target:
+            # Move a fraction of the way each frame (smooth scrolling)
+            self.scroll += (self.target - self.scroll) * min(1.0, dt * 10)
+            if abs(self.target - self.scroll) < 0.5:
+                self.scroll = self.target
+            self._sync()
+
+        for bone in self._active.values():
+            bone.update(dt)
+
+    def _sync(self):
+        """Recycle bones that left the view and place the ones in view."""
+        first, last = self.visible_range()
+        self._place(first, last)
+
+        # Bigger bones than any seen before can widen the range
+        if self.visible_range() != (first, last):
+            self._place(*self.visible_range())
+        self.changed = True
+
+    def _place(self, first, last):
+        """Make the bones for records [first, last) and recycle the rest."""
+        # Bones whose breed scrolled away go back to the free list
+        for i in [i for i in self._active if not first <= i < last]:
+            bone = self._active.pop(i)
+            bone.sparks.clear()
+            self._free.append(bone)
+
+        for i in range(first, last):
+            x, y = self._position(i)
+            bone = self._active.get(i)
+            if bone is None:
+                params = self.records[i]
+                if self.to_params is not None:
+                    params = self.to_params(params)
+                rng = random.Random(self.seed * 1000003 + i)
+                if self._free:
+                    bone = self._free.pop()
+                    bone.configure(position=(x, y), rng=rng, **params)
+                else:
+                    bone = BoneCrystal(position=(x, y), particles=self.particles,
+                                       sprite_cache=self.sprite_cache, rng=rng, **params)
+                    if self.quality is not None:
+                        bone.set_quality(self.quality)
+                self._active[i] = bone
+                self.reach = max(self.reach, bone.reach)
+            else:
+                bone.move_to(x, y)
+
+    def _position(self, i):
+        """Screen position of the bone for record i."""
+        col_i = i % self.cols
+        row_i = i // self.cols
+        x = self.area.x + (col_i + 1) * self.spacing_x
+        y = self.area.y + (row_i + 1) * self.spacing_y - self.scroll
+        return x, y
+
+
+
+# CLASS: BackgroundCompositor
+class BackgroundCompositor:
+    """
+    Renders the static background layers once and reuses them.
+
+    The sky and grass never change while the program runs, so drawing
+    them every frame is wasted work. The compositor draws every layer
+    onto one cached surface, and each frame is then a single blit.
+    The cache is rebuilt when the window size or the theme changes.
+
+    Attributes:
+        layers (list): Functions called as layer(surface, theme), back to front
+        theme (dict): Colors passed to every layer
+        renders (int): How many times the cache was (re)built
+    """
+
+    def __init__(self, layers, theme=None):
+        """
+        Initialize the compositor.
+
+        Args:
+            layers: Drawing functions, first one is the furthest back
+            theme: Dict of colors handed to each layer
+        """
+        self.layers = list(layers)
+        self.theme = theme
+        self.renders = 0
+        self._cache = None      # The pre-drawn background surface
+
+    def invalidate(self):
+        """Throw away the cached background (it is redrawn on next use)."""
+        self._cache = None
+
+    def set_theme(self, theme):
+        """Switch colors; the background is only redrawn if they changed."""
+        if theme != self.theme:
+            self.theme = theme
+            self.invalidate()
+
+    def render(self, size):
+        """Return the background surface for a window of `size` pixels."""
+        if self._cache is None or self._cache.get_size() != tuple(size):
+            cache = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                cache = cache.convert()  # Same pixel format = faster blits
+            for layer in self.layers:
+                layer(cache, self.theme)
+            self._cache = cache
+            self.renders += 1
+        return self._cache
+
+    def draw(self, surface, area=None):
+        """
+        Copy the background onto `surface` (one blit).
+
+        Args:
+            surface: Where to draw
+            area: Optional pygame.Rect to restore only that region
+        """
+        background = self.render(surface.get_size())
+        if area is None:
+            surface.blit(background, (0, 0))
+        else:
+            surface.blit(background, area, area)
+
+
+def vertical_gradient(surface, top, bottom):
+    """
+    Fill a surface with a top-to-bottom color gradient.
+
+    All row colors are computed at once with NumPy, drawn into a
+    1-pixel-wide strip, and stretched across the surface.
+    """
+    width, height = surface.get_size()
+    t = np.arange(height, dtype=np.float64)[:, None] / height   # 0.0 -> 1.0
+    rows = (np.array(top) * (1 - t) + np.array(bottom) * t).astype(np.uint8)
+
+    strip = pygame.surfarray.make_surface(rows[None, :, :])     # (1, height)
+
+    # Stretch the strip straight into `surface` when it has the same
+    # pixel format; otherwise (e.g. a 16-bit kiosk display) stretch
+    # into a new surface and blit it, which converts between formats
+    if (surface.get_bitsize(), surface.get_masks()) == (strip.get_bitsize(), strip.get_masks()):
+        pygame.transform.scale(strip, (width, height), surface)
+    else:
+        surface.blit(pygame.transform.scale(strip, (width, height)), (0, 0))
+
+
+
 # CLASS: DogSprite
 class DogSprite:
     """
@@ -518,6 +1350,11 @@ class DogSprite:
             # Advance frame, loop back to 0 after frame 3
             self.frame = (self.frame + 1) % len(self.frames)
 
+    def get_rect(self):
+        """Screen area the dog covers."""
+        size = int(12 * self.scale)
+        return pygame.Rect(self.x, self.y, size, size)
+
     def draw(self, surface):
         """
         Draw the current animation frame.
@@ -530,4 +1367,31 @@ class DogSprite:
         img = pygame.transform.scale(img, (size, size))
         
         # Draw it at the dog's position
-        surface.blit(img, (self.x, self.y))
\ No newline at end of file
+        surface.blit(img, (self.x, self.y))
+
+
+def _check_depths():
+    """
+    Draw the night sky (draw_sky) into 8, 16, 24 and 32-bit surfaces, like
+    the background cache does on displays of those depths, and check the
+    colors match the 32-bit result (within what the depth can store).
+    """
+    import Sanjay_data_art as art
+
+    size = (64, art.SCREEN_HEIGHT)
+    expected = pygame.Surface(size, depth=32)
+    art.draw_sky(expected)
+    for depth in (8, 16, 24, 32):
+        surface = pygame.Surface(size, depth=depth)
+        art.draw_sky(surface)
+        for y in (0, size[1] // 2, size[1] - 1):
+            got = surface.get_at((size[0] // 2, y))
+            want = expected.get_at((size[0] // 2, y))
+            error = max(abs(a - b) for a, b in zip(got[:3], want[:3]))
+            limit = 64 if depth == 8 else 8     # 8-bit = nearest palette color
+            assert error <= limit, f"{depth}-bit sky at y={y}: {tuple(got)} vs {tuple(want)}"
+        print(f"draw_sky on a {depth}-bit surface: ok")
+
+
+if __name__ == "__main__":
+    _check_depths()